@@ -1,10 +1,14 @@
 # app/admin/router.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Literal, Optional
 from decimal import Decimal
 
-from app.core.database import get_async_db
+from app.core.config import settings
+from app.core.database import get_async_db, get_engine
 from app.admin.dependencies import AdminUser
 from app.models.user import User
 from app.schemas.common import Message, PaginationParams, PaginatedResponse
@@ -12,7 +16,7 @@ from app.schemas.common import Message, PaginationParams, PaginatedResponse
 # Import services and schemas from other modules
 from app.auth import schemas as auth_schemas
 from app.exchanges import schemas, service as exchange_service
-from app.dependencies import get_current_admin_user
+from app.dependencies import Principal, get_current_admin_user
 from app.reviews import service as review_service
 from app.reviews import schemas as review_schemas
 from app.models import review as review_models
@@ -20,6 +24,13 @@ from app.news import service as news_service
 from app.news import schemas as news_schemas
 from app.static_pages import service as static_page_service
 from app.static_pages import schemas as static_page_schemas
+from app.admin import schemas as admin_schemas
+from app.core.scheduler import NotLeaderError, scheduler
+from app.core.work_queue import work_queue
+from app.auth.security import password_hasher
+from app.core.profiling import StackSampler, collapsed, flamegraph_svg, profiler
+from app.core.slow_queries import slow_query_log
+from app.core import statement_cache
 
 
 router = APIRouter(
@@ -66,6 +77,19 @@ async def create_exchange(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/exchanges/bulk", response_model=schemas.ExchangeBulkUpsertResponse)
+async def bulk_upsert_exchanges(
+    payload: schemas.ExchangeBulkUpsertRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Create or update many exchanges in one transaction (admin only).
+    Rows are matched by slug; rows with unknown slugs are created.
+    Returns a per-row result; invalid rows are reported and skipped.
+    """
+    return await exchange_service.exchange_service.bulk_upsert_exchanges(db=db, items=payload.items)
+
+
 @router.put("/exchanges/{slug}", response_model=schemas.ExchangeRead)
 async def update_exchange(
     slug: str,
@@ -128,7 +152,7 @@ async def admin_moderate_review(
     # Use the correct schema name and get data from Body
     moderation_payload: review_schemas.ReviewAdminUpdatePayload = Body(...),
     db: AsyncSession = Depends(get_async_db),
-    current_admin: User = Depends(get_current_admin_user) # Inject admin user to log who moderated
+    current_admin: Principal = Depends(get_current_admin_user) # Inject admin user to log who moderated
 ):
     """
     (Admin) Approve or reject a review.
@@ -150,7 +174,7 @@ async def admin_moderate_review(
 async def admin_create_news(
     news_in: news_schemas.NewsItemCreate,
     db: AsyncSession = Depends(get_async_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: Principal = Depends(get_current_admin_user)
 ):
     """
     (Admin) Create a news item.
@@ -165,7 +189,7 @@ async def admin_create_news(
 async def admin_create_static_page(
     page_in: static_page_schemas.StaticPageCreate,
     db: AsyncSession = Depends(get_async_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: Principal = Depends(get_current_admin_user)
 ):
     """
     (Admin) Create a static content page.
@@ -181,7 +205,7 @@ async def admin_update_static_page(
     slug: str,
     page_in: static_page_schemas.StaticPageUpdate,
     db: AsyncSession = Depends(get_async_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: Principal = Depends(get_current_admin_user)
 ):
     """
     (Admin) Update a static content page.
@@ -195,4 +219,188 @@ async def admin_update_static_page(
         )
         return updated_page
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# --- Background Jobs ---
+@router.get("/jobs", response_model=admin_schemas.SchedulerStatusRead)
+async def admin_list_jobs(db: AsyncSession = Depends(get_async_db)):
+    """
+    (Admin) Status of the background jobs on the worker serving this request.
+    """
+    return admin_schemas.SchedulerStatusRead(
+        enabled=scheduler.started,
+        is_leader=scheduler.is_leader,
+        jobs=scheduler.status(),
+        work_queue_pending=await work_queue.pending_count(db),
+        work_queue_failed=await work_queue.failed_count(db),
+    )
+
+@router.post("/jobs/{name}/run", response_model=Message, status_code=status.HTTP_202_ACCEPTED)
+async def admin_run_job(name: str):
+    """
+    (Admin) Run a background job now on the worker serving this request.
+    Leader-only jobs can only be run on the scheduler leader (409 elsewhere; retry to reach another worker).
+    """
+    if name not in scheduler.jobs:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    try:
+        started = scheduler.trigger(name)
+    except NotLeaderError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"{e}; this worker is not the leader")
+    if not started:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job is already running at its concurrency limit")
+    return Message(message=f"Job '{name}' started")
+
+
+# --- Password hashing ---
+@router.get("/password-hashing", response_model=admin_schemas.PasswordHasherStatsRead)
+async def admin_password_hashing_stats():
+    """
+    (Admin) Queueing and timing of the password hashing pool on the worker serving this request.
+    """
+    return password_hasher.stats()
+
+
+# --- Profiling ---
+ProfileFormat = Literal["collapsed", "svg"]
+
+def _profiling_status() -> admin_schemas.ProfilingStatusRead:
+    session = profiler.session
+    return admin_schemas.ProfilingStatusRead(
+        pid=os.getpid(),
+        enabled=settings.PROFILING_ENABLED,
+        running=session is not None and session.running,
+        started_at=session.started_at if session else None,
+        stopped_at=session.stopped_at if session else None,
+        interval_ms=session.interval * 1000 if session else None,
+        samples=session.samples if session else 0,
+        recent_requests=[
+            admin_schemas.RequestProfileRead(
+                id=profile.id,
+                method=profile.method,
+                path=profile.path,
+                status_code=profile.status_code,
+                duration_ms=profile.duration_ms,
+                samples=profile.sampler.samples,
+            )
+            for profile in reversed(profiler.requests.values())
+        ],
+    )
+
+def _profile_response(sampler: StackSampler, title: str, format: ProfileFormat) -> Response:
+    stacks = sampler.stacks()
+    if format == "svg":
+        return Response(flamegraph_svg(stacks, title=title), media_type="image/svg+xml")
+    return PlainTextResponse(collapsed(stacks))
+
+@router.get("/profiling", response_model=admin_schemas.ProfilingStatusRead)
+async def admin_profiling_status():
+    """
+    (Admin) Sampling profiler state and recent request profiles of the worker serving this request.
+    """
+    return _profiling_status()
+
+@router.post("/profiling/start", response_model=admin_schemas.ProfilingStatusRead)
+async def admin_start_profiling(
+    interval_ms: Optional[float] = Query(None, gt=0, le=1000, description="Sampling interval (default PROFILING_INTERVAL_MS)"),
+    duration_seconds: Optional[float] = Query(None, gt=0, description="Stop automatically after this long (capped at PROFILING_MAX_SECONDS)"),
+):
+    """
+    (Admin) Start sampling every thread of the worker serving this request.
+    """
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profiling is disabled (PROFILING_ENABLED)")
+    if profiler.start(interval_ms=interval_ms, max_seconds=duration_seconds) is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profiling is already running on this worker")
+    return _profiling_status()
+
+@router.post("/profiling/stop", response_model=admin_schemas.ProfilingStatusRead)
+async def admin_stop_profiling():
+    """
+    (Admin) Stop the worker-wide profiling session; its profile stays available until the next start.
+    """
+    if profiler.stop() is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profiling is not running on this worker")
+    return _profiling_status()
+
+@router.get("/profiling/profile", response_class=PlainTextResponse)
+async def admin_get_profile(format: ProfileFormat = "collapsed"):
+    """
+    (Admin) Collapsed stacks or SVG flamegraph of the current or last worker-wide session.
+    """
+    if profiler.session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No profiling session on this worker")
+    return _profile_response(profiler.session, f"Worker {os.getpid()}", format)
+
+@router.get("/profiling/requests/{profile_id}", response_class=PlainTextResponse)
+async def admin_get_request_profile(profile_id: str, format: ProfileFormat = "collapsed"):
+    """
+    (Admin) Profile of a request sent with "X-Profile: 1" (see its X-Profile-Id header), if it was served by this worker.
+    """
+    profile = profiler.requests.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found on this worker")
+    return _profile_response(profile.sampler, f"{profile.method} {profile.path}", format)
+
+
+# --- Slow queries ---
+@router.get("/slow-queries", response_model=admin_schemas.SlowQueryLogRead)
+async def admin_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    order_by: Literal["total_ms", "p95_ms", "max_ms", "mean_ms", "count", "slow_count"] = "total_ms",
+):
+    """
+    (Admin) Statement fingerprints of the worker serving this request, by total time (or order_by), with captured plans.
+    """
+    return admin_schemas.SlowQueryLogRead(
+        pid=os.getpid(),
+        enabled=settings.SLOW_QUERY_LOG_ENABLED,
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        since=slow_query_log.started_at,
+        fingerprints=len(slow_query_log.stats),
+        queries=slow_query_log.top(limit=limit, order_by=order_by),
+    )
+
+@router.delete("/slow-queries", response_model=Message)
+async def admin_reset_slow_queries():
+    """
+    (Admin) Clear the slow-query log of the worker serving this request.
+    """
+    slow_query_log.reset()
+    return Message(message="Slow-query log cleared")
+
+
+# --- Statement caches ---
+@router.get("/statement-cache", response_model=admin_schemas.StatementCacheStatsRead)
+async def admin_statement_cache():
+    """
+    (Admin) Hit rates of the listing statement shape cache, SQLAlchemy's compiled cache and asyncpg's
+    prepared statement cache in the worker serving this request.
+    """
+    engine = get_engine()
+    compiled_size, compiled_capacity = statement_cache.compiled_cache_size(engine)
+    prepared_capacity = settings.DB_PREPARED_STATEMENT_CACHE_SIZE if engine.dialect.driver == "asyncpg" else None
+    sizes = {
+        "shape": (sum(statement_cache.shape_cache_sizes().values()), None),
+        "compiled": (compiled_size, compiled_capacity),
+        "prepared": (None, prepared_capacity),  # Per connection
+    }
+    caches = []
+    for name, (size, capacity) in sizes.items():
+        counts = statement_cache.hit_counts(name)
+        hits, misses = counts.pop("hit", 0), counts.pop("miss", 0)
+        caches.append(admin_schemas.StatementCacheRead(
+            name=name,
+            hits=hits,
+            misses=misses,
+            other=sum(counts.values()),
+            hit_rate=round(hits / (hits + misses), 4) if hits + misses else None,
+            size=size,
+            capacity=capacity,
+        ))
+    return admin_schemas.StatementCacheStatsRead(
+        pid=os.getpid(),
+        caches=caches,
+        shapes=statement_cache.shape_cache_sizes(),
+    )
@@ -0,0 +1,100 @@
+# app/admin/schemas.py
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+
+# --- Background Jobs ---
+class JobStatusRead(BaseModel):
+    name: str
+    interval_seconds: float
+    jitter_seconds: float
+    max_concurrency: int
+    leader_only: bool
+    running: int
+    run_count: int
+    failure_count: int
+    skipped_count: int
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+
+class SchedulerStatusRead(BaseModel):
+    enabled: bool
+    is_leader: bool  # Whether the worker answering this request holds the scheduler lock
+    jobs: List[JobStatusRead] = []
+    work_queue_pending: int = 0  # Tasks still to be handled, including ones waiting for a retry
+    work_queue_failed: int = 0  # Dead-lettered tasks (WORK_QUEUE_MAX_ATTEMPTS failures), kept for inspection
+
+# --- Password hashing ---
+class PasswordHasherStatsRead(BaseModel):
+    """Password hashing pool of the worker answering the request."""
+    workers: int
+    max_pending: int
+    pending: int  # Running + queued right now
+    completed: int
+    rejected: int  # Answered with 503 because the queue was full
+    avg_wait_ms: float
+    avg_run_ms: float
+    max_wait_ms: float
+
+# --- Profiling ---
+class RequestProfileRead(BaseModel):
+    id: str
+    method: str
+    path: str
+    status_code: Optional[int] = None
+    duration_ms: Optional[float] = None
+    samples: int
+
+class ProfilingStatusRead(BaseModel):
+    """Sampling profiler of the worker answering the request."""
+    pid: int
+    enabled: bool  # PROFILING_ENABLED; sessions cannot be started and X-Profile is ignored when off
+    running: bool
+    started_at: Optional[datetime] = None  # Of the current or last worker-wide session
+    stopped_at: Optional[datetime] = None
+    interval_ms: Optional[float] = None
+    samples: int = 0
+    recent_requests: List[RequestProfileRead] = []  # Newest first
+
+# --- Slow queries ---
+class SlowQueryRead(BaseModel):
+    fingerprint: str
+    sql: str  # Normalized: literals and parameters replaced by "?"
+    count: int
+    slow_count: int  # Executions over SLOW_QUERY_THRESHOLD_MS
+    total_ms: float
+    mean_ms: float
+    p95_ms: float  # Over recent executions
+    max_ms: float
+    last_seen_at: Optional[datetime] = None
+    plan: Optional[str] = None  # EXPLAIN (ANALYZE, BUFFERS) of a slow execution, for SELECTs
+    plan_ms: Optional[float] = None  # Duration of the execution that was explained
+    plan_captured_at: Optional[datetime] = None
+
+class SlowQueryLogRead(BaseModel):
+    """Slow-query log of the worker answering the request."""
+    pid: int
+    enabled: bool
+    threshold_ms: float
+    since: datetime
+    fingerprints: int
+    queries: List[SlowQueryRead] = []
+
+# --- Statement caches ---
+class StatementCacheRead(BaseModel):
+    name: str  # shape | compiled | prepared
+    hits: int
+    misses: int
+    other: int = 0  # Compiled cache: statements that cannot be cached
+    hit_rate: Optional[float] = None  # hits / (hits + misses), None before the first lookup
+    size: Optional[int] = None  # Current entries, where known
+    capacity: Optional[int] = None
+
+class StatementCacheStatsRead(BaseModel):
+    """Statement cache hit rates of the worker answering the request, since it started."""
+    pid: int
+    caches: List[StatementCacheRead] = []
+    shapes: Dict[str, int] = {}  # Built listing statements kept, by builder
@@ -0,0 +1,181 @@
+# app/auth/refresh_tokens.py
+"""
+Server-side refresh token store with rotation and reuse detection.
+
+Every refresh token is a row in refresh_tokens, keyed by the token's "jti" claim. A login starts
+a new family ("fam" claim); each /auth/refresh marks the presented token as rotated and issues
+its successor in the same family. A rotated token presented again means the token was copied
+(the legitimate client only ever holds the newest one), so the whole family is revoked and the
+session has to log in again. Logout revokes the family too.
+
+Checks are constant-time: claiming a token is a single UPDATE on the primary key, and families
+revoked on this worker are kept in a bounded in-memory cache, so replays of revoked tokens are
+rejected without touching the database. Expired rows are removed by the purge_refresh_tokens job
+(indexed on expires_at).
+"""
+import datetime
+import logging
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.security import create_refresh_token, decode_token
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 10000
+
+
+class RefreshGrant(NamedTuple):
+    user_id: int
+    family_id: Optional[str]  # None for tokens issued before the store existed
+    token_version: int
+
+
+class RevokedFamilyCache:
+    """Bounded set of revoked family ids; entries are dropped once every token of the family has expired."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._families: "OrderedDict[str, datetime.datetime]" = OrderedDict()
+
+    def add(self, family_id: str, expires_at: datetime.datetime) -> None:
+        self._families[family_id] = expires_at
+        self._families.move_to_end(family_id)
+        while len(self._families) > self.max_size:
+            self._families.popitem(last=False)
+
+    def __contains__(self, family_id: str) -> bool:
+        expires_at = self._families.get(family_id)
+        if expires_at is None:
+            return False
+        if expires_at < datetime.datetime.utcnow():
+            del self._families[family_id]
+            return False
+        return True
+
+
+class RefreshTokenStore:
+
+    def __init__(self):
+        self.revoked_families = RevokedFamilyCache(settings.REFRESH_TOKEN_REVOKED_CACHE_SIZE)
+
+    def issue(self, db: AsyncSession, user_id: int, token_version: int = 0, family_id: Optional[str] = None) -> str:
+        """Records a new refresh token in the caller's transaction and returns it. Starts a new family by default."""
+        token_id = uuid.uuid4().hex
+        family_id = family_id or uuid.uuid4().hex
+        expires_delta = datetime.timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        db.add(RefreshToken(
+            id=token_id,
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=datetime.datetime.utcnow() + expires_delta,
+        ))
+        return create_refresh_token(
+            subject=user_id,
+            expires_delta=expires_delta,
+            token_version=token_version,
+            token_id=token_id,
+            family_id=family_id,
+        )
+
+    async def rotate(self, db: AsyncSession, token: str) -> Optional[RefreshGrant]:
+        """
+        Claims a refresh token for exchange. Returns None if it is invalid, expired, revoked or
+        already used (reuse outside the grace period revokes its family). The caller issues the
+        successor with issue(..., family_id=grant.family_id) and commits.
+        """
+        payload = decode_token(token)
+        if payload is None or payload.get("type") != "refresh":
+            return None
+        try:
+            user_id = int(payload.get("sub"))
+        except (TypeError, ValueError):
+            return None
+        token_version = payload.get("ver", 0)
+
+        token_id, family_id = payload.get("jti"), payload.get("fam")
+        if token_id is None:
+            # Issued before the store existed: honoured until it expires, moved into a new family
+            return RefreshGrant(user_id, None, token_version)
+        if family_id in self.revoked_families:
+            return None
+
+        now = datetime.datetime.utcnow()
+        claimed = (
+            await db.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.id == token_id,
+                    RefreshToken.rotated_at.is_(None),
+                    RefreshToken.revoked_at.is_(None),
+                    RefreshToken.expires_at > now,
+                )
+                .values(rotated_at=now)
+                .returning(RefreshToken.user_id)
+            )
+        ).scalar_one_or_none()
+        if claimed is None:
+            await self._reject(db, token_id, now)
+            return None
+        return RefreshGrant(claimed, family_id, token_version)
+
+    async def revoke(self, db: AsyncSession, token: str) -> bool:
+        """Revokes the family of a refresh token (logout). Returns False if the token is not valid."""
+        payload = decode_token(token)
+        if payload is None or payload.get("type") != "refresh" or payload.get("fam") is None:
+            return False
+        await self._revoke_family(db, payload["fam"], datetime.datetime.utcnow())
+        return True
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        """Deletes expired tokens in batches. Returns the number of deleted rows."""
+        now = datetime.datetime.utcnow()
+        purged = 0
+        while True:
+            batch = select(RefreshToken.id).where(RefreshToken.expires_at < now).limit(PURGE_BATCH_SIZE)
+            deleted = (await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(batch.scalar_subquery())))).rowcount
+            await db.commit()
+            purged += deleted
+            if deleted < PURGE_BATCH_SIZE:
+                break
+        if purged:
+            logger.info(f"Purged {purged} expired refresh tokens")
+        return purged
+
+    async def _reject(self, db: AsyncSession, token_id: str, now: datetime.datetime) -> None:
+        """Handles a token that could not be claimed; revokes its family if this is a replay."""
+        row = (
+            await db.execute(
+                select(RefreshToken.family_id, RefreshToken.user_id, RefreshToken.rotated_at, RefreshToken.revoked_at)
+                .where(RefreshToken.id == token_id)
+            )
+        ).one_or_none()
+        await db.rollback()
+        if row is None or row.rotated_at is None and row.revoked_at is None:
+            return  # Purged or expired
+        if row.revoked_at is not None:
+            self.revoked_families.add(row.family_id, now + datetime.timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+            return
+        if (now - row.rotated_at).total_seconds() <= settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS:
+            # Most likely the same client refreshing twice concurrently: refuse, but keep the session
+            return
+        logger.warning(f"Refresh token reuse detected for user {row.user_id}; revoking token family {row.family_id}")
+        await self._revoke_family(db, row.family_id, now)
+
+    async def _revoke_family(self, db: AsyncSession, family_id: str, now: datetime.datetime) -> None:
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        await db.commit()
+        self.revoked_families.add(family_id, now + datetime.timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+
+
+refresh_token_store = RefreshTokenStore()
@@ -4,11 +4,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
 from app.core.database import get_async_db
+from app.core.rate_limit import rate_limited
 from app.auth import schemas as auth_schemas
 from app.schemas import token as token_schemas
 from app.schemas import common as common_schemas
 from app.auth.service import auth_service
 from app.auth import security
+from app.auth.refresh_tokens import refresh_token_store
 from app.dependencies import get_current_active_user, get_current_user
 from app.models.user import User # Import the User model
 
@@ -18,6 +20,7 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=auth_schemas.UserRead, status_code=status.HTTP_201_CREATED)
+@rate_limited("register")
 async def register_user(
     user_in: auth_schemas.UserCreate,
     db: AsyncSession = Depends(get_async_db)
@@ -30,6 +33,7 @@ async def register_user(
     return db_user
 
 @router.post("/login", response_model=token_schemas.Token)
+@rate_limited("login")
 async def login_for_access_token(
     db: AsyncSession = Depends(get_async_db),
     form_data: auth_schemas.LoginRequest = Body(...) # Use Body for JSON payload
@@ -49,47 +53,60 @@ async def login_for_access_token(
     # Add checks if user needs to be active or verified to login
     # if not user.email_verified_at: ...
 
-    access_token = security.create_access_token(subject=user.id)
-    refresh_token = security.create_refresh_token(subject=user.id)
+    access_token = security.create_access_token(subject=user.id, is_admin=user.is_admin, token_version=user.token_version)
+    refresh_token = refresh_token_store.issue(db, user_id=user.id, token_version=user.token_version)
+    await db.commit()
 
     return token_schemas.Token(access_token=access_token, refresh_token=refresh_token)
 
 @router.post("/refresh", response_model=token_schemas.Token)
+@rate_limited("refresh_token")
 async def refresh_access_token(
     refresh_request: token_schemas.RefreshTokenRequest,
     db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get a new access token using a refresh token.
+    Exchange a refresh token for new access and refresh tokens.
+    The presented refresh token is used up; presenting it again signs out the session.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate refresh token",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = security.decode_token(refresh_request.refresh_token)
-    if payload is None or payload.get("type") != "refresh":
+    grant = await refresh_token_store.rotate(db, refresh_request.refresh_token)
+    if grant is None:
         raise credentials_exception
 
-    user_id_str = payload.get("sub")
-    if user_id_str is None:
-        raise credentials_exception
-    try:
-        user_id = int(user_id_str)
-    except ValueError:
-        raise credentials_exception
-
-    user = await auth_service.get_user_by_id(db=db, user_id=user_id)
+    user = await auth_service.get_token_state(db=db, user_id=grant.user_id)
     if user is None:
         raise credentials_exception # User might have been deleted
+    if grant.token_version < user.token_version:
+        raise credentials_exception # Revoked by a password or role change
 
-    # Generate new tokens
-    new_access_token = security.create_access_token(subject=user.id)
-    # Optionally, generate a new refresh token as well for rotation
-    new_refresh_token = security.create_refresh_token(subject=user.id)
+    # Generate new tokens; the refresh token continues the same family
+    new_access_token = security.create_access_token(subject=user.id, is_admin=user.is_admin, token_version=user.token_version)
+    new_refresh_token = refresh_token_store.issue(
+        db, user_id=user.id, token_version=user.token_version, family_id=grant.family_id
+    )
+    await db.commit()
 
     return token_schemas.Token(access_token=new_access_token, refresh_token=new_refresh_token)
 
+@router.post("/logout", response_model=common_schemas.Message)
+@rate_limited("refresh_token")
+async def logout(
+    refresh_request: token_schemas.RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Revoke a refresh token and every token rotated from it (ends the session).
+    Access tokens already issued remain valid until they expire.
+    """
+    if not await refresh_token_store.revoke(db, refresh_request.refresh_token):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid refresh token")
+    return common_schemas.Message(message="Logged out successfully")
+
 
 # --- Profile Endpoints ---
 
@@ -115,6 +132,7 @@ async def update_users_me(
     return updated_user
 
 @router.put("/profile/password", response_model=common_schemas.Message)
+@rate_limited("change_password")
 async def update_users_password(
     password_in: auth_schemas.UserPasswordUpdate,
     current_user: CurrentUser,
@@ -122,6 +140,7 @@ async def update_users_password(
 ):
     """
     Update current logged-in user's password.
+    Signs out all sessions, including this one: log in again with the new password.
     """
     await auth_service.update_user_password(db=db, db_user=current_user, password_in=password_in)
     return common_schemas.Message(message="Password updated successfully")
@@ -1,22 +1,41 @@
 # app/auth/security.py
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union, Any
+from typing import Callable, Optional, Tuple, Union, Any
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# Hashes with fewer rounds than PASSWORD_BCRYPT_ROUNDS are reported as needing an update,
+# so raising the work factor rehashes passwords on the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
 
 ALGORITHM = settings.ALGORITHM
 SECRET_KEY = settings.SECRET_KEY
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    is_admin: bool = False,
+    token_version: int = 0,
+) -> str:
     """
-    Create a new access token with expiration time
+    Create a new access token with expiration time.
+    The role and token version claims let requests be authorized without loading the user.
     """
     if expires_delta is None:
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -25,13 +44,19 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     expire = datetime.now(timezone.utc) + expires_delta
     
     # Create payload with subject (user ID), type, and expiration
-    to_encode = {"sub": str(subject), "exp": expire, "type": "access"}
+    to_encode = {"sub": str(subject), "exp": expire, "type": "access", "adm": is_admin, "ver": token_version}
     
     # Sign the token
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def create_refresh_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def create_refresh_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    token_version: int = 0,
+    token_id: Optional[str] = None,
+    family_id: Optional[str] = None,
+) -> str:
     """
     Create a new refresh token with expiration time
     """
@@ -42,7 +67,10 @@ def create_refresh_token(subject: Union[str, Any], expires_delta: Optional[timed
     expire = datetime.now(timezone.utc) + expires_delta
     
     # Create payload with subject (user ID), type, and expiration
-    to_encode = {"sub": str(subject), "exp": expire, "type": "refresh"}
+    to_encode = {"sub": str(subject), "exp": expire, "type": "refresh", "ver": token_version}
+    if token_id is not None:
+        # Tracked by the refresh token store (app/auth/refresh_tokens.py)
+        to_encode.update({"jti": token_id, "fam": family_id})
     
     # Sign the token
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -54,6 +82,92 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hash operations are already waiting (answered with 503)."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded thread pool so hashing never blocks the event loop (bcrypt releases
+    the GIL while hashing). At most `workers` hashes run at once per process; up to `max_pending`
+    more wait in the pool's queue, beyond that calls fail fast with PasswordHasherBusy.
+    """
+
+    def __init__(self, context: CryptContext, workers: int, max_pending: int):
+        self.context = context
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._last_warning_at = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored hash uses outdated parameters."""
+        return await self._run(self.context.verify_and_update, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": self.total_wait_seconds / self.completed * 1000 if self.completed else 0.0,
+            "avg_run_ms": self.total_run_seconds / self.completed * 1000 if self.completed else 0.0,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
+
+    async def _run(self, func: Callable, *args):
+        if self._pending >= self.workers + self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+
+        self._pending += 1
+        queued_at = time.perf_counter()
+        try:
+            result, started_at, finished_at = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._timed, func, args
+            )
+        finally:
+            self._pending -= 1
+
+        wait = started_at - queued_at
+        self.completed += 1
+        self.total_wait_seconds += wait
+        self.total_run_seconds += finished_at - started_at
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        if wait > 1.0 and finished_at - self._last_warning_at > 60:
+            self._last_warning_at = finished_at
+            logger.warning(f"Password hashing queue is saturated: waited {wait * 1000:.0f}ms for a worker")
+        return result
+
+    @staticmethod
+    def _timed(func: Callable, args: tuple):
+        started_at = time.perf_counter()
+        result = func(*args)
+        return result, started_at, time.perf_counter()
+
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
 def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
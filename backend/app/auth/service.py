@@ -6,6 +6,7 @@ from typing import Optional
 
 from app.models.user import User
 from app.auth import schemas, security
+from app.auth.token_versions import token_versions
 
 class AuthService:
 
@@ -21,6 +22,11 @@ class AuthService:
         result = await db.execute(select(User).filter(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_token_state(self, db: AsyncSession, user_id: int):
+        """The columns needed to issue tokens (id, is_admin, token_version), without loading relationships."""
+        result = await db.execute(select(User.id, User.is_admin, User.token_version).filter(User.id == user_id))
+        return result.one_or_none()
+
     async def create_user(self, db: AsyncSession, user_in: schemas.UserCreate) -> User:
         # Check if email exists
         existing_user = await self.get_user_by_email(db, email=user_in.email)
@@ -37,7 +43,7 @@ class AuthService:
                 detail="Nickname already taken.",
             )
 
-        hashed_password = security.get_password_hash(user_in.password)
+        hashed_password = await security.password_hasher.hash(user_in.password)
         db_user = User(
             email=user_in.email,
             nickname=user_in.nickname,
@@ -55,8 +61,13 @@ class AuthService:
         user = await self.get_user_by_email(db, email=email)
         if not user:
             return None
-        if not security.verify_password(password, user.password_hash):
+        valid, new_hash = await security.password_hasher.verify_and_update(password, user.password_hash)
+        if not valid:
             return None
+        if new_hash:
+            # Stored hash used outdated parameters (e.g. fewer bcrypt rounds): upgrade it transparently
+            user.password_hash = new_hash
+            await db.commit()
         # Add checks for active status or verified email if needed
         # if not user.is_active: return None
         return user
@@ -82,14 +93,29 @@ class AuthService:
         return db_user
 
     async def update_user_password(self, db: AsyncSession, db_user: User, password_in: schemas.UserPasswordUpdate) -> User:
-        if not security.verify_password(password_in.current_password, db_user.password_hash):
+        if not await security.password_hasher.verify(password_in.current_password, db_user.password_hash):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect current password")
 
-        hashed_password = security.get_password_hash(password_in.new_password)
+        hashed_password = await security.password_hasher.hash(password_in.new_password)
         db_user.password_hash = hashed_password
+        self._revoke_tokens(db_user)
         await db.commit()
+        token_versions.set(db_user.id, db_user.token_version)
         # No need to refresh db_user here unless password_hash is needed immediately
         return db_user
 
+    async def set_admin(self, db: AsyncSession, db_user: User, is_admin: bool) -> User:
+        """Grants or revokes admin rights; tokens carrying the old role stop working."""
+        db_user.is_admin = is_admin
+        self._revoke_tokens(db_user)
+        await db.commit()
+        token_versions.set(db_user.id, db_user.token_version)
+        return db_user
+
+    @staticmethod
+    def _revoke_tokens(db_user: User) -> None:
+        # Tokens carry the version they were issued with; anything older than the new one is rejected
+        db_user.token_version = (db_user.token_version or 0) + 1
+
 
 auth_service = AuthService()
\ No newline at end of file
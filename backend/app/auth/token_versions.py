@@ -0,0 +1,58 @@
+# app/auth/token_versions.py
+"""
+In-memory table of the minimum valid access-token version per user.
+
+Access tokens carry the user's token_version (and is_admin) as signed claims, so requests can be
+authorized without loading the user. A password or role change bumps users.token_version; the
+worker making the change updates its table immediately and every other worker picks the change
+up within TOKEN_VERSION_SYNC_SECONDS (sync_token_versions job), after which older tokens are
+rejected. Until the first sync has completed, callers fall back to checking the database.
+"""
+import datetime
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Re-read rows updated slightly before the last watermark, to cover transactions that committed late
+SYNC_OVERLAP = datetime.timedelta(seconds=60)
+
+
+class TokenVersionTable:
+
+    def __init__(self):
+        self._versions: Dict[int, int] = {}
+        self._synced_until: Optional[datetime.datetime] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._synced_until is not None
+
+    def is_current(self, user_id: int, token_version: int) -> bool:
+        return token_version >= self._versions.get(user_id, 0)
+
+    def set(self, user_id: int, token_version: int) -> None:
+        if token_version > self._versions.get(user_id, 0):
+            self._versions[user_id] = token_version
+
+    async def sync(self, db: AsyncSession) -> int:
+        """Loads versions changed since the last sync (all non-zero versions on the first run). Returns rows read."""
+        query = select(User.id, User.token_version, func.now())
+        if self._synced_until is None:
+            query = query.where(User.token_version > 0)
+        else:
+            query = query.where(User.updated_at >= self._synced_until - SYNC_OVERLAP)
+        rows = (await db.execute(query)).all()
+        for user_id, token_version, _ in rows:
+            self.set(user_id, token_version)
+        self._synced_until = rows[0][2] if rows else (await db.scalar(select(func.now())))
+        await db.rollback()
+        return len(rows)
+
+
+token_versions = TokenVersionTable()
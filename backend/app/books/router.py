@@ -5,6 +5,7 @@ from sqlalchemy.future import select
 from typing import Optional, List
 
 from app.core.database import get_async_db
+from app.core.query_budget import endpoint_query_budget
 from app.books import schemas, service
 from app.schemas.common import PaginationParams, PaginatedResponse
 from app.models import books as book_models  # Add this import
@@ -15,6 +16,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=PaginatedResponse[schemas.BookReadBrief])
+@endpoint_query_budget(2)
 async def list_books(
     db: AsyncSession = Depends(get_async_db),
     # Filtering parameters
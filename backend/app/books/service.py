@@ -1,7 +1,8 @@
 # app/books/service.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc, asc, or_, and_
+from sqlalchemy import func, desc, asc, or_, and_, exists, bindparam, Integer
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import selectinload, joinedload # For eager loading
 from typing import List, Optional, Tuple
 from decimal import Decimal
@@ -10,6 +11,9 @@ from app.models import books as book_models
 from app.models import item as item_models # For Item base query if needed
 from app.books import schemas
 from app.schemas.common import PaginationParams
+from app.utils.sql import INT2_LIMITS, range_condition, range_params, schema_columns
+from app.core.statement_cache import StatementShapes
+from app.reviews.ranking import prior_mean_rating
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,80 +45,96 @@ class BookService:
         result = await db.execute(select(book_models.Book).filter(book_models.Book.name == name))
         return result.scalar_one_or_none()
 
-    async def list_books(
+    # Built listing statements by shape (see app/core/statement_cache.py)
+    list_shapes = StatementShapes("books")
+
+    def build_list_queries(
         self,
-        db: AsyncSession,
         filters: schemas.BookFilterParams,
         sort: schemas.BookSortBy,
         pagination: PaginationParams,
-    ) -> Tuple[List[book_models.Book], int]:
-        """Lists books with filtering, sorting, and pagination."""
+    ):
+        """
+        Builds the (page query, count query, parameters) triple for the book listing.
+        Filter values are bind parameters; each shape is built once per worker (list_shapes).
+        """
+        params = {"page_offset": pagination.skip, "page_limit": pagination.limit}
+        if filters.name:
+            params["name_pattern"] = f"%{filters.name}%"
+        range_params(params, "year", filters.min_year, filters.max_year, limits=INT2_LIMITS)
+        range_params(params, "total_review_count", filters.min_total_review_count, filters.max_total_review_count)
+        if filters.topic_id:
+            params["topic_id"] = filters.topic_id
 
-        query = select(book_models.Book).options(
-            # Eager load only necessary fields for list view if needed
-            # selectinload(book_models.Book.topics) # Maybe too heavy for list view
-        )
+        shape = (frozenset(params), sort.field, sort.direction)
+        query, count_query = self.list_shapes.get(shape, lambda: self._build_list_statements(*shape))
+        return query, count_query, params
+
+    def _build_list_statements(self, param_names, sort_field: str, direction: str):
+        Book = book_models.Book
+
+        query = select(*schema_columns(Book, schemas.BookReadBrief))
 
         # --- Filtering ---
         filter_conditions = []
-        if filters.name:
+        if "name_pattern" in param_names:
             # Note: Item.name is used for Book title
-            filter_conditions.append(book_models.Book.name.ilike(f"%{filters.name}%"))
-        if filters.min_year is not None:
-            filter_conditions.append(book_models.Book.year >= filters.min_year)
-        if filters.max_year is not None:
-            filter_conditions.append(book_models.Book.year <= filters.max_year)
+            filter_conditions.append(Book.name.ilike(bindparam("name_pattern")))
+        if "min_year" in param_names:
+            filter_conditions.append(range_condition(Book.year, "year"))
 
         # Review count filtering (inherited from Item)
-        if filters.min_total_review_count is not None:
-            filter_conditions.append(book_models.Book.total_review_count >= filters.min_total_review_count)
-        if filters.max_total_review_count is not None:
-            filter_conditions.append(book_models.Book.total_review_count <= filters.max_total_review_count)
+        if "min_total_review_count" in param_names:
+            filter_conditions.append(range_condition(Book.total_review_count, "total_review_count"))
 
-        # Filtering by M2M relationship (topics)
-        if filters.topic_id:
-            query = query.join(book_models.book_topics_table).filter(book_models.book_topics_table.c.topic_id == filters.topic_id)
-            # No need to add to filter_conditions, join handles it. Ensure distinct below.
+        # Filtering by M2M relationship (topics), as a semi-join so no DISTINCT is needed
+        if "topic_id" in param_names:
+            book_topics = book_models.book_topics_table
+            filter_conditions.append(exists().where(
+                book_topics.c.book_id == Book.id,
+                book_topics.c.topic_id == bindparam("topic_id"),
+            ))
 
         if filter_conditions:
-             query = query.where(and_(*filter_conditions))
-
-        # Use distinct if joins were added (like for topic_id)
-        if filters.topic_id:
-            query = query.distinct()
+            query = query.where(and_(*filter_conditions))
 
         # --- Count Total ---
-        # Create a separate count query applying the same filters
-        count_query = select(func.count(book_models.Book.id))
+        count_query = select(func.count()).select_from(Book)
         if filter_conditions:
             count_query = count_query.where(and_(*filter_conditions))
-        if filters.topic_id:
-            # Apply the join to the count query as well
-            count_query = count_query.join(book_models.book_topics_table).filter(book_models.book_topics_table.c.topic_id == filters.topic_id)
-            # Count distinct book IDs after the join
-            count_query = select(func.count(book_models.Book.id.distinct())).select_from(book_models.Book)
-            if filter_conditions:
-                 count_query = count_query.where(and_(*filter_conditions))
-            count_query = count_query.join(book_models.book_topics_table).filter(book_models.book_topics_table.c.topic_id == filters.topic_id)
-
-
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one() or 0
 
         # --- Sorting ---
         # Handle sorting by fields from Book or inherited Item
-        sort_column = getattr(book_models.Book, sort.field)
-        if sort.direction == 'desc':
+        sort_column = getattr(Book, sort_field)
+        if direction == 'desc':
             query = query.order_by(desc(sort_column))
         else:
             query = query.order_by(asc(sort_column))
 
         # --- Pagination ---
-        query = query.offset(pagination.skip).limit(pagination.limit)
+        query = query.offset(bindparam("page_offset", type_=Integer)).limit(bindparam("page_limit", type_=Integer))
+
+        return query, count_query
+
+    async def list_books(
+        self,
+        db: AsyncSession,
+        filters: schemas.BookFilterParams,
+        sort: schemas.BookSortBy,
+        pagination: PaginationParams,
+    ) -> Tuple[List[Row], int]:
+        """
+        Lists books with filtering, sorting, and pagination.
+        Returns rows with just the BookReadBrief columns, not Book entities.
+        """
+        query, count_query, params = self.build_list_queries(filters, sort, pagination)
+
+        total_result = await db.execute(count_query, params)
+        total = total_result.scalar_one() or 0
 
         # --- Execute Query ---
-        result = await db.execute(query)
-        books = result.scalars().all()
+        result = await db.execute(query, params)
+        books = result.all()
 
         return books, total
 
@@ -144,6 +164,8 @@ class BookService:
             logger.info(f"Adding {len(book_in.topic_ids)} topics")
             topics = await db.execute(select(book_models.Topic).filter(book_models.Topic.id.in_(book_in.topic_ids)))
             db_book.topics.extend(topics.scalars().all())
+        # Unreviewed items rank at the prior mean, not below every reviewed one
+        db_book.ranking_score = await prior_mean_rating(db)
 
         db.add(db_book)
         await db.commit()
@@ -2,7 +2,7 @@ import click
 import asyncio
 
 # Import the session factory and seeding functions
-from .core.database import init_db, init_countries, AsyncSessionFactory
+from .core.database import init_db, AsyncSessionFactory
 from ..scripts.init_fiat_currencies import seed_fiat_currencies
 from ..scripts.init_static_pages import generate_static_pages
 
@@ -25,10 +25,33 @@ def init_database(force: bool):
     asyncio.run(init_db())
     click.echo("Database initialized successfully.")
 
+@cli.command("migrate")
+@click.option("--revision", default="head", help="Target revision (default: head).")
+@click.option("--check", is_flag=True, help="Only report whether the schema is current.")
+def migrate(revision: str, check: bool):
+    """Apply pending Alembic migrations."""
+    from .core.database import engine
+    from .core.migrations import get_alembic_config, get_database_revision, get_head_revision, upgrade_database
+
+    if check:
+        current = asyncio.run(get_database_revision(engine))
+        head = get_head_revision()
+        click.echo(f"Database revision: {current}, head: {head}")
+        raise SystemExit(0 if current == head else 1)
+
+    if revision == "head":
+        asyncio.run(upgrade_database(engine))
+    else:
+        from alembic import command
+        command.upgrade(get_alembic_config(), revision)
+    click.echo("Database migrated successfully.")
+
 @cli.command("init-db-countries")
 @click.option("--force", is_flag=True, help="Force re-initialize the database.")
 def init_database_countries(force: bool):
     """Initialize the database with countries."""
+    from .core.countries import init_countries
+
     asyncio.run(init_countries())
     click.echo("Countries initialized successfully.")
 
@@ -52,6 +75,50 @@ def init_pages():
     asyncio.run(run_generate())
     click.echo("Static pages generated successfully.")
 
+@cli.command("set-admin")
+@click.argument("email")
+@click.option("--revoke", is_flag=True, help="Remove admin rights instead of granting them.")
+def set_admin(email: str, revoke: bool):
+    """Grant (or revoke) admin rights; the user's existing tokens are invalidated."""
+    from .auth.service import auth_service
+
+    async def run_set_admin():
+        async with AsyncSessionFactory() as session:
+            user = await auth_service.get_user_by_email(session, email=email)
+            if user is None:
+                return False
+            await auth_service.set_admin(session, user, is_admin=not revoke)
+            return True
+    if not asyncio.run(run_set_admin()):
+        raise click.ClickException(f"No user with email {email}")
+    click.echo(f"{'Revoked' if revoke else 'Granted'} admin rights for {email}.")
+
+@cli.command("generate-fixtures")
+@click.option("--scale", type=click.Choice(["small", "medium", "full"]), default="small", help="Dataset size (see app/fixtures.py).")
+@click.option("--seed", type=int, default=1, help="Random seed; the same seed and scale produce the same data.")
+def generate_fixtures(scale: str, seed: int):
+    """Fill an empty database with a synthetic dataset for load and query-plan testing."""
+    import logging
+    import time
+
+    from .core.database import engine
+    from .fixtures import SCALES, FixtureGenerator
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    click.echo(f"Generating '{scale}' fixtures (seed {seed})...")
+    started = time.perf_counter()
+
+    async def run_generate():
+        try:
+            await FixtureGenerator(engine, SCALES[scale], seed=seed).generate()
+        finally:
+            await engine.dispose()
+    try:
+        asyncio.run(run_generate())
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Fixtures generated in {time.perf_counter() - started:.1f}s.")
+
 @cli.command("drop-db")
 @click.option("--force", is_flag=True, help="Force drop the database without confirmation.")
 def drop_database(force: bool):
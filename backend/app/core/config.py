@@ -1,12 +1,9 @@
 # app/core/config.py
 import os
 from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
-from pathlib import Path
 
-# Load .env file from the project root
-env_path = Path('.') / '.env'
-load_dotenv(dotenv_path=env_path)
+# Values from .env are applied by pydantic-settings (Config.env_file below); the os.getenv defaults
+# cover the process environment, so no separate dotenv pass is needed at import
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Crypta.Info API"
@@ -14,16 +11,105 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Statement caches: SQLAlchemy's compiled statements per engine, asyncpg's prepared statements per connection
+    # (hit rates at /metrics and /admin/statement-cache)
+    DB_COMPILED_CACHE_SIZE: int = int(os.getenv("DB_COMPILED_CACHE_SIZE", 1000))
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 500))
 
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "default_secret_key_change_this") # CHANGE THIS IN PRODUCTION
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
+    # How often each worker reloads changed token versions (bounds how long a revoked access token stays usable)
+    TOKEN_VERSION_SYNC_SECONDS: float = float(os.getenv("TOKEN_VERSION_SYNC_SECONDS", 5))
+    # Refresh token store: a rotated token presented again within the grace period (concurrent refreshes
+    # from one client) is rejected without revoking its family; revoked families cached per worker
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: float = float(os.getenv("REFRESH_TOKEN_REUSE_GRACE_SECONDS", 10))
+    REFRESH_TOKEN_REVOKED_CACHE_SIZE: int = int(os.getenv("REFRESH_TOKEN_REVOKED_CACHE_SIZE", 100000))
+    REFRESH_TOKEN_PURGE_SECONDS: float = float(os.getenv("REFRESH_TOKEN_PURGE_SECONDS", 3600))
+    # Request instrumentation (Server-Timing header, /metrics); METRICS_TOKEN, if set, is required as a bearer token on /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    # Per-request SQL statement budgets: off | warn (staging, logs with stack traces) | raise (development)
+    QUERY_BUDGET_MODE: str = os.getenv("QUERY_BUDGET_MODE", "off")
+    QUERY_BUDGET_DEFAULT: int = int(os.getenv("QUERY_BUDGET_DEFAULT", 20))  # For routes without @endpoint_query_budget; 0 disables
+    # Sampling profiler (opt-in; admin endpoints and the X-Profile request header for admins); sessions stop after PROFILING_MAX_SECONDS
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", 5))
+    PROFILING_MAX_SECONDS: float = float(os.getenv("PROFILING_MAX_SECONDS", 300))
+    # Slow-query log (opt-in): per-statement-shape aggregates, and EXPLAIN (ANALYZE, BUFFERS) of SELECTs slower
+    # than the threshold, captured at most once per shape per SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS
+    SLOW_QUERY_LOG_ENABLED: bool = os.getenv("SLOW_QUERY_LOG_ENABLED", "false").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: float = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", 600))
+    SLOW_QUERY_MAX_FINGERPRINTS: int = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", 1000))
+    # Warm-up before a worker starts serving: opens WARMUP_CONNECTIONS pool connections and runs in-process
+    # GETs of WARMUP_PATHS (comma-separated), so hot SQL and response models are compiled before the first request
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "false").lower() == "true"
+    WARMUP_CONNECTIONS: int = int(os.getenv("WARMUP_CONNECTIONS", 5))
+    WARMUP_PATHS: str = os.getenv(
+        "WARMUP_PATHS",
+        "/api/v1/exchanges/,/api/v1/books/,/api/v1/reviews/,/api/v1/news/,/api/v1/guides/,/api/v1/common/countries",
+    )
+
+    # Password hashing: bcrypt work factor (existing hashes are upgraded on login when it changes),
+    # hashing threads per worker process and how many more calls may queue before answering 503
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+    # Startup check that the database is migrated to the code's Alembic head: strict | warn | off
+    SCHEMA_CHECK_MODE: str = os.getenv("SCHEMA_CHECK_MODE", "warn")
+
+    # Serialize hot list endpoints with compiled serializers + orjson instead of response_model validation
+    FAST_JSON_RESPONSES: bool = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+    # Rate limiting of abuse-prone endpoints (see app/core/rate_limit.py for policies)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory (per worker) | redis (shared)
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_POLICIES: str = os.getenv("RATE_LIMIT_POLICIES", "")  # Overrides, e.g. "login=ip:10/60,ip:100/3600"
+    RATE_LIMIT_TRUST_PROXY_HEADERS: bool = os.getenv("RATE_LIMIT_TRUST_PROXY_HEADERS", "false").lower() == "true"  # Use X-Forwarded-For
 
     # API Prefixes (optional, good practice)
     API_V1_STR: str = "/api/v1"
 
+    # Background scheduler
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_LOCK_KEY: int = int(os.getenv("SCHEDULER_LOCK_KEY", 7204319))  # Postgres advisory lock id for leader election
+    SCHEDULER_LEADER_CHECK_SECONDS: float = float(os.getenv("SCHEDULER_LEADER_CHECK_SECONDS", 15))
+    REVIEW_STATS_REFRESH_SECONDS: float = float(os.getenv("REVIEW_STATS_REFRESH_SECONDS", 900))
+    RANKING_REFRESH_SECONDS: float = float(os.getenv("RANKING_REFRESH_SECONDS", 3600))
+    EXCHANGE_SYNC_INTERVAL_SECONDS: float = float(os.getenv("EXCHANGE_SYNC_INTERVAL_SECONDS", 0))  # 0 disables the in-app sync
+
+    # Durable work queue (work_queue table) drained by every worker. New tasks are picked up
+    # immediately by the enqueuing worker, otherwise within WORK_QUEUE_POLL_SECONDS; a warning is
+    # logged when a task waited longer than WORK_QUEUE_MAX_LAG_SECONDS.
+    WORK_QUEUE_POLL_SECONDS: float = float(os.getenv("WORK_QUEUE_POLL_SECONDS", 2))
+    WORK_QUEUE_BATCH_SIZE: int = int(os.getenv("WORK_QUEUE_BATCH_SIZE", 100))
+    WORK_QUEUE_MAX_ATTEMPTS: int = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", 10))
+    WORK_QUEUE_MAX_LAG_SECONDS: float = float(os.getenv("WORK_QUEUE_MAX_LAG_SECONDS", 30))
+
+    # Ranking score: Bayesian average with RANKING_PRIOR_WEIGHT pseudo-reviews at the global mean,
+    # review weights halving every RANKING_HALF_LIFE_DAYS
+    RANKING_PRIOR_WEIGHT: float = float(os.getenv("RANKING_PRIOR_WEIGHT", 10))
+    RANKING_HALF_LIFE_DAYS: float = float(os.getenv("RANKING_HALF_LIFE_DAYS", 365))
+
+    # Near-duplicate review filter (in-memory MinHash index per worker, see app/reviews/spam.py).
+    # A submission at least SPAM_SIMILARITY_THRESHOLD similar to an indexed review is held for moderation;
+    # the SPAM_FLOOD_THRESHOLD-th copy within SPAM_FLOOD_WINDOW_SECONDS is rejected.
+    SPAM_FILTER_ENABLED: bool = os.getenv("SPAM_FILTER_ENABLED", "true").lower() == "true"
+    SPAM_SIMILARITY_THRESHOLD: float = float(os.getenv("SPAM_SIMILARITY_THRESHOLD", 0.7))
+    SPAM_FLOOD_THRESHOLD: int = int(os.getenv("SPAM_FLOOD_THRESHOLD", 3))
+    SPAM_FLOOD_WINDOW_SECONDS: float = float(os.getenv("SPAM_FLOOD_WINDOW_SECONDS", 3600))
+    SPAM_INDEX_MAX_REVIEWS: int = int(os.getenv("SPAM_INDEX_MAX_REVIEWS", 200000))
+    SPAM_INDEX_REFRESH_SECONDS: float = float(os.getenv("SPAM_INDEX_REFRESH_SECONDS", 900))
+
+    # CoinGecko data sync; without a key the sync_exchange_data job is not registered and the sync fails
+    COINGECKO_API_KEY: str = os.getenv("COINGECKO_API_KEY", "")
+
     class Config:
         case_sensitive = True
         env_file = '.env'
@@ -0,0 +1,311 @@
+# app/core/metrics.py
+"""
+Request-level instrumentation: per-route latency histograms, database statement counts and
+time per request, and a Server-Timing header on every response.
+
+MetricsMiddleware opens a RequestStats for each HTTP request (held in a context variable, so it
+follows the request into SQLAlchemy's greenlets and FastAPI's threadpool). The engine's cursor
+events add every statement and its duration to it, and instrument_routes() marks when the
+endpoint function returns, so everything between that and the first response byte (response_model
+validation, JSON rendering) is counted as serialization, as is explicit work inside
+track_serialization(). The header looks like
+
+    Server-Timing: db;dur=12.4;desc="7 queries", serialize;dur=3.1, app;dur=5.0, total;dur=20.5
+
+Aggregates are exposed in the Prometheus text format at /metrics. They are kept per worker
+process: scrape each worker, or aggregate across workers in the query. A route with many
+statements per request is an N+1 candidate; one dominated by serialize time is serialization-bound.
+"""
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+class Counter:
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, List[float]] = {}  # labels -> per-bucket counts (+Inf last), then sum
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _format_value(bound)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.label_names + ('le',), labels + (le,))} {_format_value(cumulative)}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {_format_value(cumulative)}")
+        return lines
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def expose(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"),
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "Time until the response was sent, by route.", ("method", "route"),
+))
+http_request_db_seconds = registry.register(Histogram(
+    "http_request_db_seconds", "Time spent executing SQL statements per request, by route.", ("method", "route"),
+))
+http_request_serialize_seconds = registry.register(Histogram(
+    "http_request_serialize_seconds", "Time spent serializing the response per request, by route.", ("method", "route"),
+))
+http_request_db_statements = registry.register(Histogram(
+    "http_request_db_statements", "SQL statements executed per request, by route.", ("method", "route"),
+    buckets=STATEMENT_BUCKETS,
+))
+db_statements_total = registry.register(Counter(
+    "db_statements_total", "SQL statements executed, inside and outside requests.",
+))
+db_statement_seconds_total = registry.register(Counter(
+    "db_statement_seconds_total", "Total time spent executing SQL statements.",
+))
+
+
+# --- Per-request stats ---
+
+class RequestStats:
+    __slots__ = ("started_at", "db_statements", "db_seconds", "serialize_seconds", "endpoint_done_at")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.db_statements = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.endpoint_done_at: Optional[float] = None
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+@contextmanager
+def track_serialization() -> Iterator[None]:
+    """Counts the enclosed work as serialization time of the current request (e.g. explicit fast-path encoding)."""
+    stats = _request_stats.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - started
+
+
+# --- SQLAlchemy hooks ---
+
+_instrumented_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Counts statements and their execution time, globally and for the request that issued them."""
+    sync_engine = engine.sync_engine
+    if sync_engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(sync_engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        db_statements_total.inc()
+        db_statement_seconds_total.inc(amount=elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_statements += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started_at"):
+            connection.info["query_started_at"].pop()
+
+
+# --- Routes ---
+
+def instrument_routes(routes) -> None:
+    """Wraps every endpoint function to record when it returned (the start of response serialization)."""
+    for route in routes:
+        if not isinstance(route, APIRoute) or getattr(route.dependant.call, "__instrumented__", False):
+            continue
+        route.dependant.call = _mark_endpoint_done(route.dependant.call)
+
+
+def _mark_endpoint_done(call):
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    endpoint.__instrumented__ = True
+    return endpoint
+
+
+def _endpoint_done() -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.endpoint_done_at = time.perf_counter()
+
+
+# --- Middleware ---
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route metrics and adding the Server-Timing header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        sent_at: Optional[float] = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code, sent_at
+            if message["type"] == "http.response.start":
+                sent_at = time.perf_counter()
+                status_code = message["status"]
+                if stats.endpoint_done_at is not None:
+                    stats.serialize_seconds += sent_at - stats.endpoint_done_at
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", self._server_timing(stats, sent_at).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            self._record(scope, stats, status_code, (sent_at or time.perf_counter()) - stats.started_at)
+
+    @staticmethod
+    def _server_timing(stats: RequestStats, now: float) -> str:
+        total = now - stats.started_at
+        app = max(0.0, total - stats.db_seconds - stats.serialize_seconds)
+        return (
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_statements} queries", '
+            f"serialize;dur={stats.serialize_seconds * 1000:.1f}, "
+            f"app;dur={app * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
+        )
+
+    @staticmethod
+    def _record(scope: Scope, stats: RequestStats, status_code: int, duration: float) -> None:
+        route = scope.get("route")
+        # Route templates keep label cardinality bounded; unmatched paths share one label
+        route_label = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+        method = scope["method"]
+        http_requests_total.inc(method, route_label, str(status_code))
+        http_request_duration_seconds.observe(duration, method, route_label)
+        http_request_db_seconds.observe(stats.db_seconds, method, route_label)
+        http_request_serialize_seconds.observe(stats.serialize_seconds, method, route_label)
+        http_request_db_statements.observe(stats.db_statements, method, route_label)
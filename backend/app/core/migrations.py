@@ -0,0 +1,193 @@
+# app/core/migrations.py
+"""
+Alembic integration: applying migrations, the startup "schema is current" check,
+and online-safe operations for revision scripts in migrations/versions.
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from alembic import command, op
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+BASELINE_REVISION = "0001"
+
+
+class SchemaOutOfDateError(RuntimeError):
+    pass
+
+
+def get_alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    return config
+
+
+def get_head_revision() -> Optional[str]:
+    """Head revision of the migration scripts (read from files, no database access)."""
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def _current_revision(connection: Connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def _run_command(connection: Connection, name: str, revision: str) -> None:
+    config = get_alembic_config()
+    config.attributes["connection"] = connection
+    getattr(command, name)(config, revision)
+
+
+def _migrate(connection: Connection) -> None:
+    """
+    Brings the database to head:
+    - empty database: create_all + stamp head (no need to replay history);
+    - database created by create_all before migrations existed: stamp baseline, then upgrade;
+    - otherwise: upgrade.
+    """
+    from app.models.base import Base
+
+    table_names = set(inspect(connection).get_table_names())
+    connection.commit()  # Alembic manages its own transactions on this connection
+    if "alembic_version" not in table_names:
+        if not table_names & set(Base.metadata.tables):
+            logger.info("Empty database, creating schema and stamping head")
+            Base.metadata.create_all(connection)
+            connection.commit()
+            _run_command(connection, "stamp", "head")
+            return
+        logger.info(f"Unversioned database, stamping baseline {BASELINE_REVISION}")
+        _run_command(connection, "stamp", BASELINE_REVISION)
+    _run_command(connection, "upgrade", "head")
+
+
+async def upgrade_database(engine: AsyncEngine) -> None:
+    """Applies all pending migrations."""
+    async with engine.connect() as conn:
+        await conn.run_sync(_migrate)
+
+
+async def get_database_revision(engine: AsyncEngine) -> Optional[str]:
+    async with engine.connect() as conn:
+        return await conn.run_sync(_current_revision)
+
+
+async def check_schema_current(engine: AsyncEngine, mode: Optional[str] = None) -> bool:
+    """
+    Startup check: compares the database revision with the migration head.
+    One indexed SELECT on alembic_version, no reflection.
+    mode: "strict" raises SchemaOutOfDateError, "warn" logs, "off" skips (default: settings.SCHEMA_CHECK_MODE).
+    """
+    mode = mode or settings.SCHEMA_CHECK_MODE
+    if mode == "off":
+        return True
+
+    head = get_head_revision()
+    try:
+        current = await get_database_revision(engine)
+    except Exception as e:
+        current = None
+        logger.warning(f"Could not read schema revision: {e}")
+
+    if current == head:
+        return True
+
+    message = f"Database schema revision is {current}, code expects {head}. Run 'python -m app.cli migrate'."
+    if mode == "strict":
+        raise SchemaOutOfDateError(message)
+    logger.warning(message)
+    return False
+
+
+# --- Online-safe operations for revision scripts ---
+
+def set_lock_timeout(timeout: Union[str, int] = "5s") -> None:
+    """
+    Fail fast instead of queueing behind long transactions (and blocking every query queued behind us).
+    Session-level: stays in effect for the rest of the migration run.
+    """
+    if isinstance(timeout, int):
+        timeout = f"{timeout}ms"
+    op.execute(text(f"SET lock_timeout = '{timeout}'"))
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence,
+    where=None,
+    unique: bool = False,
+    lock_timeout: Union[str, int] = "5s",
+) -> None:
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS, outside the migration transaction.
+    A failed concurrent build leaves an INVALID index behind; it is dropped first so a rerun rebuilds it.
+    """
+    context = op.get_context()
+    with context.autocommit_block():
+        set_lock_timeout(lock_timeout)
+        invalid = not context.as_sql and op.get_bind().execute(
+            text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ),
+            {"name": name},
+        ).first()
+        if invalid:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            name, table, list(columns),
+            unique=unique,
+            postgresql_where=where,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def drop_index_concurrently(name: str, table: str, lock_timeout: Union[str, int] = "5s") -> None:
+    with op.get_context().autocommit_block():
+        set_lock_timeout(lock_timeout)
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def batched_backfill(
+    table: str,
+    set_clause: str,
+    where_clause: str,
+    batch_size: int = 5000,
+    pause_seconds: float = 0.05,
+    key: str = "id",
+) -> int:
+    """
+    UPDATE <table> SET <set_clause> WHERE <where_clause> in short batches, each in its own transaction,
+    so row locks are held briefly and autovacuum can keep up. where_clause must stop matching
+    rows once they are backfilled (e.g. "new_col IS NULL"). Returns the number of updated rows.
+    Runs in autocommit mode, so every batch commits on its own.
+    """
+    statement = text(
+        f"UPDATE {table} SET {set_clause} WHERE {key} IN ("
+        f"SELECT {key} FROM {table} WHERE {where_clause} LIMIT :batch_size FOR UPDATE SKIP LOCKED)"
+    )
+    total = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            updated = bind.execute(statement, {"batch_size": batch_size}).rowcount
+            total += updated
+            if updated < batch_size:
+                break
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    logger.info(f"Backfilled {total} rows in {table}")
+    return total
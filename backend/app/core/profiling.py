@@ -0,0 +1,321 @@
+# app/core/profiling.py
+"""
+On-demand sampling profiler for production workers, with collapsed-stack and flamegraph output.
+
+Two ways to profile:
+
+- Worker-wide: POST /api/v1/admin/profiling/start, then GET /api/v1/admin/profiling/profile (while
+  running or after POST .../stop). Every thread of the worker that answered is sampled: the event
+  loop and the threadpool (password hashing, sync endpoints). Workers profile independently; the
+  status response carries the pid.
+- Per request: an admin sends "X-Profile: 1". The event loop thread is sampled every millisecond
+  while the request's own task runs; samples taken while the task is suspended (awaiting the
+  database, or other requests running) are counted as AWAITING_FRAME. Telling the tasks apart
+  relies on an asyncio internal (see ProfilingMiddleware._task_is_running); where it is not
+  available, the whole loop thread is sampled. The response carries
+  X-Profile-Id, and the profile is fetched from GET /api/v1/admin/profiling/requests/{id}. Recent
+  request profiles are kept in memory (REQUEST_PROFILES_KEPT).
+
+Samples are taken from a background thread through sys._current_frames() every
+PROFILING_INTERVAL_MS, so profiled code is not instrumented; the cost is the sampler thread
+holding the GIL briefly per sample. Without an active profile no sampler runs and the middleware
+only checks for the header. All of it is opt-in (PROFILING_ENABLED, off by default): when
+disabled the middleware is not installed and worker-wide sessions cannot be started.
+
+Collapsed stacks ("outer;inner;leaf count" per line) are the input of flamegraph.pl and can be
+opened in speedscope; flamegraph_svg() renders a self-contained SVG.
+"""
+import asyncio
+import datetime
+import html
+import os
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, OrderedDict
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+REQUEST_PROFILES_KEPT = 50
+REQUEST_SAMPLE_INTERVAL = 0.001  # Requests are short: sampled more often than worker-wide sessions
+AWAITING_FRAME = "(awaiting)"
+
+_PATH_PREFIXES = sorted({os.path.join(path, "") for path in sys.path if path}, key=len, reverse=True)
+
+
+def _frame_label(code, cache: Dict) -> str:
+    label = cache.get(code)
+    if label is None:
+        filename = code.co_filename
+        for prefix in _PATH_PREFIXES:
+            if filename.startswith(prefix):
+                filename = filename[len(prefix):]
+                break
+        name = getattr(code, "co_qualname", code.co_name)
+        # One label per function (first line), so samples from different lines merge
+        label = cache[code] = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+    return label
+
+
+class StackSampler:
+    """Counts the stacks of one thread (or all threads) from a background thread until stopped."""
+
+    def __init__(
+        self,
+        interval: float,
+        thread_id: Optional[int] = None,
+        should_sample: Optional[Callable[[], bool]] = None,
+        max_seconds: float = 300,
+    ):
+        self.interval = interval
+        self.thread_id = thread_id  # None: every thread except the sampler
+        self.should_sample = should_sample  # When it returns False the sample counts as AWAITING_FRAME
+        self.max_seconds = max_seconds
+        self.samples = 0
+        self.started_at: Optional[datetime.datetime] = None
+        self.stopped_at: Optional[datetime.datetime] = None
+        self._stacks: Counter = Counter()
+        self._labels: Dict = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self) -> "StackSampler":
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        # Not joined: the thread exits within one interval, and stop() is called from the event loop
+        if not self._stop.is_set():
+            self._stop.set()
+            self.stopped_at = datetime.datetime.now(datetime.timezone.utc)
+
+    def stacks(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stacks)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        thread_names: Dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            if time.monotonic() > deadline:
+                self.stop()
+                break
+            if self.should_sample is not None and not self.should_sample():
+                self._add(AWAITING_FRAME)
+                continue
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                frame = frames.get(self.thread_id)
+                if frame is not None:
+                    self._add(self._collapse(frame))
+                continue
+            for ident, frame in frames.items():
+                if ident == own_id:
+                    continue
+                if ident not in thread_names:
+                    thread_names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                self._add(f"{thread_names.get(ident, ident)};{self._collapse(frame)}")
+
+    def _collapse(self, frame) -> str:
+        labels: List[str] = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code, self._labels))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+    def _add(self, stack: str) -> None:
+        with self._lock:
+            self._stacks[stack] += 1
+            self.samples += 1
+
+
+class RequestProfile:
+
+    def __init__(self, profile_id: str, method: str, path: str, sampler: StackSampler):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.sampler = sampler
+        self.status_code: Optional[int] = None
+        self.duration_ms: Optional[float] = None
+
+
+class Profiler:
+    """The worker-wide profiling session and the recent per-request profiles of this worker."""
+
+    def __init__(self):
+        self.session: Optional[StackSampler] = None  # Current or last worker-wide session
+        self.requests: "OrderedDict[str, RequestProfile]" = OrderedDict()
+
+    def start(self, interval_ms: Optional[float] = None, max_seconds: Optional[float] = None) -> Optional[StackSampler]:
+        """Starts sampling all threads; returns None if a session is already running."""
+        if self.session is not None and self.session.running:
+            return None
+        self.session = StackSampler(
+            interval=(interval_ms or settings.PROFILING_INTERVAL_MS) / 1000,
+            max_seconds=min(max_seconds or settings.PROFILING_MAX_SECONDS, settings.PROFILING_MAX_SECONDS),
+        ).start()
+        return self.session
+
+    def stop(self) -> Optional[StackSampler]:
+        if self.session is None or not self.session.running:
+            return None
+        self.session.stop()
+        return self.session
+
+    def add_request(self, profile: RequestProfile) -> None:
+        self.requests[profile.id] = profile
+        while len(self.requests) > REQUEST_PROFILES_KEPT:
+            self.requests.popitem(last=False)
+
+
+profiler = Profiler()
+
+
+# --- Output ---
+
+def collapsed(stacks: Mapping[str, int]) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+FRAME_HEIGHT = 16
+SVG_WIDTH = 1200
+MIN_FRAME_WIDTH = 0.5  # Narrower frames are not drawn
+
+
+def flamegraph_svg(stacks: Mapping[str, int], title: str = "Flame graph") -> str:
+    """Renders collapsed stacks as a static SVG flamegraph (hover a frame for its name and share)."""
+    # Tree of [count, children] keyed by frame label
+    root: list = [0, {}]
+    max_depth = 0
+    for stack, count in stacks.items():
+        node = root
+        node[0] += count
+        frames = stack.split(";")
+        max_depth = max(max_depth, len(frames))
+        for label in frames:
+            node = node[1].setdefault(label, [0, {}])
+            node[0] += count
+
+    total = root[0] or 1
+    height = (max_depth + 1) * FRAME_HEIGHT + 40
+    scale = SVG_WIDTH / total
+    rects: List[str] = []
+    pending = [("all", root, 0.0, 0)]
+    while pending:
+        label, (count, children), x, depth = pending.pop()
+        width = count * scale
+        if width < MIN_FRAME_WIDTH:
+            continue
+        y = height - (depth + 1) * FRAME_HEIGHT - 10
+        hue = zlib.crc32(label.encode()) % 55  # Warm colors, stable per function
+        name = html.escape(label)
+        text = name if len(label) * 7 < width - 6 else html.escape(label[:max(0, int((width - 6) / 7) - 2)] + "..")
+        rects.append(
+            f'<g><title>{name} ({count} samples, {count / total:.2%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{FRAME_HEIGHT - 1}" fill="hsl({hue},80%,60%)"/>'
+            + (f'<text x="{x + 3:.1f}" y="{y + 11}">{text}</text>' if width > 21 else "")
+            + "</g>"
+        )
+        child_x = x
+        for child_label, child in children.items():
+            pending.append((child_label, child, child_x, depth + 1))
+            child_x += child[0] * scale
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+        f'<rect width="100%" height="100%" fill="#fafafa"/>'
+        f'<text x="{SVG_WIDTH / 2}" y="16" text-anchor="middle" font-size="14">{html.escape(title)} ({root[0]} samples)</text>'
+        + "".join(rects)
+        + "</svg>"
+    )
+
+
+# --- Middleware ---
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling requests that carry "X-Profile: 1" from an admin. `authorize`
+    receives the bearer token and tells whether it belongs to an admin; other requests pass through.
+    """
+
+    def __init__(self, app: ASGIApp, authorize: Callable[[str], Awaitable[bool]]):
+        self.app = app
+        self.authorize = authorize
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = self._profile_token(scope)
+        if token is None or not await self.authorize(token):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(
+            interval=min(REQUEST_SAMPLE_INTERVAL, settings.PROFILING_INTERVAL_MS / 1000),
+            thread_id=threading.get_ident(),
+            should_sample=self._task_is_running(),
+            max_seconds=settings.PROFILING_MAX_SECONDS,
+        )
+        profile = RequestProfile(uuid.uuid4().hex[:16], scope["method"], scope["path"], sampler)
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", ()), (PROFILE_ID_HEADER, profile.id.encode())]}
+            await send(message)
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            profile.duration_ms = (time.perf_counter() - started) * 1000
+            profiler.add_request(profile)
+
+    @staticmethod
+    def _task_is_running() -> Optional[Callable[[], bool]]:
+        """
+        A check, callable from the sampler thread, whether the current task is the one the event loop
+        is running. It reads asyncio's private loop -> running task mapping (asyncio.tasks._current_tasks,
+        present and maintained up to Python 3.13). Where that is missing or not maintained, returns None:
+        the loop thread is then sampled whatever task runs, and other requests show up in the profile.
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+        if task is None or not isinstance(current_tasks, dict) or current_tasks.get(loop) is not task:
+            return None
+        return lambda: current_tasks.get(loop) is task
+
+    @staticmethod
+    def _profile_token(scope: Scope) -> Optional[str]:
+        """The bearer token of a request asking to be profiled, else None."""
+        profile = authorization = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                profile = value
+            elif name == b"authorization":
+                authorization = value
+        if profile is None or profile.strip().lower() in (b"", b"0", b"false") or authorization is None:
+            return None
+        scheme, _, token = authorization.decode("latin-1").partition(" ")
+        return token.strip() if scheme.lower() == "bearer" and token.strip() else None
@@ -0,0 +1,191 @@
+# app/core/query_budget.py
+"""
+Query budgets: an upper bound on the SQL statements a block of code or an endpoint may issue,
+so N+1 regressions show up as failures (tests) or warnings (staging) instead of slipping in.
+
+    with query_budget(3):                  # Raises QueryBudgetExceeded on exit if more than 3 ran
+        await review_service.list_reviews(...)
+
+    @query_budget(3)                       # Same, around a coroutine or function
+    async def load_page(db): ...
+
+    @router.get("/")
+    @endpoint_query_budget(4)              # Budget of a whole request (dependencies and serialization
+    async def list_items(...): ...         # included); undecorated routes get QUERY_BUDGET_DEFAULT
+
+Request budgets are enforced by QueryBudgetMiddleware according to QUERY_BUDGET_MODE:
+"off" (default), "warn" (staging: log a warning with the stack of the first statement over
+budget, and of every lazy relationship load) or "raise" (development: fail the request).
+The pytest fixture and marker live in app/core/query_budget_plugin.py.
+
+Counting uses a global engine event, so it covers every engine (including test engines).
+Budgets nest: a statement counts against every open budget.
+"""
+import functools
+import inspect
+import logging
+import traceback
+from contextvars import ContextVar
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_ATTRIBUTE = "__query_budget__"
+STACK_LIMIT = 25  # Frames kept from the statement that went over budget
+STATEMENT_LOG_LIMIT = 50  # Statements kept for the report; the count covers all of them
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    """Counts statements while open; checked on exit."""
+
+    def __init__(self, max_statements: Optional[int], label: str = "block", raise_on_exceed: bool = True):
+        self.max_statements = max_statements
+        self.label = label
+        self.raise_on_exceed = raise_on_exceed
+        self.statements = 0
+        self.statements_log: list = []
+        self.exceeded_at: Optional[str] = None  # Stack of the first statement over budget
+        self._token = None
+
+    @property
+    def exceeded(self) -> bool:
+        return self.max_statements is not None and self.statements > self.max_statements
+
+    def record(self, statement: str) -> None:
+        self.statements += 1
+        if len(self.statements_log) < STATEMENT_LOG_LIMIT:
+            self.statements_log.append(statement)
+        if self.exceeded_at is None and self.exceeded:
+            self.exceeded_at = "".join(traceback.format_stack(limit=STACK_LIMIT)[:-2])
+
+    def report(self) -> str:
+        statements = "\n".join(f"  {index}. {' '.join(sql.split())[:200]}" for index, sql in enumerate(self.statements_log, 1))
+        if self.statements > len(self.statements_log):
+            statements += f"\n  ... {self.statements - len(self.statements_log)} more"
+        return (
+            f"Query budget exceeded in {self.label}: {self.statements} statements, budget {self.max_statements}\n"
+            f"{statements}\nFirst statement over budget issued from:\n{self.exceeded_at}"
+        )
+
+    def __enter__(self) -> "QueryBudget":
+        self._token = _open_budgets.set(_open_budgets.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _open_budgets.reset(self._token)
+        if exc_type is None and self.exceeded:
+            if self.raise_on_exceed:
+                raise QueryBudgetExceeded(self.report())
+            logger.warning(self.report())
+
+    def __call__(self, func: Callable) -> Callable:
+        # Used as a decorator: a fresh budget per call
+        max_statements, label = self.max_statements, self.label if self.label != "block" else func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with QueryBudget(max_statements, label, self.raise_on_exceed):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with QueryBudget(max_statements, label, self.raise_on_exceed):
+                    return func(*args, **kwargs)
+        return wrapper
+
+
+def query_budget(max_statements: int, label: str = "block") -> QueryBudget:
+    """Context manager / decorator raising QueryBudgetExceeded when more than max_statements are issued."""
+    return QueryBudget(max_statements, label)
+
+
+def endpoint_query_budget(max_statements: int) -> Callable:
+    """Sets the statement budget of an endpoint's requests. Place below the @router.<method> decorator."""
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, QUERY_BUDGET_ATTRIBUTE, max_statements)
+        return endpoint
+    return decorator
+
+
+_open_budgets: ContextVar[Tuple[QueryBudget, ...]] = ContextVar("open_query_budgets", default=())
+_request_budget: ContextVar[Optional["_RequestBudget"]] = ContextVar("request_query_budget", default=None)
+
+
+# --- Engine and session hooks ---
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for budget in _open_budgets.get():
+        budget.record(statement)
+    request_budget = _request_budget.get()
+    if request_budget is not None:
+        request_budget.record(statement)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _detect_lazy_load(orm_execute_state):
+    # lazy_loaded_from is only set for lazy="select" loads triggered by attribute access (and only
+    # readable for SELECTs: ORM-enabled INSERT/UPDATE/DELETE have no load options)
+    if not orm_execute_state.is_select or _request_budget.get() is None or orm_execute_state.lazy_loaded_from is None:
+        return
+    path = orm_execute_state.loader_strategy_path
+    relationship = f"{path[0].class_.__name__}.{path[1].key}" if path is not None and len(path) >= 2 else "relationship"
+    if settings.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(f"Lazy load of {relationship} during request")
+    logger.warning(
+        f"Lazy load of {relationship} during request:\n" + "".join(traceback.format_stack(limit=STACK_LIMIT)[:-1])
+    )
+
+
+# --- Middleware ---
+
+class _RequestBudget(QueryBudget):
+    """Budget of one request; the limit is read from the matched route on the first statement."""
+
+    def __init__(self, scope: Scope):
+        super().__init__(None, label=f"{scope['method']} {scope['path']}", raise_on_exceed=settings.QUERY_BUDGET_MODE == "raise")
+        self.scope = scope
+        self._resolved = False
+
+    def record(self, statement: str) -> None:
+        if not self._resolved:
+            # Routing has happened by the time the first statement runs
+            route = self.scope.get("route")
+            self.max_statements = getattr(getattr(route, "endpoint", None), QUERY_BUDGET_ATTRIBUTE, settings.QUERY_BUDGET_DEFAULT or None)
+            self._resolved = True
+        super().record(statement)
+
+
+class QueryBudgetMiddleware:
+    """Pure ASGI middleware checking each request against its endpoint's query budget (QUERY_BUDGET_MODE)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.QUERY_BUDGET_MODE == "off":
+            await self.app(scope, receive, send)
+            return
+
+        budget = _RequestBudget(scope)
+        token = _request_budget.set(budget)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_budget.reset(token)
+        if budget.exceeded:
+            # The response has been sent; in "raise" mode this still surfaces as a server error
+            if budget.raise_on_exceed:
+                raise QueryBudgetExceeded(budget.report())
+            logger.warning(budget.report())
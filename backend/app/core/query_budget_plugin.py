@@ -0,0 +1,51 @@
+# app/core/query_budget_plugin.py
+"""
+pytest plugin for query budgets (see app/core/query_budget.py). Enable it with
+`pytest -p app.core.query_budget_plugin` or `pytest_plugins = ["app.core.query_budget_plugin"]`
+in a conftest.py.
+
+    def test_review_feed(client, query_budget):
+        with query_budget(2):
+            client.get("/api/v1/reviews/")
+
+    @pytest.mark.query_budget(5)           # Budget for the whole test body
+    async def test_exchange_page(client): ...
+
+The plugin also switches request budgets to "raise" for every test (the query_budget_mode
+fixture, through monkeypatch, so settings are restored afterwards), so every endpoint decorated
+with @endpoint_query_budget (or falling under QUERY_BUDGET_DEFAULT) is checked by any test calling
+it. A test can set another mode with monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", ...).
+"""
+import pytest
+
+from app.core.config import settings
+from app.core.query_budget import QueryBudget
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "query_budget(n): fail the test if it issues more than n SQL statements")
+
+
+@pytest.fixture(autouse=True)
+def query_budget_mode(monkeypatch) -> str:
+    """Request budgets raise during the test."""
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "raise")
+    return settings.QUERY_BUDGET_MODE
+
+
+@pytest.fixture
+def query_budget():
+    """Returns QueryBudget factory: `with query_budget(n): ...` fails if the block issues more than n statements."""
+    def factory(max_statements: int, label: str = "block") -> QueryBudget:
+        return QueryBudget(max_statements, label)
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def _query_budget_marker(request):
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    with QueryBudget(marker.args[0], label=request.node.nodeid):
+        yield
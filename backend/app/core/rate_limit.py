@@ -0,0 +1,289 @@
+# app/core/rate_limit.py
+"""
+Token-bucket rate limiting for abuse-prone endpoints (login, registration, reviews, votes).
+
+Endpoints opt in with the @rate_limited("<policy>") decorator; a policy is a list of limits,
+each with its own bucket per client key:
+
+    scope "ip"     one bucket per client address
+    scope "user"   one bucket per authenticated user (access token subject), else per address
+    scope "global" one bucket shared by all clients of the endpoint
+
+A bucket holds `limit` tokens and refills at limit/period tokens per second, so a client can
+burst `limit` requests and then sustain one request every period/limit seconds. Buckets are
+keyed by policy, so every limited endpoint has its own. A request takes one token from every
+bucket of its policy or from none: a rejected request does not drain the others (a client over
+its own limit cannot use up the shared "global" bucket).
+
+RateLimitMiddleware resolves the limited route and consumes tokens before the request reaches
+FastAPI's dependencies, so rejected requests cost no database query and no password hash.
+Buckets live in this process (MemoryBackend) or in Redis (RedisBackend, shared by all workers;
+needs the optional `redis` package).
+
+Default policies are in DEFAULT_POLICIES; RATE_LIMIT_POLICIES overrides them per policy, e.g.
+    login=ip:10/60,ip:100/3600;create_review=user:5/60
+"""
+import logging
+import math
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ATTRIBUTE = "__rate_limit_policy__"
+
+
+class RateLimit(NamedTuple):
+    scope: str  # "ip" | "user" | "global"
+    limit: int  # Bucket size (burst)
+    period: float  # Seconds to refill a full bucket
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period
+
+
+DEFAULT_POLICIES: Dict[str, List[RateLimit]] = {
+    "login": [RateLimit("ip", 10, 60), RateLimit("ip", 100, 3600)],
+    "register": [RateLimit("ip", 5, 600)],
+    "refresh_token": [RateLimit("ip", 30, 60)],
+    "change_password": [RateLimit("user", 5, 300)],
+    "create_review": [RateLimit("user", 5, 60), RateLimit("user", 30, 3600), RateLimit("global", 600, 60)],
+    "vote_review": [RateLimit("user", 30, 60)],
+}
+
+
+def parse_policies(spec: str) -> Dict[str, List[RateLimit]]:
+    """Parses 'name=scope:limit/period,...;name=...' (the RATE_LIMIT_POLICIES format)."""
+    policies: Dict[str, List[RateLimit]] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(";"))):
+        name, _, limits = entry.partition("=")
+        parsed = []
+        for limit in filter(None, (part.strip() for part in limits.split(","))):
+            scope, _, rate = limit.partition(":")
+            count, _, period = rate.partition("/")
+            if scope not in ("ip", "user", "global") or not count or not period:
+                raise ValueError(f"Invalid rate limit '{limit}' in policy '{name.strip()}'")
+            parsed.append(RateLimit(scope, int(count), float(period)))
+        policies[name.strip()] = parsed
+    return policies
+
+
+def rate_limited(policy: str) -> Callable:
+    """Marks an endpoint as limited by the named policy. Place below the @router.<method> decorator."""
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, RATE_LIMIT_ATTRIBUTE, policy)
+        return endpoint
+    return decorator
+
+
+# --- Backends ---
+
+class MemoryBackend:
+    """Buckets in a dict of this worker. Full (idle) buckets are dropped periodically to bound memory."""
+
+    SWEEP_EVERY = 10000  # Calls between sweeps
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}  # key -> (tokens, updated_at, rate)
+        self._calls = 0
+
+    async def consume(self, buckets: Sequence[Tuple[str, RateLimit]], now: float) -> float:
+        """
+        Takes one token from each (key, limit) bucket if all of them have one. Returns 0 if allowed,
+        else the seconds until they all do (and takes nothing).
+        """
+        refilled = []
+        retry_after = 0.0
+        for key, limit in buckets:
+            tokens, updated_at, _ = self._buckets.get(key, (limit.limit, now, limit.rate))
+            tokens = min(limit.limit, tokens + (now - updated_at) * limit.rate)
+            refilled.append((key, limit, tokens))
+            if tokens < 1:
+                retry_after = max(retry_after, (1 - tokens) / limit.rate)
+        taken = 1 if retry_after == 0 else 0
+        for key, limit, tokens in refilled:
+            self._buckets[key] = (tokens - taken, now, limit.rate)
+
+        self._calls += 1
+        if self._calls >= self.SWEEP_EVERY:
+            self._calls = 0
+            self._sweep(now)
+        return retry_after
+
+    def _sweep(self, now: float) -> None:
+        # A bucket that would have refilled completely is indistinguishable from a missing one
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket[0] + (now - bucket[1]) * bucket[2] < self._capacity_of(key)
+        }
+
+    @staticmethod
+    def _capacity_of(key: str) -> float:
+        return float(key.rsplit(":", 1)[1])
+
+
+# KEYS: the buckets; ARGV: now, then capacity and rate per bucket. All or nothing, like MemoryBackend.consume
+_REDIS_TOKEN_BUCKETS = """
+local now = tonumber(ARGV[1])
+local tokens = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local ts = tonumber(bucket[2]) or now
+    tokens[i] = math.min(capacity, (tonumber(bucket[1]) or capacity) + math.max(0, now - ts) * rate)
+    if tokens[i] < 1 then
+        retry_after = math.max(retry_after, (1 - tokens[i]) / rate)
+    end
+end
+local taken = 0
+if retry_after == 0 then
+    taken = 1
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    redis.call('HSET', key, 'tokens', tokens[i] - taken, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+end
+return tostring(retry_after)
+"""
+
+
+class RedisBackend:
+    """Buckets in Redis, shared by all workers; each request's check is one atomic script call."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKETS)
+
+    async def consume(self, buckets: Sequence[Tuple[str, RateLimit]], now: float) -> float:
+        args = [now]
+        for _, limit in buckets:
+            args.extend((limit.limit, limit.rate))
+        try:
+            return float(await self._script(keys=[f"ratelimit:{key}" for key, _ in buckets], args=args))
+        except Exception as e:
+            # Fail open: an unavailable Redis must not take the API down with it
+            logger.warning(f"Rate limit backend error, allowing request: {e}")
+            return 0.0
+
+
+def create_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{settings.RATE_LIMIT_BACKEND}' (memory | redis)")
+    return MemoryBackend()
+
+
+# --- Middleware ---
+
+def _client_ip(scope: Scope) -> str:
+    if settings.RATE_LIMIT_TRUST_PROXY_HEADERS:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope: Scope) -> Optional[str]:
+    """Subject of a valid access token in the Authorization header (signature check only, no DB)."""
+    from app.auth.security import decode_token
+
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            payload = decode_token(token)
+            if payload and payload.get("type") == "access":
+                return payload.get("sub")
+            return None
+    return None
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware answering 429 (with Retry-After) when any bucket of the route's policy is empty."""
+
+    def __init__(self, app: ASGIApp, backend=None, policies: Optional[Dict[str, List[RateLimit]]] = None):
+        self.app = app
+        self.backend = backend or create_backend()
+        self.policies = {**DEFAULT_POLICIES, **(policies if policies is not None else parse_policies(settings.RATE_LIMIT_POLICIES))}
+        self._limited_routes: Optional[list] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        policy = self._match_policy(scope)
+        if policy is not None:
+            retry_after = await self._consume(scope, policy)
+            if retry_after > 0:
+                await self._reject(send, policy, retry_after)
+                return
+        await self.app(scope, receive, send)
+
+    def _match_policy(self, scope: Scope) -> Optional[str]:
+        if self._limited_routes is None:
+            # Collected on first request, once all routers are included
+            self._limited_routes = [
+                (route, getattr(route.endpoint, RATE_LIMIT_ATTRIBUTE))
+                for route in scope["app"].routes
+                if hasattr(getattr(route, "endpoint", None), RATE_LIMIT_ATTRIBUTE)
+            ]
+            for route, policy in self._limited_routes:
+                if policy not in self.policies:
+                    logger.warning(f"Route {route.path} uses undefined rate limit policy '{policy}'")
+        for route, policy in self._limited_routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return policy
+        return None
+
+    async def _consume(self, scope: Scope, policy: str) -> float:
+        ip = None
+        user = None
+        buckets = []
+        for index, limit in enumerate(self.policies.get(policy, ())):
+            if limit.scope == "global":
+                client = "*"
+            elif limit.scope == "user":
+                user = user if user is not None else (_user_id(scope) or "")
+                client = f"u{user}" if user else f"ip{ip or _client_ip(scope)}"
+            else:
+                ip = ip or _client_ip(scope)
+                client = f"ip{ip}"
+            # The trailing capacity lets MemoryBackend sweep full buckets without a policy lookup
+            buckets.append((f"{policy}:{index}:{client}:{limit.limit}", limit))
+        if not buckets:
+            return 0.0
+        return await self.backend.consume(buckets, time.time())
+
+    @staticmethod
+    async def _reject(send: Send, policy: str, retry_after: float) -> None:
+        logger.info(f"Rate limit '{policy}' exceeded, retry after {retry_after:.1f}s")
+        body = b'{"detail":"Too many requests, please try again later."}'
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,282 @@
+# app/core/scheduler.py
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[[], Awaitable[None]]
+
+
+class NotLeaderError(Exception):
+    """A leader-only job was triggered on a worker that is not the scheduler leader."""
+
+
+class Job:
+    """
+    A periodic background job.
+
+    Jobs marked ``leader_only`` run on exactly one worker (the one holding the
+    scheduler advisory lock); the others only run jobs that are safe to execute
+    concurrently on every worker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: JobFunc,
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+        max_concurrency: int = 1,
+        leader_only: bool = True,
+        run_on_start: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.max_concurrency = max_concurrency
+        self.leader_only = leader_only
+        self.run_on_start = run_on_start
+
+        self.running = 0
+        self.run_count = 0
+        self.failure_count = 0
+        self.skipped_count = 0
+        self.last_started_at: Optional[datetime] = None
+        self.last_finished_at: Optional[datetime] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.next_run_at: Optional[datetime] = None
+
+    def next_delay(self) -> float:
+        """Seconds until the next run, including random jitter to spread load across workers."""
+        jitter = random.uniform(0, self.jitter_seconds) if self.jitter_seconds else 0.0
+        return self.interval_seconds + jitter
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval_seconds,
+            "jitter_seconds": self.jitter_seconds,
+            "max_concurrency": self.max_concurrency,
+            "leader_only": self.leader_only,
+            "running": self.running,
+            "run_count": self.run_count,
+            "failure_count": self.failure_count,
+            "skipped_count": self.skipped_count,
+            "last_started_at": self.last_started_at,
+            "last_finished_at": self.last_finished_at,
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error,
+            "next_run_at": self.next_run_at,
+        }
+
+
+class LeaderElector:
+    """
+    Elects a single leader among all uvicorn workers using a Postgres
+    session-level advisory lock. The lock lives as long as the dedicated
+    connection holding it, so a crashed worker releases leadership automatically.
+    """
+
+    def __init__(self, lock_key: int):
+        self.lock_key = lock_key
+        self._conn: Optional[AsyncConnection] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    async def try_acquire(self) -> bool:
+        if self._conn is not None:
+            # Make sure we still hold the lock (connection may have been dropped)
+            try:
+                await self._conn.execute(text("SELECT 1"))
+                return True
+            except Exception as e:
+                logger.warning(f"Lost scheduler leader connection: {e}")
+                await self._discard_connection()
+
+        conn = await get_engine().connect()
+        try:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            result = await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key})
+            acquired = bool(result.scalar())
+        except Exception:
+            await conn.close()
+            raise
+
+        if acquired:
+            self._conn = conn
+            logger.info(f"Acquired scheduler leadership (advisory lock {self.lock_key})")
+        else:
+            await conn.close()
+        return acquired
+
+    async def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            await self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+        except Exception as e:
+            logger.warning(f"Failed to release scheduler advisory lock: {e}")
+        await self._discard_connection()
+
+    async def _discard_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+
+class Scheduler:
+    """In-process async job scheduler with leader election across workers."""
+
+    def __init__(self, lock_key: int, leader_check_seconds: float):
+        self.jobs: Dict[str, Job] = {}
+        self.leader = LeaderElector(lock_key)
+        self.leader_check_seconds = leader_check_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._runs: set = set()
+        self._started = False
+        self._first_election = asyncio.Event()  # Set once this worker's first leader election attempt finished
+
+    @property
+    def is_leader(self) -> bool:
+        return self.leader.is_leader
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def add_job(
+        self,
+        name: str,
+        func: JobFunc,
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+        max_concurrency: int = 1,
+        leader_only: bool = True,
+        run_on_start: bool = False,
+    ) -> Job:
+        if name in self.jobs:
+            raise ValueError(f"Job '{name}' is already registered.")
+        job = Job(
+            name=name,
+            func=func,
+            interval_seconds=interval_seconds,
+            jitter_seconds=jitter_seconds,
+            max_concurrency=max_concurrency,
+            leader_only=leader_only,
+            run_on_start=run_on_start,
+        )
+        self.jobs[name] = job
+        return job
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        self._first_election.clear()
+        self._tasks.append(asyncio.create_task(self._leader_loop(), name="scheduler-leader"))
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._job_loop(job), name=f"scheduler-{job.name}"))
+        logger.info(f"Scheduler started with {len(self.jobs)} jobs")
+
+    async def shutdown(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        for task in self._tasks + list(self._runs):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._runs, return_exceptions=True)
+        self._tasks.clear()
+        self._runs.clear()
+        await self.leader.release()
+        logger.info("Scheduler stopped")
+
+    def trigger(self, name: str) -> bool:
+        """
+        Run a job immediately on this worker.
+        Returns False if the job is already running at its concurrency limit; raises NotLeaderError
+        for a leader-only job when this worker is not the leader (it could overlap the leader's run).
+        """
+        job = self.jobs[name]
+        if job.leader_only and not self.is_leader:
+            raise NotLeaderError(f"Job '{name}' runs on the scheduler leader only")
+        return self._dispatch(job)
+
+    def status(self) -> List[dict]:
+        return [job.status() for job in self.jobs.values()]
+
+    async def _leader_loop(self) -> None:
+        while True:
+            try:
+                await self.leader.try_acquire()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Scheduler leader election failed: {e}")
+            self._first_election.set()
+            await asyncio.sleep(self.leader_check_seconds)
+
+    async def _job_loop(self, job: Job) -> None:
+        delay = 0.0 if job.run_on_start else job.next_delay()
+        if job.leader_only and job.run_on_start:
+            # The first election is still talking to the database when the loops start;
+            # checking is_leader before it finished would skip the start-up run on the leader
+            await self._first_election.wait()
+        while True:
+            job.next_run_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+            if not job.leader_only or self.is_leader:
+                self._dispatch(job)
+            delay = job.next_delay()
+
+    def _dispatch(self, job: Job) -> bool:
+        if job.running >= job.max_concurrency:
+            job.skipped_count += 1
+            logger.debug(f"Skipping job '{job.name}': concurrency limit {job.max_concurrency} reached")
+            return False
+        # Count the run as soon as it is dispatched so back-to-back triggers respect the limit
+        job.running += 1
+        task = asyncio.create_task(self._run(job), name=f"job-{job.name}")
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+        return True
+
+    async def _run(self, job: Job) -> None:
+        job.last_started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        started = time.perf_counter()
+        try:
+            await job.func()
+            job.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failure_count += 1
+            job.last_error = f"{type(e).__name__}: {e}"
+            logger.error(f"Job '{job.name}' failed: {e}", exc_info=True)
+        finally:
+            job.running -= 1
+            job.run_count += 1
+            job.last_duration_ms = (time.perf_counter() - started) * 1000
+            job.last_finished_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+scheduler = Scheduler(
+    lock_key=settings.SCHEDULER_LOCK_KEY,
+    leader_check_seconds=settings.SCHEDULER_LEADER_CHECK_SECONDS,
+)
@@ -0,0 +1,127 @@
+# app/core/serialization.py
+"""
+Fast serialization path for hot list endpoints (enabled with FAST_JSON_RESPONSES).
+
+The default path validates every ORM object against the response_model (from_attributes,
+nested models, HttpUrl parsing) and encodes with the stdlib json module. Data read from our
+own database is already trusted, so here a serializer is compiled once per schema that only
+copies the schema's fields into plain dicts, and orjson encodes the result.
+
+Differences from the validated path: values are emitted as stored (e.g. HttpUrl fields are
+not normalized with a trailing slash) and no validation errors are raised. Datetimes are
+encoded like pydantic does (ISO 8601, UTC as "Z").
+"""
+import typing
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.metrics import track_serialization
+from app.schemas.common import PaginatedResponse, PaginationParams
+
+Serializer = Callable[[Any], Any]
+
+_serializers: Dict[Type[BaseModel], Serializer] = {}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)  # Same as pydantic's JSON mode
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (Decimal as str, datetime as ISO 8601 with UTC as "Z", Enum as value)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def _model_of(annotation: Any):
+    """Returns (model, is_list) if the annotation is a (list of / optional) pydantic model, else (None, False)."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _model_of(args[0]) if len(args) == 1 else (None, False)
+    if origin is list:
+        (arg,) = typing.get_args(annotation) or (Any,)
+        model, _ = _model_of(arg)
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def compile_serializer(model: Type[BaseModel]) -> Serializer:
+    """
+    Builds (once per schema) a function turning an ORM object, row or dict into a JSON-ready dict
+    with exactly the schema's fields. Nested schemas get their own compiled serializers.
+    """
+    serializer = _serializers.get(model)
+    if serializer is not None:
+        return serializer
+
+    namespace: Dict[str, Any] = {"_dict": dict}
+    from_attrs, from_dict = [], []
+    for index, (name, field) in enumerate(model.model_fields.items()):
+        if field.is_required():
+            attr = f"obj.{name}"
+        else:
+            namespace[f"_d{index}"] = field.get_default(call_default_factory=True)
+            attr = f"getattr(obj, {name!r}, _d{index})"
+        item = f"obj.get({name!r})"
+
+        nested, is_list = _model_of(field.annotation)
+        if nested is not None:
+            namespace[f"_n{index}"] = compile_serializer(nested)
+            if is_list:
+                attr = f"[_n{index}(x) for x in ({attr} or ())]"
+                item = f"[_n{index}(x) for x in ({item} or ())]"
+            else:
+                attr = f"_n{index}({attr})"
+                item = f"_n{index}({item})"
+        from_attrs.append(f"{name!r}: {attr}")
+        from_dict.append(f"{name!r}: {item}")
+
+    source = (
+        "def serialize(obj):\n"
+        "    if obj is None:\n"
+        "        return None\n"
+        "    if obj.__class__ is _dict:\n"
+        f"        return {{{', '.join(from_dict)}}}\n"
+        f"    return {{{', '.join(from_attrs)}}}\n"
+    )
+    exec(compile(source, f"<serializer {model.__name__}>", "exec"), namespace)
+    serializer = namespace["serialize"]
+    _serializers[model] = serializer
+    return serializer
+
+
+def paginated_response(
+    items: Iterable[Any],
+    total: int,
+    pagination: PaginationParams,
+    schema: Type[BaseModel],
+):
+    """
+    Page payload for list endpoints. Returns a PaginatedResponse (validated through the route's
+    response_model) unless FAST_JSON_RESPONSES is on, in which case the page is serialized with the
+    compiled serializer and returned directly, bypassing response_model validation.
+    """
+    with track_serialization():
+        if not settings.FAST_JSON_RESPONSES:
+            return PaginatedResponse(total=total, items=items, skip=pagination.skip, limit=pagination.limit)
+
+        serialize = compile_serializer(schema)
+        return FastJSONResponse({
+            "total": total,
+            "items": [serialize(item) for item in items],
+            "skip": pagination.skip,
+            "limit": pagination.limit,
+        })
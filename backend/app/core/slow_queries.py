@@ -0,0 +1,227 @@
+# app/core/slow_queries.py
+"""
+Slow-query log: statements aggregated by fingerprint, and query plans of the slow ones.
+
+Filters in list_exchanges / list_reviews combine freely, so which statement shapes go bad in
+production cannot be predicted. With SLOW_QUERY_LOG_ENABLED the engine's cursor events feed
+every statement into SlowQueryLog:
+
+- The statement is fingerprinted: literals and bind parameters become "?", IN lists and
+  multi-row VALUES collapse to "(...)", casts and whitespace are dropped. Statements differing only
+  in parameter values share a fingerprint; every filter combination gets its own.
+- Per fingerprint: count, total / max time, p95 over recent executions, and how many executions
+  crossed SLOW_QUERY_THRESHOLD_MS (those are also logged as warnings). At most
+  SLOW_QUERY_MAX_FINGERPRINTS are kept; the one with the least total time makes room for a new one.
+- A SELECT over the threshold gets its plan captured in the background: EXPLAIN (ANALYZE,
+  BUFFERS) with the slow execution's parameters, on a separate pooled connection, in a transaction
+  that is rolled back, under a statement timeout. At most one capture runs at a time, and each
+  fingerprint is explained at most once per SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS. Other statements
+  are never explained, since ANALYZE executes them (PostgreSQL only).
+
+Parameters are used for EXPLAIN only and never stored, since they can carry personal data.
+Results are per worker, at GET /api/v1/admin/slow-queries.
+"""
+import asyncio
+import contextvars
+import datetime
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RECENT_DURATIONS = 500  # Executions per fingerprint the p95 is computed over
+FINGERPRINT_CACHE_SIZE = 4096  # Statement strings repeat (compiled cache), so fingerprints are memoized
+EXPLAIN_TIMEOUT_MS = 30000
+SKIP_OPTION = "slow_query_log_skip"  # Execution option excluding a connection's statements (the EXPLAIN connection)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+\b(?!:)|\?")
+_CAST = re.compile(r"::\w+(?:\[\])?")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Statement with literals and parameters replaced by "?" and lists collapsed."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _CAST.sub("", sql)
+    sql = _PARAMETER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    sql = _ROWS.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _is_explainable(statement: str) -> bool:
+    # EXPLAIN ANALYZE runs the statement: only plain reads
+    head = statement.lstrip().lower()
+    return head.startswith("select") and " for update" not in head and " for share" not in head
+
+
+def _percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+class QueryStats:
+
+    def __init__(self, fingerprint: str, sql: str):
+        self.fingerprint = fingerprint
+        self.sql = sql
+        self.count = 0
+        self.slow_count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent_ms: deque = deque(maxlen=RECENT_DURATIONS)
+        self.last_seen_at: Optional[datetime.datetime] = None
+        self.plan: Optional[str] = None
+        self.plan_ms: Optional[float] = None  # Duration of the execution that was explained
+        self.plan_captured_at: Optional[datetime.datetime] = None
+        self.explain_started_at: Optional[float] = None  # Monotonic; throttles captures
+
+    def as_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "total_ms": round(self.total_ms, 2),
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p95_ms": round(_percentile(self.recent_ms, 95), 2),
+            "max_ms": round(self.max_ms, 2),
+            "last_seen_at": self.last_seen_at,
+            "plan": self.plan,
+            "plan_ms": round(self.plan_ms, 2) if self.plan_ms is not None else None,
+            "plan_captured_at": self.plan_captured_at,
+        }
+
+
+class SlowQueryLog:
+
+    def __init__(self):
+        self.stats: Dict[str, QueryStats] = {}
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._fingerprints: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._engine: Optional[AsyncEngine] = None
+        self._explaining = False
+        self._explain_tasks: set = set()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        """Records the engine's statements; plans are captured on the same engine."""
+        if self._engine is engine:
+            return
+        self._engine = engine
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_started_at", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed_ms = (time.perf_counter() - conn.info["slow_query_started_at"].pop()) * 1000
+            if context is not None and context.execution_options.get(SKIP_OPTION):
+                return
+            self.record(statement, None if executemany else parameters, elapsed_ms)
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _handle_error(exception_context):
+            connection = exception_context.connection
+            if connection is not None and connection.info.get("slow_query_started_at"):
+                connection.info["slow_query_started_at"].pop()
+
+    def record(self, statement: str, parameters, elapsed_ms: float) -> None:
+        fingerprint, sql = self._fingerprint(statement)
+        slow = elapsed_ms >= settings.SLOW_QUERY_THRESHOLD_MS
+        with self._lock:
+            stats = self.stats.get(fingerprint)
+            if stats is None:
+                if len(self.stats) >= settings.SLOW_QUERY_MAX_FINGERPRINTS:
+                    del self.stats[min(self.stats.values(), key=lambda entry: entry.total_ms).fingerprint]
+                stats = self.stats[fingerprint] = QueryStats(fingerprint, sql)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.recent_ms.append(elapsed_ms)
+            stats.last_seen_at = datetime.datetime.now(datetime.timezone.utc)
+            if slow:
+                stats.slow_count += 1
+        if slow:
+            logger.warning(f"Slow query {fingerprint} ({elapsed_ms:.0f} ms): {sql[:500]}")
+            if parameters is not None and self._should_explain(stats, statement):
+                self._schedule_explain(stats, statement, parameters, elapsed_ms)
+
+    def top(self, limit: int = 50, order_by: str = "total_ms") -> List[dict]:
+        with self._lock:
+            entries = [stats.as_dict() for stats in self.stats.values()]
+        return sorted(entries, key=lambda entry: entry[order_by], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.started_at = datetime.datetime.now(datetime.timezone.utc)
+
+    def _fingerprint(self, statement: str) -> tuple:
+        cached = self._fingerprints.get(statement)
+        if cached is None:
+            sql = normalize(statement)
+            cached = self._fingerprints[statement] = (hashlib.sha1(sql.encode()).hexdigest()[:16], sql)
+            if len(self._fingerprints) > FINGERPRINT_CACHE_SIZE:
+                self._fingerprints.popitem(last=False)
+        return cached
+
+    # --- Plan capture ---
+
+    def _should_explain(self, stats: QueryStats, statement: str) -> bool:
+        if not settings.SLOW_QUERY_EXPLAIN or self._engine is None or self._explaining:
+            return False
+        if self._engine.dialect.name != "postgresql" or not _is_explainable(statement):
+            return False
+        return (
+            stats.explain_started_at is None
+            or time.monotonic() - stats.explain_started_at >= settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS
+        )
+
+    def _schedule_explain(self, stats: QueryStats, statement: str, parameters, elapsed_ms: float) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Not on the event loop (sync use of the engine)
+        self._explaining = True
+        stats.explain_started_at = time.monotonic()
+        # Fresh context: the capture must not count against the request that ran the slow query
+        task = contextvars.Context().run(loop.create_task, self._explain(stats, statement, parameters, elapsed_ms))
+        self._explain_tasks.add(task)  # Keeps a reference until done
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, stats: QueryStats, statement: str, parameters, elapsed_ms: float) -> None:
+        try:
+            async with self._engine.connect() as conn:
+                conn = await conn.execution_options(**{SKIP_OPTION: True})
+                await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                plan = "\n".join(row[0] for row in result)
+                await conn.rollback()
+            stats.plan = plan
+            stats.plan_ms = elapsed_ms
+            stats.plan_captured_at = datetime.datetime.now(datetime.timezone.utc)
+        except Exception as e:
+            logger.warning(f"Could not capture the plan of slow query {stats.fingerprint}: {e}")
+        finally:
+            self._explaining = False
+
+
+slow_query_log = SlowQueryLog()
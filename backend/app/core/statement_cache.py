@@ -0,0 +1,130 @@
+# app/core/statement_cache.py
+"""
+Statement reuse for the listing queries (list_exchanges, list_books, list_reviews), and the hit
+rates of the caches a repeated statement goes through:
+
+- shape: the listing builders key what they build by the request's statement shape (which filters
+  are set, inlined flag values, the sort) and write every filter value as a named bindparam, so a
+  repeated shape reuses the built select() and its memoized cache key (StatementShapes below).
+- compiled: SQLAlchemy's compiled cache (DB_COMPILED_CACHE_SIZE per engine) skips SQL compilation
+  for a statement whose cache key was seen before.
+- prepared: asyncpg's prepared statement cache (DB_PREPARED_STATEMENT_CACHE_SIZE per connection)
+  skips Parse on the server for SQL text the connection has prepared before, and lets Postgres
+  settle on a plan for it.
+
+The builders keep the number of shapes small and stable: ranges collapse into one BETWEEN, joins
+are added in a fixed order and values never end up in the SQL text (except the flags inlined for
+partial indexes, which are part of the shape). Counts are per worker, at /metrics
+(db_statement_cache_total) and GET /api/v1/admin/statement-cache.
+"""
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import Counter, registry
+
+T = TypeVar("T")
+
+SHAPE_CACHE_SIZE = 512  # Built statements kept per builder
+
+_COMPILED_RESULTS = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+}
+
+
+db_statement_cache_total = registry.register(Counter(
+    "db_statement_cache_total", "Statement cache lookups by cache (shape, compiled, prepared) and result.", ("cache", "result"),
+))
+
+
+def hit_counts(cache: str) -> Dict[str, int]:
+    """{result: count} of one cache since the worker started."""
+    return {
+        result: int(count)
+        for (name, result), count in db_statement_cache_total.values().items()
+        if name == cache
+    }
+
+
+_shape_caches: List["StatementShapes"] = []
+
+
+class StatementShapes:
+    """
+    The statements one listing builder built, by shape (LRU, at most SHAPE_CACHE_SIZE). Statements
+    are immutable, so one built object serves every request with that shape; the values come
+    from the parameters passed at execution.
+    """
+
+    def __init__(self, name: str, maxsize: int = SHAPE_CACHE_SIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self._statements: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        _shape_caches.append(self)
+
+    def get(self, shape: Hashable, build: Callable[[], T]) -> T:
+        with self._lock:
+            statements = self._statements.get(shape)
+            if statements is not None:
+                self._statements.move_to_end(shape)
+        if statements is not None:
+            db_statement_cache_total.inc("shape", "hit")
+            return statements
+        db_statement_cache_total.inc("shape", "miss")
+        statements = build()
+        with self._lock:
+            self._statements[shape] = statements
+            if len(self._statements) > self.maxsize:
+                self._statements.popitem(last=False)
+        return statements
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+def shape_cache_sizes() -> Dict[str, int]:
+    return {shapes.name: len(shapes) for shapes in _shape_caches}
+
+
+# --- SQLAlchemy hooks ---
+
+_instrumented_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Counts compiled cache and (asyncpg) prepared statement cache hits of the engine's statements."""
+    sync_engine = engine.sync_engine
+    if sync_engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(sync_engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and context.compiled is not None:
+            db_statement_cache_total.inc("compiled", _COMPILED_RESULTS.get(context.cache_hit, "uncacheable"))
+        if executemany:
+            return  # asyncpg runs executemany without the prepared statement cache
+        prepared = _prepared_statements(conn)
+        if prepared is not None:
+            db_statement_cache_total.inc("prepared", "hit" if statement in prepared else "miss")
+
+
+def _prepared_statements(conn) -> Optional[dict]:
+    # The asyncpg adapter's per-connection LRU of prepared statements, keyed by SQL text (None for other drivers)
+    dbapi_connection = conn.connection.dbapi_connection
+    return getattr(dbapi_connection, "_prepared_statement_cache", None)
+
+
+def compiled_cache_size(engine: AsyncEngine) -> Tuple[int, int]:
+    """(entries, capacity) of the engine's compiled cache; (0, 0) when caching is disabled."""
+    cache = engine.sync_engine._compiled_cache
+    if cache is None:
+        return 0, 0
+    return len(cache), cache.capacity
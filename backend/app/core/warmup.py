@@ -0,0 +1,92 @@
+# app/core/warmup.py
+"""
+Optional warm-up of a worker before it starts serving (WARMUP_ENABLED), run from the lifespan
+handler: uvicorn accepts connections only once startup has completed.
+
+- Opens WARMUP_CONNECTIONS pool connections concurrently, so the first requests do not pay for
+  connection setup and authentication.
+- Sends an in-process GET for each of WARMUP_PATHS straight to the router (no middleware, so
+  they do not show up in metrics or rate limits). This compiles the hot SQL statements into
+  SQLAlchemy's compiled cache, prepares them on the pooled connections, and runs response model
+  validation and serialization once.
+
+Failures are logged and never prevent startup.
+"""
+import asyncio
+import logging
+import time
+from typing import Tuple
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.exceptions import HTTPException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(app: FastAPI, engine: AsyncEngine) -> float:
+    """Runs the warm-up; returns its duration in seconds."""
+    started = time.perf_counter()
+    await _open_connections(engine, settings.WARMUP_CONNECTIONS)
+    for path in filter(None, (path.strip() for path in settings.WARMUP_PATHS.split(","))):
+        path_started = time.perf_counter()
+        try:
+            status_code, size = await _get(app, path)
+            logger.debug(f"Warm-up GET {path}: {status_code}, {size} bytes in {(time.perf_counter() - path_started) * 1000:.0f} ms")
+        except HTTPException as e:
+            # Raised past the router (exception handlers are middleware); the statements ran all the same
+            logger.debug(f"Warm-up GET {path}: {e.status_code} in {(time.perf_counter() - path_started) * 1000:.0f} ms")
+        except Exception as e:
+            logger.warning(f"Warm-up GET {path} failed: {e}")
+    elapsed = time.perf_counter() - started
+    logger.info(f"Worker warmed up in {elapsed * 1000:.0f} ms")
+    return elapsed
+
+
+async def _open_connections(engine: AsyncEngine, count: int) -> None:
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.05)  # Hold the connection so the others cannot reuse it
+
+    results = await asyncio.gather(*(ping() for _ in range(count)), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        logger.warning(f"Warm-up could not open {len(errors)} of {count} connections: {errors[0]}")
+
+
+async def _get(app: FastAPI, path_and_query: str) -> Tuple[int, int]:
+    """An in-process GET through the router; returns the status code and body size."""
+    path, _, query = path_and_query.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"warmup"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+        "app": app,
+    }
+    status_code, size = 0, 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code, size
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app.router(scope, receive, send)
+    return status_code, size
@@ -0,0 +1,188 @@
+# app/core/work_queue.py
+"""
+Durable in-database work queue for post-processing that does not need to happen on the
+request path (e.g. refreshing an item's review aggregates after a review is submitted).
+
+Producers call work_queue.enqueue(db, task, subject_id) inside their own transaction, so the
+task is committed atomically with the change that caused it, then work_queue.kick() to have
+this worker drain the queue right away. Every worker also drains it on a short interval
+(the process_work_queue job), so a task is handled even if the enqueuing worker dies.
+
+Batches are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never take
+the same rows, and deleted in the same transaction the handlers run in: a task is removed
+exactly when its work is committed. Handlers must therefore be idempotent (recompute, don't
+increment) and must not commit. Each task's subjects run in a savepoint, and one by one if that
+fails, so only the failing subjects' tasks are retried, with exponential backoff, up to
+WORK_QUEUE_MAX_ATTEMPTS. Tasks past that are dead-lettered: they stay in the table for
+inspection, are never claimed again and count in failed_count instead of pending_count.
+"""
+import datetime
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionFactory
+from app.models.work_queue import WorkQueueTask
+
+logger = logging.getLogger(__name__)
+
+# Handlers receive the session and the distinct subject ids of one batch, in ascending order
+TaskHandler = Callable[[AsyncSession, List[int]], Awaitable[None]]
+
+DRAIN_JOB_NAME = "process_work_queue"  # Registered in app/jobs.py
+MAX_RETRY_DELAY_SECONDS = 600
+
+
+class WorkQueue:
+
+    def __init__(self):
+        self._handlers: Dict[str, TaskHandler] = {}
+
+    def register(self, task: str, handler: TaskHandler) -> None:
+        if task in self._handlers:
+            raise ValueError(f"Work queue task '{task}' is already registered.")
+        self._handlers[task] = handler
+
+    def enqueue(self, db: AsyncSession, task: str, subject_id: int) -> None:
+        """Adds a task to the caller's transaction (written on the caller's commit)."""
+        if task not in self._handlers:
+            raise ValueError(f"Unknown work queue task '{task}'.")
+        db.add(WorkQueueTask(task=task, subject_id=subject_id))
+
+    def kick(self) -> None:
+        """Starts draining on this worker now, instead of waiting for the next poll."""
+        from app.core.scheduler import scheduler
+
+        if scheduler.started and DRAIN_JOB_NAME in scheduler.jobs:
+            scheduler.trigger(DRAIN_JOB_NAME)
+
+    async def drain(self) -> int:
+        """Processes batches until no task is available. Returns the number of tasks handled."""
+        handled = 0
+        while True:
+            async with AsyncSessionFactory() as db:
+                claimed = await self.process_batch(db)
+            handled += claimed
+            if claimed < settings.WORK_QUEUE_BATCH_SIZE:
+                return handled
+
+    async def process_batch(self, db: AsyncSession) -> int:
+        """Claims, handles and deletes one batch in a single transaction. Returns the number of claimed tasks."""
+        now = datetime.datetime.utcnow()
+        tasks = (
+            await db.execute(
+                select(WorkQueueTask.id, WorkQueueTask.task, WorkQueueTask.subject_id,
+                       WorkQueueTask.enqueued_at, WorkQueueTask.attempts)
+                .where(
+                    WorkQueueTask.available_at <= now,
+                    WorkQueueTask.attempts < settings.WORK_QUEUE_MAX_ATTEMPTS,
+                )
+                .order_by(WorkQueueTask.id)
+                .limit(settings.WORK_QUEUE_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+        if not tasks:
+            await db.rollback()
+            return 0
+
+        # Same-task duplicates (e.g. several reviews of one item) are handled once
+        by_subject: Dict[tuple, list] = defaultdict(list)
+        for task in tasks:
+            by_subject[(task.task, task.subject_id)].append(task)
+        subjects: Dict[str, List[int]] = defaultdict(list)
+        for name, subject_id in sorted(by_subject):
+            subjects[name].append(subject_id)
+
+        failed: Dict[tuple, Exception] = {}
+        try:
+            for name, subject_ids in subjects.items():
+                failed.update(await self._handle(db, name, subject_ids))
+            done = [task.id for key, grouped in by_subject.items() if key not in failed for task in grouped]
+            if done:
+                await db.execute(delete(WorkQueueTask).where(WorkQueueTask.id.in_(done)))
+            if failed:
+                await self._defer(db, [(task, failed[key]) for key in failed for task in by_subject[key]])
+            await db.commit()
+        except Exception as e:
+            # The transaction itself failed (e.g. the connection dropped): nothing was committed
+            await db.rollback()
+            logger.error(f"Work queue batch of {len(tasks)} tasks failed: {e}", exc_info=True)
+            await self._defer(db, [(task, e) for task in tasks])
+            await db.commit()
+            return len(tasks)
+
+        lag = (now - min(task.enqueued_at for task in tasks)).total_seconds()
+        if lag > settings.WORK_QUEUE_MAX_LAG_SECONDS:
+            logger.warning(f"Work queue is lagging: oldest task in batch waited {lag:.1f}s")
+        logger.debug(
+            f"Work queue handled {len(tasks)} tasks ({dict((k, len(v)) for k, v in subjects.items())}), "
+            f"{len(failed)} subjects failed"
+        )
+        return len(tasks)
+
+    async def _handle(self, db: AsyncSession, name: str, subject_ids: List[int]) -> Dict[tuple, Exception]:
+        """
+        Runs the handler for one task's subjects in a savepoint; if that fails, once per subject,
+        so a failing subject does not roll back (and use up the attempts of) the others.
+        Returns {(task, subject_id): error} of the failed subjects.
+        """
+        handler = self._handlers.get(name)
+        if handler is None:
+            error = LookupError(f"No handler registered for work queue task '{name}'")
+            return {(name, subject_id): error for subject_id in subject_ids}
+        try:
+            async with db.begin_nested():
+                await handler(db, subject_ids)
+            return {}
+        except Exception as e:
+            if len(subject_ids) == 1:
+                logger.error(f"Work queue task '{name}' failed for subject {subject_ids[0]}: {e}", exc_info=True)
+                return {(name, subject_ids[0]): e}
+            logger.warning(f"Work queue task '{name}' failed for {len(subject_ids)} subjects, retrying one by one: {e}")
+        failed = {}
+        for subject_id in subject_ids:
+            failed.update(await self._handle(db, name, [subject_id]))
+        return failed
+
+    async def _defer(self, db: AsyncSession, failures) -> None:
+        """Records a failed attempt for each (task, error) and pushes it back with exponential backoff (in db's transaction)."""
+        now = datetime.datetime.utcnow()
+        await db.execute(
+            update(WorkQueueTask),
+            [
+                {
+                    "id": task.id,
+                    "attempts": task.attempts + 1,
+                    "available_at": now + datetime.timedelta(
+                        seconds=min(2 ** task.attempts, MAX_RETRY_DELAY_SECONDS)
+                    ),
+                    "last_error": f"{type(error).__name__}: {error}"[:2000],
+                }
+                for task, error in failures
+            ],
+        )
+        exhausted = [task.id for task, _ in failures if task.attempts + 1 >= settings.WORK_QUEUE_MAX_ATTEMPTS]
+        if exhausted:
+            logger.error(f"Work queue tasks {exhausted} reached {settings.WORK_QUEUE_MAX_ATTEMPTS} attempts and will not be retried")
+
+    async def pending_count(self, db: AsyncSession) -> int:
+        """Tasks still to be handled (failed tasks that will not be retried are not counted, see failed_count)."""
+        return await db.scalar(
+            select(func.count()).select_from(WorkQueueTask)
+            .where(WorkQueueTask.attempts < settings.WORK_QUEUE_MAX_ATTEMPTS)
+        )
+
+    async def failed_count(self, db: AsyncSession) -> int:
+        """Dead-lettered tasks: failed WORK_QUEUE_MAX_ATTEMPTS times, kept for inspection and never retried."""
+        return await db.scalar(
+            select(func.count()).select_from(WorkQueueTask)
+            .where(WorkQueueTask.attempts >= settings.WORK_QUEUE_MAX_ATTEMPTS)
+        )
+
+
+work_queue = WorkQueue()
@@ -10,10 +10,11 @@ from jose import JWTError
 # import User model
 from app.models.user import User
 
-from app.core.database import get_async_db
+from app.core.database import AsyncSessionFactory, get_async_db
 from app.core.config import settings
 from app.auth.security import decode_token
 from app.auth.service import auth_service
+from app.auth.token_versions import token_versions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False) # For optional authentication
@@ -24,6 +25,45 @@ class TokenPayload(BaseModel):
     exp: datetime
     type: str  # Add this field for token type validation
 
+class Principal(BaseModel):
+    """The authenticated caller as stated by a valid access token (no database read)."""
+    id: int
+    is_admin: bool = False
+    token_version: int = 0
+
+def _access_token_claims(token: str) -> Optional[dict]:
+    """Payload of a valid, unexpired access token, or None."""
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        return None
+    if payload is None or payload.get("type") != "access" or payload.get("sub") is None:
+        return None
+    token_exp = payload.get("exp")
+    if token_exp is None or datetime.fromtimestamp(token_exp, tz=timezone.utc) < datetime.now(timezone.utc):
+        return None
+    try:
+        int(payload["sub"])
+    except ValueError:
+        return None
+    return payload
+
+async def _resolve_principal(token: str, db: AsyncSession) -> Optional[Principal]:
+    payload = _access_token_claims(token)
+    if payload is None:
+        return None
+    user_id = int(payload["sub"])
+    if "ver" in payload and token_versions.ready:
+        # Stateless path: claims are signed, revocation is checked against the synced version table
+        if not token_versions.is_current(user_id, payload["ver"]):
+            return None
+        return Principal(id=user_id, is_admin=bool(payload.get("adm")), token_version=payload["ver"])
+    # Tokens issued before the claims existed, or version table not synced yet: check the database
+    user = await auth_service.get_user_by_id(db=db, user_id=user_id)
+    if user is None or payload.get("ver", 0) < user.token_version:
+        return None
+    return Principal(id=user.id, is_admin=user.is_admin, token_version=user.token_version)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_async_db)
@@ -57,7 +97,7 @@ async def get_current_user(
         raise credentials_exception
         
     user = await auth_service.get_user_by_id(db=db, user_id=user_id)
-    if user is None:
+    if user is None or payload.get("ver", 0) < user.token_version:
         raise credentials_exception
     return user
 
@@ -93,6 +133,8 @@ async def get_optional_current_active_user(
     user = await auth_service.get_user_by_id(db=db, user_id=user_id)
     if user is None:
         return None # User not found
+    if payload.get("ver", 0) < user.token_version:
+        return None # Token revoked by a password or role change
 
     # Optional: Check if user is active, similar to get_current_active_user
     # if not user.is_active:
@@ -107,12 +149,40 @@ async def get_current_active_user(
     #     raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Like get_current_user, but for endpoints that only need the caller's id/role: no user lookup."""
+    principal = await _resolve_principal(token, db)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+async def get_optional_principal(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[Principal]:
+    if not token:
+        return None
+    return await _resolve_principal(token, db)
+
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
-    if not current_user.is_admin:
+    principal: Principal = Depends(get_current_principal)
+) -> Principal:
+    if not principal.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return principal
+
+async def is_admin_token(token: str) -> bool:
+    """Whether an access token belongs to a current admin; for middleware, outside dependency injection."""
+    async with AsyncSessionFactory() as db:  # Only connects if the stateless check is not possible
+        principal = await _resolve_principal(token, db)
+    return principal is not None and principal.is_admin
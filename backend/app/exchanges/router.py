@@ -6,8 +6,10 @@ from typing import Optional
 from decimal import Decimal
 
 from app.core.database import get_async_db
+from app.core.query_budget import endpoint_query_budget
 from app.exchanges import schemas, service
 from app.schemas.common import PaginationParams, PaginatedResponse
+from app.core.serialization import paginated_response
 from app.news import schemas as news_schemas, service as news_service
 from app.guides import schemas as guide_schemas, service as guide_service
 
@@ -38,6 +40,7 @@ async def redirect_to_exchange_website(
     return RedirectResponse(url=db_exchange.website_url)
 
 @router.get("/", response_model=PaginatedResponse[schemas.ExchangeReadBrief])
+@endpoint_query_budget(2)
 async def list_exchanges(
     db: AsyncSession = Depends(get_async_db),
     # Filtering parameters as query params
@@ -74,19 +77,18 @@ async def list_exchanges(
         max_total_rating_count=max_total_rating_count,
     )
 
-    exchanges, total = await service.exchange_service.list_exchanges(
-        db=db, filters=filters, sort=sort_by, pagination=pagination
-    )
+    try:
+        exchanges, total = await service.exchange_service.list_exchanges(
+            db=db, filters=filters, sort=sort_by, pagination=pagination
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return PaginatedResponse(
-        total=total,
-        items=exchanges,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return paginated_response(exchanges, total, pagination, schemas.ExchangeReadBrief)
 
 
 @router.get("/{slug}", response_model=schemas.ExchangeRead)
+@endpoint_query_budget(7)
 async def get_exchange_details(
     slug: str,
     db: AsyncSession = Depends(get_async_db)
@@ -108,19 +110,12 @@ async def list_exchange_news(
     """
     Get a list of news items for a specific exchange.
     """
-    print(f"Listing news for exchange ID: {exchange_id} with pagination: {pagination}")
     news_items, total = await news_service.news_service.list_news_items(
         db=db,
         pagination=pagination,
         exchange_id=exchange_id
     )
-    print(f"Found {total} news items for exchange ID: {exchange_id}")
-    return PaginatedResponse(
-        total=total,
-        items=news_items,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return paginated_response(news_items, total, pagination, news_schemas.NewsItemRead)
 
 @router.get("/guides/{exchange_id}", response_model=PaginatedResponse[guide_schemas.GuideItemRead])
 async def list_exchange_guides(
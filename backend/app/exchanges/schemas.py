@@ -5,7 +5,7 @@ from datetime import date, datetime
 from decimal import Decimal
 import enum  # Required for KycTypeEnum
 
-from app.schemas.common import CountryRead, LanguageRead, FiatCurrencyRead
+from app.schemas.common import CountryRead, LanguageRead, FiatCurrencyRead, ItemCategoryRatingRead
 
 # Define KycTypeEnum for Pydantic, matching the model's enum
 class KycTypeEnum(str, enum.Enum):
@@ -103,6 +103,27 @@ class ExchangeUpdate(ExchangeBase):
     supported_fiat_currency_ids: Optional[List[int]] = None
     pass
 
+# --- Bulk Upsert (Admin) ---
+class ExchangeBulkUpsertItem(ExchangeUpdate):
+    # Lookup key: updates the exchange with this slug, or creates it (name required) if it does not exist
+    slug: str = Field(..., min_length=2, max_length=255)
+
+class ExchangeBulkUpsertRequest(BaseModel):
+    items: List[ExchangeBulkUpsertItem] = Field(..., min_length=1, max_length=1000)
+
+class ExchangeBulkUpsertResult(BaseModel):
+    index: int  # Position of the row in the request
+    slug: str
+    status: Literal['created', 'updated', 'error']
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class ExchangeBulkUpsertResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[ExchangeBulkUpsertResult]
+
 # Schema for brief list view
 class ExchangeReadBrief(BaseModel):
     id: int
@@ -149,6 +170,7 @@ class ExchangeRead(ExchangeBase):
     supported_fiat_currencies: List[FiatCurrencyRead] = []
     licenses: List[LicenseRead] = []
     social_links: List[ExchangeSocialLinkRead] = []
+    category_ratings: List[ItemCategoryRatingRead] = []  # Averages of approved reviews per rating category
 
     has_kyc: Optional[bool] = None
     has_p2p: Optional[bool] = None
@@ -189,5 +211,6 @@ class ExchangeFilterParams(BaseModel):
     has_demo_trading: Optional[bool] = None
 
 class ExchangeSortBy(BaseModel):
-    field: Literal['name', 'overall_average_rating', 'trading_volume_24h', 'total_review_count', 'total_rating_count', "has_kyc", "has_p2p"] = 'overall_average_rating'
-    direction: Literal['asc', 'desc'] = 'desc'
\ No newline at end of file
+    field: Literal['name', 'overall_average_rating', 'ranking_score', 'trading_volume_24h', 'total_review_count', 'total_rating_count', "has_kyc", "has_p2p", 'category_rating'] = 'overall_average_rating'
+    direction: Literal['asc', 'desc'] = 'desc'
+    category_id: Optional[int] = None  # Rating category to sort by, required for field='category_rating'
\ No newline at end of file
@@ -1,28 +1,39 @@
 # app/exchanges/service.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc, asc, or_, and_
-from sqlalchemy.orm import selectinload, joinedload # For eager loading
+from sqlalchemy import func, desc, asc, or_, and_, exists, insert, update, delete, tuple_, bindparam, Integer
+from sqlalchemy.orm import selectinload, joinedload, aliased # For eager loading
+from sqlalchemy.engine import Row
 from typing import List, Optional, Tuple
 from decimal import Decimal
 
 from app.models import exchange as exchange_models
 from app.models import common as common_models
+from app.models import item as item_models
+from app.models import review as review_models
 from app.exchanges import schemas
 from app.schemas.common import PaginationParams
+from app.utils.sql import inline_literal, range_condition, range_params, schema_columns, OptionalBundle
+from app.core.statement_cache import StatementShapes
+from app.reviews.ranking import prior_mean_rating
 import logging
 
+logger = logging.getLogger(__name__)
+
 class ExchangeService:
 
     async def get_exchange_by_slug(self, db: AsyncSession, slug: str) -> Optional[exchange_models.Exchange]:
+        # Many-to-one countries are joined into their parent's statement, so the page takes a fixed
+        # number of statements (one per collection) whatever the exchange has set
         query = select(exchange_models.Exchange).options(
-            selectinload(exchange_models.Exchange.registration_country),
-            selectinload(exchange_models.Exchange.headquarters_country),
+            joinedload(exchange_models.Exchange.registration_country),
+            joinedload(exchange_models.Exchange.headquarters_country),
             selectinload(exchange_models.Exchange.available_in_countries),
             selectinload(exchange_models.Exchange.languages),
             selectinload(exchange_models.Exchange.supported_fiat_currencies),
-            selectinload(exchange_models.Exchange.licenses).selectinload(exchange_models.License.jurisdiction_country),
-            selectinload(exchange_models.Exchange.social_links)
+            selectinload(exchange_models.Exchange.licenses).joinedload(exchange_models.License.jurisdiction_country),
+            selectinload(exchange_models.Exchange.social_links),
+            selectinload(exchange_models.Exchange.category_ratings),
         ).filter(exchange_models.Exchange.slug == slug)
         result = await db.execute(query)
         return result.scalar_one_or_none()
@@ -32,193 +43,467 @@ class ExchangeService:
         return result.scalar_one_or_none()
 
 
-    async def list_exchanges(
+    # Built listing statements by shape (see app/core/statement_cache.py)
+    list_shapes = StatementShapes("exchanges")
+
+    def build_list_queries(
         self,
-        db: AsyncSession,
         filters: schemas.ExchangeFilterParams,
         sort: schemas.ExchangeSortBy,
         pagination: PaginationParams,
-    ) -> Tuple[List[exchange_models.Exchange], int]:
+    ):
+        """
+        Builds the (page query, count query, parameters) triple for the exchange listing.
+        The page query returns rows shaped like ExchangeReadBrief, not Exchange entities.
+        Relationship filters use EXISTS so no DISTINCT is needed and the sort can be served
+        straight from an index (see the indexes on Item/Exchange).
+        Filter values are bind parameters, so the statements depend only on which filters are set
+        and the sort: each such shape is built once per worker and reused from list_shapes.
+        """
+        if sort.field == 'category_rating' and sort.category_id is None:
+            raise ValueError("category_id is required when sorting by category_rating.")
 
-        query = select(exchange_models.Exchange).options(
-            # Eager load only necessary fields for list view
-            selectinload(exchange_models.Exchange.registration_country)
+        params = {"page_offset": pagination.skip, "page_limit": pagination.limit}
+        if filters.name:
+            params["name_pattern"] = f"%{filters.name}%"
+        range_params(params, "total_review_count", filters.min_total_review_count, filters.max_total_review_count)
+        range_params(params, "total_rating_count", filters.min_total_rating_count, filters.max_total_rating_count)
+        if filters.country_id:
+            params["country_id"] = filters.country_id
+        if filters.has_license_in_country_id:
+            params["license_country_id"] = filters.has_license_in_country_id
+        if filters.supports_fiat_id:
+            params["fiat_currency_id"] = filters.supports_fiat_id
+        if filters.supports_language_id:
+            params["language_id"] = filters.supports_language_id
+        if sort.field == 'category_rating':
+            params["category_id"] = sort.category_id
+
+        # has_kyc / has_p2p are inlined (partial indexes), so their values are part of the shape
+        shape = (frozenset(params), bool(filters.has_kyc), filters.has_p2p, sort.field, sort.direction)
+        query, count_query = self.list_shapes.get(shape, lambda: self._build_list_statements(*shape))
+        return query, count_query, params
+
+    def _build_list_statements(self, param_names, has_kyc: bool, has_p2p: Optional[bool], sort_field: str, direction: str):
+        Exchange = exchange_models.Exchange
+
+        # Project only the columns ExchangeReadBrief renders (no description/overview/policy texts),
+        # with the registration country joined in the same statement
+        registration_country = aliased(common_models.Country)
+        query = (
+            select(
+                *schema_columns(Exchange, schemas.ExchangeReadBrief),
+                OptionalBundle(
+                    'registration_country',
+                    registration_country.id,
+                    registration_country.name,
+                    registration_country.code_iso_alpha2,
+                ),
+            )
+            .outerjoin(registration_country, Exchange.registration_country_id == registration_country.id)
         )
 
         # --- Filtering ---
         filter_conditions = []
-        if filters.name:
-            filter_conditions.append(exchange_models.Exchange.name.ilike(f"%{filters.name}%"))
-        if filters.has_kyc:
-            filter_conditions.append(exchange_models.Exchange.has_kyc == filters.has_kyc)
-        if filters.has_p2p is not None:
-            filter_conditions.append(exchange_models.Exchange.has_p2p == filters.has_p2p)
-
-        # Review count filtering
-        if filters.min_total_review_count is not None:
-            filter_conditions.append(exchange_models.Exchange.total_review_count >= filters.min_total_review_count)
-        if filters.max_total_review_count is not None:
-            filter_conditions.append(exchange_models.Exchange.total_review_count <= filters.max_total_review_count)
-            
-        # Rating count filtering
-        if filters.min_total_rating_count is not None:
-            filter_conditions.append(exchange_models.Exchange.total_rating_count >= filters.min_total_rating_count)
-        if filters.max_total_rating_count is not None:
-            filter_conditions.append(exchange_models.Exchange.total_rating_count <= filters.max_total_rating_count)
-
-
-        # Filtering by relationships requires joins or subqueries
-        if filters.country_id:
-            # Example: Filter if registered OR available in country_id
-            query = query.outerjoin(exchange_models.exchange_availability_table).outerjoin(
-                common_models.Country, exchange_models.exchange_availability_table.c.country_id == common_models.Country.id
-            )
+        if "name_pattern" in param_names:
+            filter_conditions.append(Exchange.name.ilike(bindparam("name_pattern")))
+        if has_kyc:
+            filter_conditions.append(Exchange.has_kyc == inline_literal(True))
+        if has_p2p is not None:
+            filter_conditions.append(Exchange.has_p2p == inline_literal(has_p2p))
+
+        # Review / rating count filtering (one BETWEEN whichever bounds are given)
+        if "min_total_review_count" in param_names:
+            filter_conditions.append(range_condition(Exchange.total_review_count, "total_review_count"))
+        if "min_total_rating_count" in param_names:
+            filter_conditions.append(range_condition(Exchange.total_rating_count, "total_rating_count"))
+
+        # Filtering by relationships (semi-joins, one row per exchange)
+        if "country_id" in param_names:
+            # Registered OR available in country_id
+            availability = exchange_models.exchange_availability_table
             filter_conditions.append(
                 or_(
-                    exchange_models.Exchange.registration_country_id == filters.country_id,
-                    exchange_models.exchange_availability_table.c.country_id == filters.country_id
+                    Exchange.registration_country_id == bindparam("country_id"),
+                    exists().where(
+                        availability.c.exchange_id == Exchange.id,
+                        availability.c.country_id == bindparam("country_id"),
+                    ),
                 )
             )
 
-        if filters.has_license_in_country_id:
-             query = query.join(exchange_models.License) # Inner join ensures only exchanges with licenses
-             filter_conditions.append(exchange_models.License.jurisdiction_country_id == filters.has_license_in_country_id)
+        if "license_country_id" in param_names:
+            filter_conditions.append(
+                Exchange.licenses.any(exchange_models.License.jurisdiction_country_id == bindparam("license_country_id"))
+            )
 
-        if filters.supports_fiat_id:
-            query = query.join(exchange_models.exchange_fiat_support_table)
-            filter_conditions.append(exchange_models.exchange_fiat_support_table.c.fiat_currency_id == filters.supports_fiat_id)
+        if "fiat_currency_id" in param_names:
+            fiat_support = exchange_models.exchange_fiat_support_table
+            filter_conditions.append(exists().where(
+                fiat_support.c.exchange_id == Exchange.id,
+                fiat_support.c.fiat_currency_id == bindparam("fiat_currency_id"),
+            ))
 
-        if filters.supports_language_id:
-            query = query.join(exchange_models.exchange_languages_table)
-            filter_conditions.append(exchange_models.exchange_languages_table.c.language_id == filters.supports_language_id)
+        if "language_id" in param_names:
+            languages = exchange_models.exchange_languages_table
+            filter_conditions.append(exists().where(
+                languages.c.exchange_id == Exchange.id,
+                languages.c.language_id == bindparam("language_id"),
+            ))
 
         if filter_conditions:
-             query = query.where(and_(*filter_conditions)).distinct() # Use distinct because of joins
-
+            query = query.where(and_(*filter_conditions))
 
         # --- Count Total ---
-        count_query = select(func.count(exchange_models.Exchange.id))
-        if filter_conditions: # Apply same filters to count query
-            # Reconstruct joins/filters for count or use the filtered query as subquery
-             count_query = count_query.select_from(query.subquery()) # Simpler approach
-
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
+        count_query = select(func.count()).select_from(Exchange)
+        if filter_conditions:
+            count_query = count_query.where(and_(*filter_conditions))
 
         # --- Sorting ---
-        sort_column = getattr(exchange_models.Exchange, sort.field)
-        if sort.direction == 'desc':
-            query = query.order_by(desc(sort_column))
+        order = desc if direction == 'desc' else asc
+        if sort_field == 'category_rating':
+            # Precomputed per-category averages (item_category_ratings), unrated exchanges last
+            category_rating = aliased(review_models.ItemCategoryRating)
+            query = query.outerjoin(
+                category_rating,
+                and_(category_rating.item_id == Exchange.id, category_rating.category_id == bindparam("category_id")),
+            )
+            query = query.order_by(order(category_rating.average_rating).nulls_last(), order(Exchange.id))
         else:
-            query = query.order_by(asc(sort_column))
+            # Tie-break on the id of the sort column's table so the composite (column, id) index applies
+            sort_column = getattr(Exchange, sort_field)
+            sort_table = sort_column.property.columns[0].table
+            id_column = sort_table.c.id
+            query = query.order_by(order(sort_column), order(id_column))
 
         # --- Pagination ---
-        query = query.offset(pagination.skip).limit(pagination.limit)
+        query = query.offset(bindparam("page_offset", type_=Integer)).limit(bindparam("page_limit", type_=Integer))
 
-        # --- Execute Query ---
-        result = await db.execute(query)
-        exchanges = result.scalars().all()
+        return query, count_query
+
+    async def list_exchanges(
+        self,
+        db: AsyncSession,
+        filters: schemas.ExchangeFilterParams,
+        sort: schemas.ExchangeSortBy,
+        pagination: PaginationParams,
+    ) -> Tuple[List[Row], int]:
+        query, count_query, params = self.build_list_queries(filters, sort, pagination)
+
+        total_result = await db.execute(count_query, params)
+        total = total_result.scalar_one()
+
+        result = await db.execute(query, params)
+        exchanges = result.all()
 
         return exchanges, total
 
     # --- CRUD (Likely Admin Only) ---
+
+    # M2M id lists on ExchangeCreate/ExchangeUpdate -> (relationship attribute, related model)
+    M2M_FIELDS = {
+        "available_in_country_ids": ("available_in_countries", common_models.Country),
+        "language_ids": ("languages", common_models.Language),
+        "supported_fiat_currency_ids": ("supported_fiat_currencies", common_models.FiatCurrency),
+    }
+    # Country FK columns -> many-to-one relationship attribute
+    COUNTRY_FK_FIELDS = {
+        "registration_country_id": "registration_country",
+        "headquarters_country_id": "headquarters_country",
+    }
+
+    async def _check_unique(
+        self,
+        db: AsyncSession,
+        slug: Optional[str],
+        name: Optional[str],
+        exclude_id: Optional[int] = None,
+    ) -> None:
+        """
+        Validates slug (unique across all items) and name (unique among exchanges) in a single query.
+        Raises ValueError on conflict.
+        """
+        conditions = []
+        if slug:
+            conditions.append(item_models.Item.slug == slug)
+        if name:
+            conditions.append(and_(
+                item_models.Item.name == name,
+                item_models.Item.item_type == item_models.ItemTypeEnum.exchange,
+            ))
+        if not conditions:
+            return
+
+        query = select(item_models.Item.slug, item_models.Item.name).where(or_(*conditions))
+        if exclude_id is not None:
+            query = query.where(item_models.Item.id != exclude_id)
+        conflicts = (await db.execute(query)).all()
+
+        for conflict in conflicts:
+            if slug and conflict.slug == slug:
+                raise ValueError(f"Exchange slug '{slug}' already exists.")
+        if conflicts:
+            raise ValueError(f"Exchange name '{name}' already exists.")
+
+    async def _apply_country_fks(self, db: AsyncSession, db_exchange: exchange_models.Exchange, data: dict) -> None:
+        """Keeps the many-to-one country relationships in sync with the FK ids (identity-map lookups)."""
+        for fk_field, relationship_name in self.COUNTRY_FK_FIELDS.items():
+            if fk_field not in data:
+                continue
+            country_id = data[fk_field]
+            country = await db.get(common_models.Country, country_id) if country_id is not None else None
+            if country_id is not None and country is None:
+                raise ValueError(f"Country with id {country_id} does not exist.")
+            setattr(db_exchange, relationship_name, country)
+
+    async def _apply_m2m(self, db: AsyncSession, db_exchange: exchange_models.Exchange, exchange_in) -> None:
+        """
+        Diffs the requested M2M ids against the loaded collections. Only newly referenced rows
+        are fetched, and the flush emits just the association inserts/deletes for the difference.
+        Unknown ids are ignored.
+        """
+        for field, (relationship_name, model) in self.M2M_FIELDS.items():
+            desired = getattr(exchange_in, field)
+            if desired is None:
+                continue
+            desired_ids = set(desired)
+            current = list(getattr(db_exchange, relationship_name))
+            kept = [obj for obj in current if obj.id in desired_ids]
+            missing_ids = desired_ids - {obj.id for obj in kept}
+
+            added = []
+            if missing_ids:
+                result = await db.execute(select(model).where(model.id.in_(missing_ids)))
+                added = list(result.scalars().all())
+
+            if added or len(kept) != len(current):
+                setattr(db_exchange, relationship_name, kept + added)
+
     async def create_exchange(self, db: AsyncSession, exchange_in: schemas.ExchangeCreate) -> exchange_models.Exchange:
-        logger = logging.getLogger(__name__)
-        
         logger.info(f"Creating new exchange with name: {exchange_in.name}, slug: {exchange_in.slug}")
-        
-        # Check slug uniqueness
-        existing = await self.get_exchange_by_slug(db, exchange_in.slug)
-        if existing:
-            logger.warning(f"Exchange creation failed: slug '{exchange_in.slug}' already exists")
-            raise ValueError(f"Exchange slug '{exchange_in.slug}' already exists.")
-            
-        existing_name = await self.get_exchange_by_name(db, exchange_in.name)
-        if existing_name:
-            logger.warning(f"Exchange creation failed: name '{exchange_in.name}' already exists")
-            raise ValueError(f"Exchange name '{exchange_in.name}' already exists.")
-
-        logger.info(f"Creating exchange object with data: {exchange_in.model_dump()}")
-        db_exchange = exchange_models.Exchange(**exchange_in.model_dump(exclude={ # Exclude M2M IDs
-            "available_in_country_ids", "language_ids", "supported_fiat_currency_ids"
-        }))
-
-        # Add M2M relationships (requires fetching related objects)
-        # Simplified - assumes IDs are valid. Add validation if needed.
-        if exchange_in.available_in_country_ids:
-            logger.info(f"Adding {len(exchange_in.available_in_country_ids)} availability countries")
-            countries = await db.execute(select(common_models.Country).filter(common_models.Country.id.in_(exchange_in.available_in_country_ids)))
-            db_exchange.available_in_countries.extend(countries.scalars().all())
-            
-        if exchange_in.language_ids:
-            logger.info(f"Adding {len(exchange_in.language_ids)} languages")
-            langs = await db.execute(select(common_models.Language).filter(common_models.Language.id.in_(exchange_in.language_ids)))
-            db_exchange.languages.extend(langs.scalars().all())
-            
-        if exchange_in.supported_fiat_currency_ids:
-            logger.info(f"Adding {len(exchange_in.supported_fiat_currency_ids)} fiat currencies")
-            fiats = await db.execute(select(common_models.FiatCurrency).filter(common_models.FiatCurrency.id.in_(exchange_in.supported_fiat_currency_ids)))
-            db_exchange.supported_fiat_currencies.extend(fiats.scalars().all())
 
+        await self._check_unique(db, slug=exchange_in.slug, name=exchange_in.name)
+
+        data = exchange_in.model_dump(exclude=set(self.M2M_FIELDS))
+        db_exchange = exchange_models.Exchange(
+            **data,
+            # Initialise every collection rendered by ExchangeRead so the response
+            # can be built from this instance without loading anything back
+            licenses=[],
+            social_links=[],
+            category_ratings=[],
+            **{relationship_name: [] for relationship_name, _ in self.M2M_FIELDS.values()},
+        )
+        await self._apply_country_fks(db, db_exchange, data)
+        await self._apply_m2m(db, db_exchange, exchange_in)
+        # Unreviewed items rank at the prior mean, not below every reviewed one
+        db_exchange.ranking_score = await prior_mean_rating(db)
 
         db.add(db_exchange)
         await db.commit()
-        await db.refresh(db_exchange, attribute_names=[ # Refresh needed relationships
-            'registration_country', 'headquarters_country' # Example
-        ])
-        # Re-fetch full details if needed for the response
-        return await self.get_exchange_by_slug(db, db_exchange.slug) # Fetch again with all relations
+        # Server-side defaults come back via RETURNING (eager_defaults), nothing to re-fetch
+        return db_exchange
 
 
     async def update_exchange(self, db: AsyncSession, db_exchange: exchange_models.Exchange, exchange_in: schemas.ExchangeUpdate) -> exchange_models.Exchange:
         """
         Update an existing exchange with new data.
+        Expects db_exchange loaded with its relationships (see get_exchange_by_slug).
         """
-        # Check if name is changed and if it conflicts with existing exchange
-        if exchange_in.name and exchange_in.name != db_exchange.name:
-            existing_name = await self.get_exchange_by_name(db, exchange_in.name)
-            if existing_name and existing_name.id != db_exchange.id:
-                raise ValueError(f"Exchange name '{exchange_in.name}' already exists.")
-        
+        new_slug = exchange_in.slug if exchange_in.slug and exchange_in.slug != db_exchange.slug else None
+        new_name = exchange_in.name if exchange_in.name and exchange_in.name != db_exchange.name else None
+        await self._check_unique(db, slug=new_slug, name=new_name, exclude_id=db_exchange.id)
+
         # Update direct fields
-        update_data = exchange_in.model_dump(exclude={
-            "available_in_country_ids", "language_ids", "supported_fiat_currency_ids"
-        }, exclude_unset=True)
-        
+        update_data = exchange_in.model_dump(exclude=set(self.M2M_FIELDS), exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_exchange, key, value)
-        
-        # Update M2M relationships
-        if exchange_in.available_in_country_ids is not None:
-            # Clear existing relationships and add new ones
-            db_exchange.available_in_countries = []
-            if exchange_in.available_in_country_ids:
-                countries = await db.execute(select(common_models.Country).filter(
-                    common_models.Country.id.in_(exchange_in.available_in_country_ids)
-                ))
-                db_exchange.available_in_countries.extend(countries.scalars().all())
-        
-        if exchange_in.language_ids is not None:
-            db_exchange.languages = []
-            if exchange_in.language_ids:
-                langs = await db.execute(select(common_models.Language).filter(
-                    common_models.Language.id.in_(exchange_in.language_ids)
-                ))
-                db_exchange.languages.extend(langs.scalars().all())
-        
-        if exchange_in.supported_fiat_currency_ids is not None:
-            db_exchange.supported_fiat_currencies = []
-            if exchange_in.supported_fiat_currency_ids:
-                fiats = await db.execute(select(common_models.FiatCurrency).filter(
-                    common_models.FiatCurrency.id.in_(exchange_in.supported_fiat_currency_ids)
-                ))
-                db_exchange.supported_fiat_currencies.extend(fiats.scalars().all())
-        
+
+        await self._apply_country_fks(db, db_exchange, update_data)
+        await self._apply_m2m(db, db_exchange, exchange_in)
+
         await db.commit()
-        await db.refresh(db_exchange)
-        
-        # Re-fetch full details with all relations
-        return await self.get_exchange_by_slug(db, db_exchange.slug)
+        return db_exchange
+
+    # M2M id lists -> (association table, column holding the related id)
+    M2M_TABLES = {
+        "available_in_country_ids": (exchange_models.exchange_availability_table, "country_id"),
+        "language_ids": (exchange_models.exchange_languages_table, "language_id"),
+        "supported_fiat_currency_ids": (exchange_models.exchange_fiat_support_table, "fiat_currency_id"),
+    }
+
+    async def _existing_ids(self, db: AsyncSession, model, ids: set) -> set:
+        if not ids:
+            return set()
+        result = await db.execute(select(model.id).where(model.id.in_(ids)))
+        return set(result.scalars().all())
+
+    async def bulk_upsert_exchanges(
+        self,
+        db: AsyncSession,
+        items: List[schemas.ExchangeBulkUpsertItem],
+    ) -> schemas.ExchangeBulkUpsertResponse:
+        """
+        Creates or updates many exchanges (keyed by slug) in a single transaction.
+
+        Rows are validated up front with a handful of set-based lookups; invalid rows are
+        reported individually and skipped. Valid rows are written with bulk INSERT/UPDATE
+        statements and M2M changes are applied as bulk association inserts/deletes.
+        """
+        results: List[Optional[schemas.ExchangeBulkUpsertResult]] = [None] * len(items)
+
+        def fail(index: int, detail: str) -> None:
+            results[index] = schemas.ExchangeBulkUpsertResult(
+                index=index, slug=items[index].slug, status="error", detail=detail
+            )
+
+        # --- Lookups (one query each) ---
+        slugs = {item.slug for item in items}
+        names = {item.name for item in items if item.name}
+        existing_by_slug = {
+            row.slug: row for row in (await db.execute(
+                select(item_models.Item.id, item_models.Item.slug, item_models.Item.item_type)
+                .where(item_models.Item.slug.in_(slugs))
+            )).all()
+        }
+        name_owners = {
+            row.name: row.id for row in (await db.execute(
+                select(item_models.Item.id, item_models.Item.name).where(
+                    item_models.Item.name.in_(names),
+                    item_models.Item.item_type == item_models.ItemTypeEnum.exchange,
+                )
+            )).all()
+        } if names else {}
+
+        country_ids, ref_ids = set(), {field: set() for field in self.M2M_FIELDS}
+        for item in items:
+            country_ids.update(i for i in (item.registration_country_id, item.headquarters_country_id) if i is not None)
+            for field in self.M2M_FIELDS:
+                ref_ids[field].update(getattr(item, field) or [])
+        valid_countries = await self._existing_ids(db, common_models.Country, country_ids)
+        valid_refs = {
+            field: await self._existing_ids(db, model, ref_ids[field])
+            for field, (_, model) in self.M2M_FIELDS.items()
+        }
+
+        # --- Per-row validation ---
+        seen_slugs, seen_names = set(), set()
+        inserts, insert_indexes, updates, update_indexes = [], [], [], []
+        for index, item in enumerate(items):
+            if item.slug in seen_slugs:
+                fail(index, f"Duplicate slug '{item.slug}' in request.")
+                continue
+            seen_slugs.add(item.slug)
+
+            existing = existing_by_slug.get(item.slug)
+            if existing is not None and existing.item_type != item_models.ItemTypeEnum.exchange:
+                fail(index, f"Slug '{item.slug}' belongs to another item type.")
+                continue
+            if existing is None and not item.name:
+                fail(index, "Field 'name' is required to create an exchange.")
+                continue
+            if item.name:
+                owner = name_owners.get(item.name)
+                if item.name in seen_names or (owner is not None and (existing is None or owner != existing.id)):
+                    fail(index, f"Exchange name '{item.name}' already exists.")
+                    continue
+                seen_names.add(item.name)
+            unknown = [
+                i for i in (item.registration_country_id, item.headquarters_country_id)
+                if i is not None and i not in valid_countries
+            ]
+            if unknown:
+                fail(index, f"Country with id {unknown[0]} does not exist.")
+                continue
+
+            if existing is None:
+                # Omit unset/None values so server-side defaults apply, as in create_exchange
+                inserts.append(item.model_dump(exclude=set(self.M2M_FIELDS), exclude_none=True))
+                insert_indexes.append(index)
+            else:
+                data = item.model_dump(exclude=set(self.M2M_FIELDS) | {"slug"}, exclude_unset=True)
+                data["id"] = existing.id
+                updates.append(data)
+                update_indexes.append(index)
+
+        # --- Set-based writes ---
+        ids_by_index = {}
+        try:
+            if inserts:
+                # Unreviewed items rank at the prior mean, not below every reviewed one
+                prior_mean = await prior_mean_rating(db)
+                for data in inserts:
+                    data["ranking_score"] = prior_mean
+                created = await db.execute(
+                    insert(exchange_models.Exchange).returning(
+                        exchange_models.Exchange.id, exchange_models.Exchange.slug
+                    ),
+                    inserts,
+                )
+                created_ids = {row.slug: row.id for row in created.all()}
+                ids_by_index.update({index: created_ids[items[index].slug] for index in insert_indexes})
+
+            updates_with_fields = [data for data in updates if len(data) > 1]
+            if updates_with_fields:
+                await db.execute(update(exchange_models.Exchange), updates_with_fields)
+            ids_by_index.update({index: data["id"] for index, data in zip(update_indexes, updates)})
+
+            await self._bulk_sync_m2m(db, items, ids_by_index, valid_refs)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Bulk exchange upsert failed: {e}", exc_info=True)
+            for index in ids_by_index.keys() | set(insert_indexes) | set(update_indexes):
+                fail(index, f"Transaction failed: {e.__class__.__name__}")
+            ids_by_index = {}
+
+        inserted = set(insert_indexes)
+        for index, exchange_id in ids_by_index.items():
+            results[index] = schemas.ExchangeBulkUpsertResult(
+                index=index,
+                slug=items[index].slug,
+                status="created" if index in inserted else "updated",
+                id=exchange_id,
+            )
+
+        return schemas.ExchangeBulkUpsertResponse(
+            created=sum(1 for r in results if r.status == "created"),
+            updated=sum(1 for r in results if r.status == "updated"),
+            failed=sum(1 for r in results if r.status == "error"),
+            results=results,
+        )
+
+    async def _bulk_sync_m2m(
+        self,
+        db: AsyncSession,
+        items: List[schemas.ExchangeBulkUpsertItem],
+        ids_by_index: dict,
+        valid_refs: dict,
+    ) -> None:
+        """Applies M2M changes for many exchanges: one SELECT, one DELETE and one INSERT per association table."""
+        for field, (table, ref_column) in self.M2M_TABLES.items():
+            desired = {
+                ids_by_index[index]: set(getattr(items[index], field)) & valid_refs[field]
+                for index in ids_by_index
+                if getattr(items[index], field) is not None
+            }
+            if not desired:
+                continue
+
+            exchange_col, ref_col = table.c.exchange_id, table.c[ref_column]
+            current_rows = await db.execute(select(exchange_col, ref_col).where(exchange_col.in_(desired.keys())))
+            current = set(map(tuple, current_rows.all()))
+            wanted = {(exchange_id, ref_id) for exchange_id, ref_ids in desired.items() for ref_id in ref_ids}
+
+            to_delete = current - wanted
+            to_insert = wanted - current
+            if to_delete:
+                await db.execute(delete(table).where(tuple_(exchange_col, ref_col).in_(to_delete)))
+            if to_insert:
+                await db.execute(
+                    insert(table),
+                    [{"exchange_id": exchange_id, ref_column: ref_id} for exchange_id, ref_id in to_insert],
+                )
 
     async def delete_exchange(self, db: AsyncSession, exchange_id: int) -> None:
         """
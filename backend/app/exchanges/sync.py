@@ -0,0 +1,79 @@
+# app/exchanges/sync.py
+import asyncio
+import json
+import logging
+import urllib.parse
+import urllib.request
+from typing import List
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.models.exchange import Exchange
+from app.reviews.ranking import prior_mean_rating
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_URL = "https://api.coingecko.com/api/v3/exchanges"
+BTC_USD_RATE = 107500  # Rough conversion for the BTC-denominated volume reported by CoinGecko
+
+
+def fetch_exchanges_all_pages(start_page: int = 1, end_page: int = 5) -> List[dict]:
+    """Fetches exchanges from the CoinGecko API (blocking). Requires COINGECKO_API_KEY."""
+    if not settings.COINGECKO_API_KEY:
+        raise RuntimeError("COINGECKO_API_KEY is not set")
+    headers = {"accept": "application/json", "x-cg-api-key": settings.COINGECKO_API_KEY}
+    all_exchanges = []
+    for page in range(start_page, end_page + 1):
+        params = urllib.parse.urlencode({"per_page": 100, "page": page})  # 100 is the max per page
+        request = urllib.request.Request(f"{COINGECKO_URL}?{params}", headers=headers)
+        with urllib.request.urlopen(request, timeout=30) as resp:
+            exchanges = json.loads(resp.read())
+        if not exchanges:
+            break
+        all_exchanges.extend(exchanges)
+    return all_exchanges
+
+
+def map_api_to_exchange(api_data: dict) -> dict:
+    volume_btc = api_data.get("trade_volume_24h_btc")
+    return {
+        "name": api_data.get("name"),
+        "slug": api_data.get("id"),
+        "description": api_data.get("description"),
+        "logo_url": api_data.get("image"),
+        "website_url": api_data.get("url"),
+        "trading_volume_24h": volume_btc * BTC_USD_RATE if volume_btc is not None else None,
+    }
+
+
+async def upsert_exchange(db: AsyncSession, data: dict, ranking_score: float = 0.0) -> None:
+    """Updates the exchange with data's slug or creates it (with ranking_score, the prior mean)."""
+    result = await db.execute(select(Exchange).where(Exchange.slug == data["slug"]))
+    exchange = result.scalar_one_or_none()
+    if exchange:
+        for key, value in data.items():
+            setattr(exchange, key, value)
+        exchange.updated_at = func.now()
+    else:
+        db.add(Exchange(**data, ranking_score=ranking_score))
+
+
+async def sync_exchanges(db: AsyncSession, start_page: int = 1, end_page: int = 5) -> int:
+    """Pulls exchange data from CoinGecko and upserts it. Returns the number of exchanges processed."""
+    # The HTTP client is blocking, keep it off the event loop
+    exchanges = await asyncio.to_thread(fetch_exchanges_all_pages, start_page, end_page)
+    logger.info(f"Fetched {len(exchanges)} exchanges from CoinGecko API.")
+    prior_mean = await prior_mean_rating(db)
+    for api_ex in exchanges:
+        ex_data = map_api_to_exchange(api_ex)
+        try:
+            async with db.begin_nested():
+                await upsert_exchange(db, ex_data, ranking_score=prior_mean)
+        except IntegrityError as e:
+            logger.warning(f"Integrity error for {ex_data['slug']}: {e}")
+    await db.commit()
+    return len(exchanges)
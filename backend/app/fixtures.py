@@ -0,0 +1,321 @@
+# app/fixtures.py
+"""
+Synthetic dataset generator for load tests and query-plan work at production scale
+(`python -m app.cli generate-fixtures`, `benchmarks/load_test.py seed`).
+
+Rows are generated deterministically from a seed (same seed and scale, same data), mostly
+vectorized with numpy, and streamed into the models' tables with COPY on PostgreSQL (batched
+INSERTs elsewhere). Derived data (review counters, facets, category ratings, ranking scores) is
+then recomputed with the regular ReviewService/ranking code, so the result looks like a
+database that grew through the API.
+
+What is generated: users; exchanges (with country availability, languages, fiat currencies and
+licenses) and books (with topics) as items; reviews with Zipf-like item popularity and
+recent-heavy timestamps; usefulness votes consistent with the review counters; news linked to
+exchanges. Countries, languages and fiat currencies are taken from the database as seeded by
+the other CLI commands.
+
+Synthetic users log in as load-test-user-<n>@example.com with LOAD_TEST_PASSWORD; items use the
+slugs exchange-<n> and book-<n>.
+"""
+import datetime
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, List, Sequence
+
+import numpy as np
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.auth.security import pwd_context
+from app.models.books import Book, Topic, book_topics_table
+from app.models.common import Country, FiatCurrency, Language
+from app.models.exchange import (
+    Exchange, License, exchange_availability_table, exchange_fiat_support_table,
+    exchange_languages_table, news_item_exchanges_table,
+)
+from app.models.item import Item
+from app.models.news import NewsItem
+from app.models.review import Review, ReviewUsefulnessVote
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+LOAD_TEST_PASSWORD = "load-test-password"
+BATCH_SIZE = 10000  # Rows per INSERT when COPY is not available
+NOW = datetime.datetime(2026, 1, 1)  # Fixed reference time, so timestamps do not depend on when the data was generated
+REVIEW_HISTORY_DAYS = 3 * 365
+TOPIC_COUNT = 40
+
+
+@dataclass(frozen=True)
+class FixtureScale:
+    exchanges: int
+    books: int
+    users: int
+    reviews: int
+    votes: int
+    news: int
+
+
+SCALES = {
+    "small": FixtureScale(exchanges=50, books=500, users=2000, reviews=50000, votes=10000, news=1000),
+    "medium": FixtureScale(exchanges=500, books=5000, users=20000, reviews=500000, votes=100000, news=10000),
+    "full": FixtureScale(exchanges=5000, books=50000, users=200000, reviews=5000000, votes=1000000, news=100000),
+}
+
+_WORDS = np.array((
+    "fees withdrawal support fast slow verification app interface liquidity spreads deposit "
+    "security reliable recommend avoid trading futures staking p2p wallet beginner advanced "
+    "chapter author explains clear examples dated practical theory strategy risk"
+).split())
+
+
+def _texts(rng: np.random.Generator, count: int, min_words: int, max_words: int) -> List[str]:
+    """A pool of texts of varied length; rows pick from it."""
+    return [
+        " ".join(rng.choice(_WORDS, size=rng.integers(min_words, max_words + 1))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def _skewed_ids(rng: np.random.Generator, count: int, population: int, exponent: float = 1.2) -> np.ndarray:
+    """Ids 1..population drawn with a Zipf-like popularity: a few get most of the rows."""
+    weights = 1.0 / np.arange(1, population + 1) ** exponent
+    permutation = rng.permutation(population) + 1  # Popular ids are spread over the id range
+    return permutation[rng.choice(population, size=count, p=weights / weights.sum())]
+
+
+def _timestamps(rng: np.random.Generator, count: int, days: int) -> List[datetime.datetime]:
+    """Timestamps in the `days` before NOW, denser towards NOW."""
+    seconds = (days * 86400 * rng.random(count) ** 2).astype(np.int64)
+    return (np.datetime64(NOW) - seconds.astype("timedelta64[s]")).astype(datetime.datetime).tolist()
+
+
+def _links(rng: np.random.Generator, owners: Sequence[int], targets: Sequence[int], low: int, high: int) -> List[tuple]:
+    """(owner, target) pairs for a many-to-many table: each owner gets low..high distinct targets."""
+    if not targets:
+        return []
+    pairs = []
+    for owner in owners:
+        count = min(len(targets), int(rng.integers(low, high + 1)))
+        pairs.extend((owner, int(target)) for target in rng.choice(targets, size=count, replace=False))
+    return pairs
+
+
+class FixtureGenerator:
+
+    def __init__(self, engine: AsyncEngine, scale: FixtureScale, seed: int = 1):
+        self.engine = engine
+        self.scale = scale
+        self.seed = seed
+
+    async def generate(self) -> None:
+        """Writes the whole dataset in one transaction; items, users, topics and news must be empty."""
+        rng = np.random.default_rng(self.seed)
+        async with self.engine.begin() as conn:
+            for table in (Item.__table__, User.__table__, Topic.__table__, NewsItem.__table__):
+                if await conn.scalar(select(func.count()).select_from(table)):
+                    raise ValueError(f"Table '{table.name}' is not empty; generate fixtures into an empty database.")
+            countries = list((await conn.scalars(select(Country.id).order_by(Country.id))).all())
+            if not countries:
+                raise ValueError("No countries found; run 'init-db-countries' (and 'init-fiat-currencies') first.")
+            languages = list((await conn.scalars(select(Language.id).order_by(Language.id))).all())
+            fiat_currencies = list((await conn.scalars(select(FiatCurrency.id).order_by(FiatCurrency.id))).all())
+
+            await self._timed("users", self._write_users(conn))
+            await self._timed("items", self._write_items(conn, rng, countries, languages, fiat_currencies))
+            await self._timed("reviews and votes", self._write_reviews(conn, rng))
+            await self._timed("news", self._write_news(conn, rng))
+            if conn.dialect.name == "postgresql":
+                for table in ("items", "users", "topics", "licenses", "reviews", "review_usefulness_votes", "news_items"):
+                    await conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT coalesce(max(id), 1) FROM {table}))"
+                    ))
+        await self._timed("aggregates", self._refresh_aggregates())
+
+    @staticmethod
+    async def _timed(label: str, step) -> None:
+        started = time.perf_counter()
+        await step
+        logger.info(f"Generated {label} in {time.perf_counter() - started:.1f}s")
+
+    @staticmethod
+    async def _write(conn: AsyncConnection, table: Table, columns: Sequence[str], records: Iterable[tuple]) -> None:
+        """Streams tuples (in `columns` order) into a table: COPY on PostgreSQL, batched INSERTs otherwise."""
+        missing = [column for column in columns if column not in table.c]
+        if missing:
+            raise ValueError(f"Unknown columns for {table.name}: {missing}")
+        if conn.dialect.name == "postgresql":
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=list(columns))
+            return
+        batch = []
+        for record in records:
+            batch.append(dict(zip(columns, record)))
+            if len(batch) >= BATCH_SIZE:
+                await conn.execute(insert(table), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(table), batch)
+
+    async def _write_users(self, conn: AsyncConnection) -> None:
+        password_hash = pwd_context.hash(LOAD_TEST_PASSWORD)  # One hash for all: bcrypt is the slow part
+        await self._write(conn, User.__table__, ("id", "email", "nickname", "password_hash", "is_admin", "token_version"), (
+            (n, f"load-test-user-{n}@example.com", f"load-test-user-{n}", password_hash, False, 0)
+            for n in range(1, self.scale.users + 1)
+        ))
+
+    async def _write_items(self, conn, rng: np.random.Generator, countries: List[int], languages: List[int], fiat_currencies: List[int]) -> None:
+        scale = self.scale
+        exchange_ids = list(range(1, scale.exchanges + 1))
+        book_ids = list(range(scale.exchanges + 1, scale.exchanges + scale.books + 1))
+        overviews = _texts(rng, 500, 20, 60)
+        overview_picks = rng.integers(0, len(overviews), len(exchange_ids) + len(book_ids)).tolist()
+
+        await self._write(conn, Item.__table__, (
+            "id", "item_type", "name", "slug", "overview", "logo_url", "website_url",
+            "overall_average_rating", "total_review_count", "total_rating_count", "ranking_score",
+        ), (
+            (
+                item_id,
+                "exchange" if item_id <= scale.exchanges else "book",
+                f"Exchange {item_id}" if item_id <= scale.exchanges else f"Book {item_id}",
+                f"exchange-{item_id}" if item_id <= scale.exchanges else f"book-{item_id}",
+                overviews[overview_picks[item_id - 1]],
+                # Book listings require a logo (cover)
+                f"https://static.example.com/logos/item-{item_id}.png",
+                f"https://exchange-{item_id}.example.com" if item_id <= scale.exchanges else None,
+                Decimal("0.00"), 0, 0, 0.0,
+            )
+            for item_id in exchange_ids + book_ids
+        ))
+
+        flags = rng.random((len(exchange_ids), 7)) < np.array([0.8, 0.4, 0.2, 0.5, 0.5, 0.95, 0.1])
+        founded = rng.integers(2010, 2026, len(exchange_ids)).tolist()
+        volumes = np.round(rng.lognormal(15, 2.5, len(exchange_ids)), 2).tolist()
+        fees = np.round(rng.uniform(0, 0.005, (len(exchange_ids), 4)), 5).tolist()
+        registration = rng.choice(countries, size=len(exchange_ids)).tolist()
+        await self._write(conn, Exchange.__table__, (
+            "id", "year_founded", "registration_country_id", "has_kyc", "has_p2p", "has_copy_trading", "has_staking",
+            "has_futures", "has_spot_trading", "has_demo_trading", "trading_volume_24h",
+            "spot_maker_fee", "spot_taker_fee", "futures_maker_fee", "futures_taker_fee",
+        ), (
+            (
+                exchange_id, founded[index], registration[index], *(bool(flag) for flag in flags[index]),
+                Decimal(str(volumes[index])), *(Decimal(str(fee)) for fee in fees[index]),
+            )
+            for index, exchange_id in enumerate(exchange_ids)
+        ))
+        await self._write(conn, exchange_availability_table, ("exchange_id", "country_id"),
+                          _links(rng, exchange_ids, countries, min(20, len(countries)), min(150, len(countries))))
+        await self._write(conn, exchange_languages_table, ("exchange_id", "language_id"),
+                          _links(rng, exchange_ids, languages, 1, 8))
+        await self._write(conn, exchange_fiat_support_table, ("exchange_id", "fiat_currency_id"),
+                          _links(rng, exchange_ids, fiat_currencies, 1, 10))
+
+        licenses = _links(rng, exchange_ids, countries, 0, 4)
+        issued = _timestamps(rng, len(licenses), 10 * 365)
+        statuses = rng.choice(["active", "active", "active", "pending", "expired"], size=len(licenses)).tolist()
+        await self._write(conn, License.__table__, (
+            "id", "exchange_id", "jurisdiction_country_id", "license_number", "status", "issue_date", "expiry_date",
+        ), (
+            (index + 1, exchange_id, country_id, f"LIC-{exchange_id}-{country_id}", statuses[index],
+             issued[index].date(), (issued[index] + datetime.timedelta(days=5 * 365)).date())
+            for index, (exchange_id, country_id) in enumerate(licenses)
+        ))
+
+        authors = rng.integers(1, max(2, scale.books // 3), len(book_ids)).tolist()
+        years = rng.integers(1990, 2026, len(book_ids)).tolist()
+        pages = rng.integers(80, 900, len(book_ids)).tolist()
+        await self._write(conn, Book.__table__, ("id", "year", "author", "pages"), (
+            (book_id, years[index], f"Author {authors[index]}", pages[index])
+            for index, book_id in enumerate(book_ids)
+        ))
+        await self._write(conn, Topic.__table__, ("id", "name", "slug"), (
+            (topic_id, f"Topic {topic_id}", f"topic-{topic_id}") for topic_id in range(1, TOPIC_COUNT + 1)
+        ))
+        await self._write(conn, book_topics_table, ("book_id", "topic_id"),
+                          _links(rng, book_ids, list(range(1, TOPIC_COUNT + 1)), 1, 3))
+
+    async def _write_reviews(self, conn: AsyncConnection, rng: np.random.Generator) -> None:
+        scale = self.scale
+        count = scale.reviews
+        review_items = _skewed_ids(rng, count, scale.exchanges + scale.books).tolist()
+        authors = rng.integers(1, scale.users + 1, count)
+        is_guest = rng.random(count) < 0.15
+        ratings = rng.choice([1, 2, 3, 4, 5], size=count, p=[0.10, 0.06, 0.12, 0.30, 0.42]).tolist()
+        statuses = rng.choice(["approved", "pending", "rejected"], size=count, p=[0.90, 0.07, 0.03]).tolist()
+        comments = _texts(rng, 2000, 5, 120)
+        comment_picks = np.where(rng.random(count) < 0.85, rng.integers(0, len(comments), count), -1).tolist()
+        created = _timestamps(rng, count, REVIEW_HISTORY_DAYS)
+
+        # Votes go to popular reviews too; counters on reviews must match the vote rows
+        vote_reviews = _skewed_ids(rng, scale.votes, count, exponent=0.8)
+        vote_users = rng.integers(1, scale.users + 1, scale.votes)
+        vote_pairs = np.unique(vote_reviews.astype(np.int64) * (scale.users + 1) + vote_users)  # One vote per user and review
+        vote_reviews, vote_users = vote_pairs // (scale.users + 1), vote_pairs % (scale.users + 1)
+        vote_useful = rng.random(len(vote_pairs)) < 0.75
+        useful_counts = np.bincount(vote_reviews[vote_useful], minlength=count + 1).tolist()
+        not_useful_counts = np.bincount(vote_reviews[~vote_useful], minlength=count + 1).tolist()
+        author_ids = np.where(is_guest, 0, authors).tolist()
+
+        await self._write(conn, Review.__table__, (
+            "id", "item_id", "user_id", "guest_name", "comment", "rating", "moderation_status",
+            "useful_votes_count", "not_useful_votes_count", "created_at", "updated_at",
+        ), (
+            (
+                index + 1,
+                review_items[index],
+                author_ids[index] or None,
+                None if author_ids[index] else f"Guest {index + 1}",
+                comments[comment_picks[index]] if comment_picks[index] >= 0 else None,
+                ratings[index],
+                statuses[index],
+                useful_counts[index + 1],
+                not_useful_counts[index + 1],
+                created[index],
+                created[index],
+            )
+            for index in range(count)
+        ))
+        await self._write(conn, ReviewUsefulnessVote.__table__, ("id", "review_id", "user_id", "is_useful"), (
+            (index + 1, review_id, user_id, useful)
+            for index, (review_id, user_id, useful) in enumerate(zip(vote_reviews.tolist(), vote_users.tolist(), vote_useful.tolist()))
+        ))
+
+    async def _write_news(self, conn: AsyncConnection, rng: np.random.Generator) -> None:
+        scale = self.scale
+        titles = _texts(rng, 1000, 4, 12)
+        bodies = _texts(rng, 500, 80, 400)
+        title_picks = rng.integers(0, len(titles), scale.news).tolist()
+        body_picks = rng.integers(0, len(bodies), scale.news).tolist()
+        published = _timestamps(rng, scale.news, REVIEW_HISTORY_DAYS)
+        await self._write(conn, NewsItem.__table__, ("id", "title", "content", "source_name", "published_at"), (
+            (news_id, titles[title_picks[news_id - 1]], bodies[body_picks[news_id - 1]], "Load test wire", published[news_id - 1])
+            for news_id in range(1, scale.news + 1)
+        ))
+        if not scale.exchanges:
+            return
+        # Each story mentions 1-3 exchanges, mostly the popular ones
+        links = set()
+        mentions = rng.integers(1, 4, scale.news).tolist()
+        exchanges = _skewed_ids(rng, sum(mentions), scale.exchanges).tolist()
+        position = 0
+        for news_id, mentioned in enumerate(mentions, 1):
+            links.update((news_id, exchange_id) for exchange_id in exchanges[position:position + mentioned])
+            position += mentioned
+        await self._write(conn, news_item_exchanges_table, ("news_item_id", "exchange_id"), sorted(links))
+
+    async def _refresh_aggregates(self) -> None:
+        from app.core.database import AsyncSessionFactory
+        from app.reviews.ranking import refresh_all_ranking_scores
+        from app.reviews.service import review_service
+
+        async with AsyncSessionFactory(bind=self.engine) as db:
+            await review_service.recompute_all_item_review_stats(db)
+            await review_service.recompute_all_item_review_facets(db)
+            await review_service.recompute_all_item_category_ratings(db)
+            await refresh_all_ranking_scores(db)
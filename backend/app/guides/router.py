@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from app.core.database import get_async_db
+from app.core.query_budget import endpoint_query_budget
 from app.guides import schemas as guide_schemas, service as guide_service
 from app.schemas.common import PaginationParams, PaginatedResponse
 
@@ -13,6 +14,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=PaginatedResponse[guide_schemas.GuideItemRead])
+@endpoint_query_budget(2)
 async def list_guides(
     db: AsyncSession = Depends(get_async_db),
     pagination: PaginationParams = Depends(),
@@ -40,11 +40,7 @@ class GuideService: # Renamed class
 
         # Apply pagination
         stmt = stmt.offset(pagination.skip).limit(pagination.limit)
-
-        # Eager load relationships if needed
-        stmt = stmt.options(
-            selectinload(guide_models.GuideItem.exchange).selectinload(exchange_models.Exchange.registration_country)
-        )
+        # No eager loads: GuideItemRead renders no relationship (its exchanges list is not mapped)
 
         # Execute queries
         result = await db.execute(stmt)
@@ -12,10 +12,10 @@ logger = logging.getLogger(__name__)
 class ItemService:
     async def get_item_by_id(self, db: AsyncSession, item_id: int) -> Optional[item_models.Item]:
         """Retrieve a single item by its ID."""
-        logger.info(f"Retrieving item with id {item_id}.")
+        logger.debug(f"Retrieving item with id {item_id}.")
         result = await db.execute(select(item_models.Item).filter(item_models.Item.id == item_id))
         item = result.scalars().first()
-        logger.info(f"Item with id {item_id} {'found' if item else 'not found'}.")
+        logger.debug(f"Item with id {item_id} {'found' if item else 'not found'}.")
         return item
 
 item_service = ItemService()
@@ -0,0 +1,129 @@
+# app/jobs.py
+"""
+Periodic maintenance jobs run by the in-process scheduler (see app/core/scheduler.py).
+Heavy recomputation lives here so it stays off the request path.
+"""
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionFactory
+from app.core.scheduler import Scheduler
+
+logger = logging.getLogger(__name__)
+
+
+async def process_work_queue() -> None:
+    """Drains the durable work queue (see app/core/work_queue.py); runs on every worker."""
+    from app.core.work_queue import work_queue
+    import app.reviews.service  # noqa: F401  (registers the review task handlers)
+
+    await work_queue.drain()
+
+
+async def refresh_review_stats() -> None:
+    """
+    Reconciles denormalized review counters/averages, review facets and category ratings on all items.
+    Per-item refreshes go through the work queue; this full pass repairs any drift.
+    """
+    from app.reviews.service import review_service
+
+    async with AsyncSessionFactory() as db:
+        await review_service.recompute_all_item_review_stats(db)
+        await review_service.recompute_all_item_review_facets(db)
+        await review_service.recompute_all_item_category_ratings(db)
+
+
+async def refresh_ranking_scores() -> None:
+    """Recomputes the time-decayed ranking score of every item (decay changes scores even without new reviews)."""
+    from app.reviews.ranking import refresh_all_ranking_scores
+
+    async with AsyncSessionFactory() as db:
+        await refresh_all_ranking_scores(db)
+
+
+async def rebuild_spam_index() -> None:
+    """Reloads this worker's in-memory near-duplicate review index."""
+    from app.reviews.spam import review_spam_filter
+
+    if not settings.SPAM_FILTER_ENABLED:
+        return
+    async with AsyncSessionFactory() as db:
+        await review_spam_filter.rebuild(db)
+
+
+async def sync_token_versions() -> None:
+    """Reloads changed token versions into this worker's revocation table (see app/auth/token_versions.py)."""
+    from app.auth.token_versions import token_versions
+
+    async with AsyncSessionFactory() as db:
+        await token_versions.sync(db)
+
+
+async def purge_refresh_tokens() -> None:
+    """Deletes expired refresh tokens (see app/auth/refresh_tokens.py)."""
+    from app.auth.refresh_tokens import refresh_token_store
+
+    async with AsyncSessionFactory() as db:
+        await refresh_token_store.purge_expired(db)
+
+
+async def sync_exchange_data() -> None:
+    """Pulls fresh exchange data from CoinGecko (replaces the update_data.py cron job)."""
+    from app.exchanges.sync import sync_exchanges
+
+    async with AsyncSessionFactory() as db:
+        await sync_exchanges(db)
+
+
+def register_jobs(scheduler: Scheduler) -> None:
+    scheduler.add_job(
+        "process_work_queue",
+        process_work_queue,
+        interval_seconds=settings.WORK_QUEUE_POLL_SECONDS,
+        jitter_seconds=settings.WORK_QUEUE_POLL_SECONDS * 0.5,
+        leader_only=False,  # SKIP LOCKED lets every worker take its share
+        run_on_start=True,
+    )
+    scheduler.add_job(
+        "refresh_review_stats",
+        refresh_review_stats,
+        interval_seconds=settings.REVIEW_STATS_REFRESH_SECONDS,
+        jitter_seconds=settings.REVIEW_STATS_REFRESH_SECONDS * 0.1,
+    )
+    scheduler.add_job(
+        "refresh_ranking_scores",
+        refresh_ranking_scores,
+        interval_seconds=settings.RANKING_REFRESH_SECONDS,
+        jitter_seconds=settings.RANKING_REFRESH_SECONDS * 0.1,
+        run_on_start=True,
+    )
+    scheduler.add_job(
+        "rebuild_spam_index",
+        rebuild_spam_index,
+        interval_seconds=settings.SPAM_INDEX_REFRESH_SECONDS,
+        jitter_seconds=settings.SPAM_INDEX_REFRESH_SECONDS * 0.1,
+        leader_only=False,  # The index is per worker
+        run_on_start=True,
+    )
+    scheduler.add_job(
+        "sync_token_versions",
+        sync_token_versions,
+        interval_seconds=settings.TOKEN_VERSION_SYNC_SECONDS,
+        leader_only=False,  # The table is per worker
+        run_on_start=True,
+    )
+    scheduler.add_job(
+        "purge_refresh_tokens",
+        purge_refresh_tokens,
+        interval_seconds=settings.REFRESH_TOKEN_PURGE_SECONDS,
+        jitter_seconds=settings.REFRESH_TOKEN_PURGE_SECONDS * 0.1,
+    )
+    if settings.EXCHANGE_SYNC_INTERVAL_SECONDS > 0 and not settings.COINGECKO_API_KEY:
+        logger.warning("EXCHANGE_SYNC_INTERVAL_SECONDS is set but COINGECKO_API_KEY is not; exchange sync disabled")
+    elif settings.EXCHANGE_SYNC_INTERVAL_SECONDS > 0:
+        scheduler.add_job(
+            "sync_exchange_data",
+            sync_exchange_data,
+            interval_seconds=settings.EXCHANGE_SYNC_INTERVAL_SECONDS,
+            jitter_seconds=60,
+        )
@@ -1,6 +1,10 @@
 # app/main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi import APIRouter
+from fastapi import Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
@@ -14,15 +18,56 @@ from app.admin.router import router as admin_router
 from app.common.router import router as common_router # Import the new router
 from app.guides.router import router as guides_router # Import the guides router
 from app.item.router import router as item_router # Import the item router
+from app.core.scheduler import scheduler
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.metrics import MetricsMiddleware, instrument_engine, instrument_routes, registry as metrics_registry
+from app.core.profiling import ProfilingMiddleware
+from app.core.slow_queries import slow_query_log
+from app.core.statement_cache import instrument_engine as instrument_statement_cache
+from app.dependencies import is_admin_token
+from app.auth.security import PasswordHasherBusy
+from app.core.database import get_engine
+from app.core.warmup import warm_up
+from app.jobs import register_jobs
+
+# --- Lifespan ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy objects are built here, in the worker, rather than at import (see benchmarks/startup_profile.py)
+    from app.core.migrations import check_schema_current  # Imports alembic
+
+    engine = get_engine()
+    instrument_engine(engine)
+    instrument_statement_cache(engine)
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        slow_query_log.instrument(engine)
+    # Migrations are applied at deploy time ('python -m app.cli migrate'); here we only verify the revision
+    await check_schema_current(engine)
+    # Before the worker accepts connections, so the first requests do not pay for cold caches
+    if settings.WARMUP_ENABLED:
+        await warm_up(app, engine)
+    # Periodic maintenance jobs run in-process; leader election keeps them on a single worker
+    if settings.SCHEDULER_ENABLED:
+        register_jobs(scheduler)
+        await scheduler.start()
+    yield
+    await scheduler.shutdown()
 
 # Create FastAPI app instance
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json" # Customize OpenAPI path
+    openapi_url=f"{settings.API_V1_STR}/openapi.json", # Customize OpenAPI path
+    lifespan=lifespan,
 )
 
 # --- Middleware ---
+# Rate limiting is added first so it runs inside CORS (the last added middleware is outermost)
+# and 429 responses still carry CORS headers
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(QueryBudgetMiddleware)
+
 # Set up CORS (Cross-Origin Resource Sharing)
 origins = [
     "*"
@@ -37,6 +82,42 @@ app.add_middleware(
     allow_headers=["*"], # Allows all headers
 )
 
+# Outermost, so latency includes the other middleware (and rate-limited responses are counted)
+app.add_middleware(MetricsMiddleware)
+
+# Profiles requests sent by admins with "X-Profile: 1"; left out entirely when profiling is disabled
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, authorize=is_admin_token)
+
+# --- Exception handlers ---
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # Shed load instead of queueing logins without bound
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please try again shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+# --- Health and metrics ---
+# Registered before the routers: the root-level static pages router would otherwise match these paths
+@app.get("/health", include_in_schema=False)
+async def health():
+    """
+    Liveness/readiness probe. Workers only serve requests once startup (schema check, warm-up) has completed.
+    """
+    return {"status": "ok", "version": settings.PROJECT_VERSION}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Per-worker request and database metrics in the Prometheus text format.
+    """
+    if settings.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return PlainTextResponse("Unauthorized", status_code=401)
+    return PlainTextResponse(metrics_registry.expose(), media_type="text/plain; version=0.0.4")
+
+
 # --- Routers ---
 # Include modular routers
 api_router_v1 = APIRouter() # Create a router for versioning
@@ -58,6 +139,8 @@ app.include_router(api_router_v1, prefix=settings.API_V1_STR)
 # This ensures /api/v1/... routes are matched first
 app.include_router(static_pages_router)
 
+instrument_routes(app.routes)
+
 # --- Utils ---
 def generate_openapi_spec(output: str):
     """
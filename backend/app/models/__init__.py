@@ -1,6 +1,6 @@
 # app/models/__init__.py
 from .base import Base  # Import Base first
-from .common import Country, Language, FiatCurrency
+from .common import Country, Language, FiatCurrency, RatingCategory
 from .user import User
 from .exchange import (
     Exchange, License, ExchangeSocialLink,
@@ -11,11 +11,13 @@ from .books import (
     Book, Topic, book_topics_table,
 )
 from .review import (
-    Review, ReviewScreenshot, ReviewUsefulnessVote
+    Review, ReviewScreenshot, ReviewUsefulnessVote, ReviewRating, ItemCategoryRating, ItemReviewFacets
 )
 from .news import NewsItem
 from .guide import GuideItem
 from .static_page import StaticPage
+from .work_queue import WorkQueueTask
+from .refresh_token import RefreshToken
 
 # You can optionally define __all__ if needed
 # __all__ = [...]
\ No newline at end of file
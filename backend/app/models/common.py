@@ -1,7 +1,7 @@
 # app/models/common.py
 # (Only showing Country for brevity, assume others are okay unless they directly referenced removed Exchange fields)
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 # Import Base from the central location
@@ -71,3 +71,12 @@ class FiatCurrency(Base):
     )
     def __repr__(self):
         return f"<FiatCurrency(id={self.id}, name='{self.name}', code='{self.code_iso_4217}')>"
+
+class RatingCategory(Base):
+    """Aspects a review can rate separately (UI/UX, support, security, fees, ...)."""
+    __tablename__ = 'rating_categories'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False, unique=True)
+    description = Column(Text, nullable=True)
+    def __repr__(self):
+        return f"<RatingCategory(id={self.id}, name='{self.name}')>"
@@ -6,7 +6,7 @@ from sqlalchemy import (
     UniqueConstraint, Index, PrimaryKeyConstraint
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.sql import expression  # Required for server_default=expression.false()
 
 # Import Base and Item
@@ -67,7 +67,7 @@ class Exchange(Item):
     has_spot_trading = Column(Boolean, nullable=True, default=None, server_default=expression.false())
     has_demo_trading = Column(Boolean, nullable=True, default=None, server_default=expression.false())
 
-    trading_volume_24h = Column(Numeric(20, 2), index=True, nullable=True)
+    trading_volume_24h = Column(Numeric(20, 2), nullable=True)
     
     spot_maker_fee = Column(Numeric(8, 5), nullable=True)  # Renamed from spot_fee
     futures_maker_fee = Column(Numeric(8, 5), nullable=True)  # Renamed from futures_fee
@@ -93,6 +93,13 @@ class Exchange(Item):
     news_items = relationship("NewsItem", secondary=news_item_exchanges_table, back_populates="exchanges")
     guide_items = relationship("GuideItem", back_populates="exchange", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ix_exchanges_volume_id', 'trading_volume_24h', 'id'),
+        # Partial indexes for the common feature filters, ordered for the volume sort
+        Index('ix_exchanges_kyc_volume', 'trading_volume_24h', 'id', postgresql_where=text('has_kyc')),
+        Index('ix_exchanges_p2p_volume', 'trading_volume_24h', 'id', postgresql_where=text('has_p2p')),
+    )
+
     # --- Polymorphism Setup ---
     __mapper_args__ = {
         'polymorphic_identity': ItemTypeEnum.exchange,  # Specific identity for this subclass
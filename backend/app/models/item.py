@@ -1,6 +1,6 @@
 # app/models/item.py
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Numeric, Enum as SQLAlchemyEnum
+    Column, Integer, String, Text, DateTime, Numeric, Float, Index, Enum as SQLAlchemyEnum
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -35,10 +35,12 @@ class Item(Base):
     referral_link = Column(String(512), nullable=True)
     reviews_page_content = Column(Text, nullable=True) # Placeholder for reviews page content
 
-    # Common aggregated fields
-    overall_average_rating = Column(Numeric(3, 2), default=0.00, index=True)
-    total_review_count = Column(Integer, default=0, index=True)
-    total_rating_count = Column(Integer, default=0, index=True)
+    # Common aggregated fields (indexed for listing sorts, see __table_args__)
+    overall_average_rating = Column(Numeric(3, 2), default=0.00)
+    total_review_count = Column(Integer, default=0)
+    total_rating_count = Column(Integer, default=0)
+    # Confidence-weighted, time-decayed score for ranked listings (see app/reviews/ranking.py)
+    ranking_score = Column(Float, nullable=False, default=0.0, server_default='0')
 
     # Timestamps
     created_at = Column(DateTime, server_default=func.now())
@@ -54,11 +56,24 @@ class Item(Base):
         # Consider cascade options carefully. Deleting an item might delete its reviews.
         cascade="all, delete-orphan"
     )
+    # Per-category averages of approved reviews (read-only here, maintained by ReviewService)
+    category_ratings = relationship("ItemCategoryRating", viewonly=True, order_by="ItemCategoryRating.category_id")
+
+    __table_args__ = (
+        # Listing sorts: ORDER BY <column>, id (the id tie-breaker keeps pagination stable)
+        Index('ix_items_rating_id', 'overall_average_rating', 'id'),
+        Index('ix_items_review_count_id', 'total_review_count', 'id'),
+        Index('ix_items_rating_count_id', 'total_rating_count', 'id'),
+        Index('ix_items_ranking_score_id', 'ranking_score', 'id'),
+    )
 
     # --- Polymorphism Setup ---
     __mapper_args__ = {
         'polymorphic_identity': 'item', # Base identity (optional but good practice)
-        'polymorphic_on': item_type     # Column used to determine the subclass
+        'polymorphic_on': item_type,    # Column used to determine the subclass
+        # Fetch server-generated values (timestamps, flag defaults) via RETURNING on flush,
+        # so written items can be serialized without a refresh. Applies to all subclasses.
+        'eager_defaults': True,
     }
 
     def __repr__(self):
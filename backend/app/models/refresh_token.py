@@ -0,0 +1,23 @@
+# app/models/refresh_token.py
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+
+from .base import Base
+
+
+class RefreshToken(Base):
+    """
+    Server-side record of an issued refresh token (see app/auth/refresh_tokens.py). Each refresh
+    marks the presented token as rotated and issues its successor in the same family; presenting
+    a rotated token again revokes the whole family.
+    """
+    __tablename__ = 'refresh_tokens'
+
+    id = Column(String(32), primary_key=True)  # The token's "jti" claim
+    family_id = Column(String(32), nullable=False, index=True)  # Shared by all rotations of one login
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    issued_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Expired rows are purged
+    rotated_at = Column(DateTime, nullable=True)  # Set when exchanged for a successor
+    revoked_at = Column(DateTime, nullable=True)  # Set on logout or detected reuse
@@ -3,11 +3,11 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Boolean, SmallInteger,
+    Column, Integer, String, Text, DateTime, Boolean, SmallInteger, Numeric,
     ForeignKey, Enum as SQLAlchemyEnum, Table, UniqueConstraint, Index, CheckConstraint
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 # Import Base (and potentially Item if needed for type hints, though string ref is used)
 from .base import Base
@@ -27,7 +27,7 @@ class Review(Base):
     id = Column(Integer, primary_key=True)
 
     # Foreign key to User, now nullable
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)  # Indexed via ix_reviews_user_created
     
     # New field for guest name
     guest_name = Column(String(100), nullable=True)
@@ -56,22 +56,43 @@ class Review(Base):
     moderator = relationship("User", back_populates="moderated_reviews", foreign_keys=[moderated_by_user_id])
     screenshots = relationship("ReviewScreenshot", back_populates="review", cascade="all, delete-orphan")
     usefulness_votes = relationship("ReviewUsefulnessVote", back_populates="review", cascade="all, delete-orphan")
+    category_ratings = relationship("ReviewRating", back_populates="review", cascade="all, delete-orphan")
 
     __table_args__ = (
         # *** CHANGE: Update index to use item_id ***
         Index('idx_reviews_item_status_date', 'item_id', 'moderation_status', 'created_at'),
-        # Index('idx_reviews_user', 'user_id'), # Already indexed via ForeignKey/user_id column def
+        Index('ix_reviews_user_created', 'user_id', 'created_at', 'id'),
+        # Public feeds only ever show approved reviews: partial indexes per sort order.
+        # The usefulness expression must match the ORDER BY in ReviewService.list_reviews.
+        Index('ix_reviews_approved_item_created', 'item_id', 'created_at', 'id',
+              postgresql_where=text("moderation_status = 'approved'")),
+        Index('ix_reviews_approved_item_usefulness', 'item_id', (useful_votes_count - not_useful_votes_count), 'id',
+              postgresql_where=text("moderation_status = 'approved'")),
+        Index('ix_reviews_approved_item_rating', 'item_id', 'rating', 'id',
+              postgresql_where=text("moderation_status = 'approved'")),
+        Index('ix_reviews_approved_created', 'created_at', 'id',
+              postgresql_where=text("moderation_status = 'approved'")),
+        Index('ix_reviews_approved_usefulness', (useful_votes_count - not_useful_votes_count), 'id',
+              postgresql_where=text("moderation_status = 'approved'")),
+        # Moderation queue
+        Index('ix_reviews_pending_created', 'created_at', 'id',
+              postgresql_where=text("moderation_status = 'pending'")),
         CheckConstraint("NOT (user_id IS NOT NULL AND guest_name IS NOT NULL)", name="cc_review_author_exclusive"),
         CheckConstraint("user_id IS NOT NULL OR (guest_name IS NOT NULL AND guest_name != '')", name="cc_review_author_required"),
     )
 
+    __mapper_args__ = {
+        # Fetch created_at/updated_at with RETURNING so a new review can be serialized without a reload
+        'eager_defaults': True,
+    }
+
 # --- Other Review-related models (ReviewRating, ReviewScreenshot, ReviewUsefulnessVote) ---
 # These models link to Review.id, so they do NOT need changes themselves.
 
 class ReviewScreenshot(Base):
     __tablename__ = 'review_screenshots'
     id = Column(Integer, primary_key=True)
-    review_id = Column(Integer, ForeignKey('reviews.id', ondelete='CASCADE'), nullable=False)
+    review_id = Column(Integer, ForeignKey('reviews.id', ondelete='CASCADE'), nullable=False, index=True)
     file_url = Column(String(512), nullable=False)
     file_size_bytes = Column(Integer)
     mime_type = Column(String(50))
@@ -90,4 +111,57 @@ class ReviewUsefulnessVote(Base):
     review = relationship("Review", back_populates="usefulness_votes")
     user = relationship("User", back_populates="usefulness_votes")
 
-    __table_args__ = (UniqueConstraint('review_id', 'user_id', name='uk_review_user_vote'),)
\ No newline at end of file
+    __table_args__ = (UniqueConstraint('review_id', 'user_id', name='uk_review_user_vote'),)
+
+class ReviewRating(Base):
+    """A review's rating (1-5) for one RatingCategory."""
+    __tablename__ = 'review_ratings'
+    review_id = Column(Integer, ForeignKey('reviews.id', ondelete='CASCADE'), primary_key=True)
+    category_id = Column(Integer, ForeignKey('rating_categories.id', ondelete='CASCADE'), primary_key=True)
+    rating = Column(SmallInteger, nullable=False)
+
+    review = relationship("Review", back_populates="category_ratings")
+    category = relationship("RatingCategory")
+
+    __table_args__ = (
+        CheckConstraint("rating BETWEEN 1 AND 5", name="cc_review_rating_range"),
+    )
+
+class ItemCategoryRating(Base):
+    """
+    Per item and category aggregate of approved reviews' category ratings.
+    Rebuilt per item by the refresh_item_aggregates work queue task (enqueued on review create/moderate,
+    see app/core/work_queue.py) and for all items by the periodic refresh_review_stats job.
+    """
+    __tablename__ = 'item_category_ratings'
+    item_id = Column(Integer, ForeignKey('items.id', ondelete='CASCADE'), primary_key=True)
+    category_id = Column(Integer, ForeignKey('rating_categories.id', ondelete='CASCADE'), primary_key=True)
+    rating_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_count = Column(Integer, nullable=False, default=0, server_default='0')
+    average_rating = Column(Numeric(3, 2), nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    category = relationship("RatingCategory", lazy="joined")
+
+    __table_args__ = (
+        # Listing sort by one category's average
+        Index('ix_item_category_ratings_category_avg', 'category_id', 'average_rating', 'item_id'),
+    )
+
+class ItemReviewFacets(Base):
+    """
+    Precomputed counts of an item's approved reviews, for the filter facets on item pages.
+    Rebuilt per item by the refresh_item_aggregates work queue task (enqueued on review create/moderate,
+    see app/core/work_queue.py) and for all items by the periodic refresh_review_stats job.
+    """
+    __tablename__ = 'item_review_facets'
+    item_id = Column(Integer, ForeignKey('items.id', ondelete='CASCADE'), primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default='0')
+    with_comment_count = Column(Integer, nullable=False, default=0, server_default='0')
+    with_screenshot_count = Column(Integer, nullable=False, default=0, server_default='0')
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -20,10 +20,12 @@ class User(Base):
     avatar_url = Column(String(512), nullable=True)
     email_verified_at = Column(DateTime, nullable=True) # Timestamp when email was verified
     is_admin = Column(Boolean, nullable=False, default=False)
+    # Bumped on password and role changes; access tokens carrying an older version are rejected
+    token_version = Column(Integer, nullable=False, default=0, server_default='0')
     # is_active = Column(Boolean, nullable=False, default=True) # Optional: If user blocking is needed
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Token version sync
 
     # --- Relationships ---
     # Reviews created by this user
@@ -0,0 +1,27 @@
+# app/models/work_queue.py
+from datetime import datetime
+
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, Index
+
+from .base import Base
+
+
+class WorkQueueTask(Base):
+    """
+    A unit of deferred work (see app/core/work_queue.py). Rows are claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED and deleted in the transaction that does the work,
+    so a task survives crashes and restarts until a worker has completed it.
+    """
+    __tablename__ = 'work_queue'
+
+    id = Column(BigInteger, primary_key=True)
+    task = Column(String(50), nullable=False)  # Handler name
+    subject_id = Column(Integer, nullable=False)  # What the task is about, e.g. an item id
+    enqueued_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Pushed back after failures
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('ix_work_queue_available', 'available_at', 'id'),
+    )
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.core.database import get_async_db
+from app.core.query_budget import endpoint_query_budget
 from app.news import schemas, service
 from app.schemas.common import PaginationParams, PaginatedResponse
 
@@ -13,6 +14,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=PaginatedResponse[schemas.NewsItemRead])
+@endpoint_query_budget(3)
 async def list_news(
     db: AsyncSession = Depends(get_async_db),
     pagination: PaginationParams = Depends(),
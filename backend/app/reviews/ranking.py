@@ -0,0 +1,166 @@
+# app/reviews/ranking.py
+"""
+Ranking score for items: a confidence-weighted (Bayesian), time-decayed average rating.
+
+    score = (m * C + sum(w_i * r_i)) / (m + sum(w_i)),   w_i = 0.5 ** (age_i / half_life)
+
+C is the global mean rating of approved reviews (prior_mean_rating, the same value in both
+refresh paths) and m (RANKING_PRIOR_WEIGHT) the number of
+"pseudo-reviews" at C every item starts with, so an item with one 5-star review stays close to
+the mean while an item with hundreds of recent 5-star reviews approaches 5. Items without
+approved reviews score C, and new items are created with C (not the column default 0).
+
+The score is stored in items.ranking_score (indexed), so ranked listings are a plain ORDER BY.
+refresh_all_ranking_scores recomputes every item in one vectorized pass (scheduled, as decay
+changes scores over time); refresh_item_ranking_score updates one item after moderation.
+"""
+import datetime
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.item import Item
+from app.models.review import ItemReviewFacets, ModerationStatusEnum, Review
+
+logger = logging.getLogger(__name__)
+
+FETCH_BATCH_SIZE = 10000
+SCORE_TOLERANCE = 1e-9  # Smaller changes are not written back
+
+
+def compute_scores(
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
+    ages_days: np.ndarray,
+    prior_mean: float,
+    prior_weight: float = None,
+    half_life_days: float = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized scores for all items present in item_ids (one entry per review).
+    Returns (unique item ids, scores) in ascending id order.
+    """
+    prior_weight = settings.RANKING_PRIOR_WEIGHT if prior_weight is None else prior_weight
+    half_life_days = settings.RANKING_HALF_LIFE_DAYS if half_life_days is None else half_life_days
+
+    unique_ids, positions = np.unique(item_ids, return_inverse=True)
+    weights = np.power(0.5, np.clip(ages_days, 0, None) / half_life_days)
+    weight_sums = np.bincount(positions, weights=weights, minlength=len(unique_ids))
+    weighted_ratings = np.bincount(positions, weights=weights * ratings, minlength=len(unique_ids))
+    scores = (prior_weight * prior_mean + weighted_ratings) / (prior_weight + weight_sums)
+    return unique_ids, scores
+
+
+def _ages_in_days(created_at: np.ndarray, now: datetime.datetime) -> np.ndarray:
+    return (np.datetime64(now, 's') - created_at.astype('datetime64[s]')).astype(np.float64) / 86400.0
+
+
+async def prior_mean_rating(db: AsyncSession) -> float:
+    """
+    The prior mean C: avg(rating) of approved reviews, computed exactly from the per-rating counts
+    in item_review_facets (one row per item, no reviews scan). Both refresh paths use it, so an
+    item's score does not depend on which path wrote it last. 0 when there are no approved reviews.
+    """
+    rating_counts = [getattr(ItemReviewFacets, f'rating_{rating}_count') for rating in range(1, 6)]
+    result = await db.execute(
+        select(
+            cast(sum(rating * func.sum(count) for rating, count in zip(range(1, 6), rating_counts)), Float)
+            / func.nullif(func.sum(ItemReviewFacets.total_count), 0)
+        )
+    )
+    mean = result.scalar_one_or_none()
+    return float(mean) if mean is not None else 0.0
+
+
+async def refresh_all_ranking_scores(db: AsyncSession, now: Optional[datetime.datetime] = None) -> int:
+    """Recomputes ranking_score for every item. Returns the number of items whose score changed."""
+    now = now or datetime.datetime.utcnow()
+
+    prior_mean = await prior_mean_rating(db)
+
+    # Stream (item_id, rating, created_at) of approved reviews into arrays
+    id_chunks, rating_chunks, created_chunks = [], [], []
+    result = await db.stream(
+        select(Review.item_id, Review.rating, Review.created_at)
+        .where(Review.moderation_status == ModerationStatusEnum.approved)
+        .execution_options(yield_per=FETCH_BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        item_ids, ratings, created_at = zip(*rows)
+        id_chunks.append(np.array(item_ids, dtype=np.int64))
+        rating_chunks.append(np.array(ratings, dtype=np.float64))
+        created_chunks.append(np.array(created_at, dtype='datetime64[s]'))
+
+    if id_chunks:
+        reviewed_ids, reviewed_scores = compute_scores(
+            np.concatenate(id_chunks),
+            np.concatenate(rating_chunks),
+            _ages_in_days(np.concatenate(created_chunks), now),
+            prior_mean,
+        )
+    else:
+        reviewed_ids, reviewed_scores = np.empty(0, dtype=np.int64), np.empty(0)
+
+    # Compare with the stored scores and write back only what changed
+    current = (await db.execute(select(Item.id, Item.ranking_score).order_by(Item.id))).all()
+    if not current:
+        return 0
+    all_ids = np.fromiter((row[0] for row in current), dtype=np.int64, count=len(current))
+    stored = np.fromiter((row[1] or 0.0 for row in current), dtype=np.float64, count=len(current))
+
+    targets = np.full(len(all_ids), prior_mean)
+    found = np.searchsorted(all_ids, reviewed_ids)
+    valid = (found < len(all_ids)) & (all_ids[np.minimum(found, len(all_ids) - 1)] == reviewed_ids)
+    targets[found[valid]] = reviewed_scores[valid]
+
+    changed = np.flatnonzero(np.abs(targets - stored) > SCORE_TOLERANCE)
+    if len(changed):
+        await db.execute(
+            update(Item),
+            [{"id": int(all_ids[i]), "ranking_score": float(targets[i])} for i in changed],
+        )
+    await db.commit()
+    logger.info(f"Refreshed ranking scores: {len(changed)} of {len(all_ids)} items changed (prior mean {prior_mean:.3f})")
+    return len(changed)
+
+
+async def refresh_item_ranking_score(
+    db: AsyncSession,
+    item_id: int,
+    now: Optional[datetime.datetime] = None,
+    prior_mean: Optional[float] = None,
+) -> float:
+    """
+    Recomputes one item's ranking_score in the caller's transaction (not committed).
+    Reads only that item's approved reviews (served by ix_reviews_approved_item_created).
+    Callers refreshing several items pass prior_mean (prior_mean_rating) computed once.
+    """
+    now = now or datetime.datetime.utcnow()
+    if prior_mean is None:
+        prior_mean = await prior_mean_rating(db)
+    rows = (
+        await db.execute(
+            select(Review.rating, Review.created_at).where(
+                Review.item_id == item_id,
+                Review.moderation_status == ModerationStatusEnum.approved,
+            )
+        )
+    ).all()
+
+    score = prior_mean
+    if rows:
+        ratings, created_at = zip(*rows)
+        _, scores = compute_scores(
+            np.zeros(len(rows), dtype=np.int64),
+            np.array(ratings, dtype=np.float64),
+            _ages_in_days(np.array(created_at, dtype='datetime64[s]'), now),
+            prior_mean,
+        )
+        score = float(scores[0])
+
+    await db.execute(update(Item).where(Item.id == item_id).values(ranking_score=score))
+    return score
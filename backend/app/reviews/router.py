@@ -1,25 +1,32 @@
 # app/reviews/router.py
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
 
 from app.core.database import get_async_db
+from app.core.query_budget import endpoint_query_budget
+from app.core.rate_limit import rate_limited
 from app.reviews import schemas, service
 from app.schemas.common import PaginationParams, PaginatedResponse, Message
-from app.dependencies import get_current_active_user, get_current_admin_user, get_optional_current_active_user  # Assuming get_optional_current_active_user exists
-from app.models.user import User
+from app.core.serialization import paginated_response
+from app.dependencies import Principal, get_current_admin_user, get_current_principal, get_optional_principal
 from app.models.review import ModerationStatusEnum
 from app.reviews.schemas import ItemReviewCreate, ReviewAdminUpdatePayload
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/reviews",
     tags=["Reviews"]
 )
 
-CurrentUser = User  # Alias for readability
+CurrentUser = Principal  # Alias for readability
 
 @router.get("/", response_model=PaginatedResponse[schemas.ReviewRead])
+@endpoint_query_budget(4)
 async def list_all_approved_reviews(
     db: AsyncSession = Depends(get_async_db),
     item_id: Optional[int] = Query(None, description="Filter by item ID (e.g., exchange, wallet)"),
@@ -47,17 +54,12 @@ async def list_all_approved_reviews(
         db=db, filters=filters, sort=sort_by, pagination=pagination
     )
 
-    return PaginatedResponse(
-        total=total,
-        items=reviews,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return paginated_response(reviews, total, pagination, schemas.ReviewRead)
 
 @router.get("/me", response_model=PaginatedResponse[schemas.ReviewRead])
 async def list_my_reviews(
     db: AsyncSession = Depends(get_async_db),
-    current_user: CurrentUser = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_principal),
     moderation_status: Optional[ModerationStatusEnum] = Query(None, description="Filter by moderation status"),
     item_id: Optional[int] = Query(None, description="Filter by item ID"),
     sort_by: schemas.ReviewSortBy = Depends(),
@@ -78,14 +80,10 @@ async def list_my_reviews(
         db=db, filters=filters, sort=sort_by, pagination=pagination
     )
 
-    return PaginatedResponse(
-        total=total,
-        items=reviews,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return paginated_response(reviews, total, pagination, schemas.ReviewRead)
 
 @router.get("/item/{item_id}", response_model=PaginatedResponse[schemas.ReviewRead])
+@endpoint_query_budget(4)
 async def list_reviews_for_item(
     item_id: int,
     db: AsyncSession = Depends(get_async_db),
@@ -110,20 +108,32 @@ async def list_reviews_for_item(
         db=db, filters=filters, sort=sort_by, pagination=pagination
     )
 
-    return PaginatedResponse(
-        total=total,
-        items=reviews,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return paginated_response(reviews, total, pagination, schemas.ReviewRead)
+
+
+@router.get("/item/{item_id}/facets", response_model=schemas.ItemReviewFacetsRead)
+@endpoint_query_budget(2)
+async def get_review_facets_for_item(
+    item_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get counts of an item's *approved* reviews per rating, with/without comment and
+    with/without screenshots (precomputed, for display next to the review filters).
+    """
+    facets = await service.review_service.get_item_review_facets(db, item_id)
+    if facets is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    return facets
 
 
 @router.post("/item/{item_id}", response_model=schemas.ReviewRead, status_code=status.HTTP_201_CREATED)
+@rate_limited("create_review")
 async def create_review_for_item(
     item_id: int,
     review_in: ItemReviewCreate = Body(...),
     db: AsyncSession = Depends(get_async_db),
-    current_user: Optional[User] = Depends(get_optional_current_active_user),  # User is now optional
+    current_user: Optional[Principal] = Depends(get_optional_principal),  # User is now optional
 ):
     """
     Create a new review for a specific item.
@@ -164,22 +174,23 @@ async def create_review_for_item(
     except HTTPException as e:
         raise e
     except IntegrityError as e:
-        print(f"Database integrity error while creating review: {e}")  # Log for debugging
+        logger.warning(f"Database integrity error while creating review: {e}")
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This review cannot be created, possibly due to a duplicate entry or data conflict."
         )
     except Exception as e:
-        print(f"Unexpected error creating review: {e}")  # Log for debugging
+        logger.error(f"Unexpected error creating review: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred while creating the review.")
 
 
 @router.post("/{review_id}/vote", response_model=schemas.ReviewRead)
+@rate_limited("vote_review")
 async def vote_on_review(
     review_id: int,
     vote_in: schemas.ReviewUsefulnessVoteCreate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: CurrentUser = Depends(get_current_active_user)
+    current_user: CurrentUser = Depends(get_current_principal)
 ):
     """
     Vote on the usefulness of a review. Requires authentication.
@@ -233,12 +244,7 @@ async def get_all_reviews_admin(
         db=db, filters=filters, sort=sort_by, pagination=pagination
     )
 
-    return PaginatedResponse(
-        total=total,
-        items=reviews,
-        skip=pagination.skip,
-        limit=pagination.limit,
-    )
+    return paginated_response(reviews, total, pagination, schemas.ReviewRead)
 
 
 @admin_router.put("/{review_id}/status", response_model=schemas.ReviewRead)
@@ -246,7 +252,7 @@ async def update_review_status(
     review_id: int = Path(..., description="ID of the review to update"),
     status_update: ReviewAdminUpdatePayload = Body(...),
     db: AsyncSession = Depends(get_async_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: Principal = Depends(get_current_admin_user)
 ):
     """
     Update the status and/or moderator notes of a review.
@@ -1,6 +1,6 @@
 # app/reviews/schemas.py
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List, Any, Literal
+from typing import Optional, List, Any, Literal, Dict
 from datetime import datetime
 from app.models.review import ModerationStatusEnum
 from app.auth.schemas import UserRead # Use UserRead to show author info
@@ -23,6 +23,18 @@ class ReviewAdminUpdatePayload(BaseModel):
     moderation_status: Optional[ModerationStatusEnum] = None
     moderator_notes: Optional[str] = None
 
+# --- Category Rating Schemas ---
+class ReviewCategoryRatingCreate(BaseModel):
+    category_id: int
+    rating: int = Field(..., ge=1, le=5)
+
+class ReviewCategoryRatingRead(BaseModel):
+    category_id: int
+    rating: int
+
+    class Config:
+        from_attributes = True
+
 # Renamed from ExchangeReviewCreate
 class ItemReviewCreate(BaseModel):
     item_id: int # Renamed from exchange_id
@@ -30,6 +42,7 @@ class ItemReviewCreate(BaseModel):
     comment: Optional[str] = Field(None, min_length=3, max_length=5000)
     moderation_status: Optional[ModerationStatusEnum] = Field(None, description="Set to 'pending' by default.")
     guest_name: Optional[str] = Field(None, min_length=1, max_length=100, description="Name of the guest reviewer, if not logged in.")
+    category_ratings: List[ReviewCategoryRatingCreate] = Field([], description="Optional ratings per rating category (one per category).")
 
 # --- Screenshot Schemas ---
 class ReviewScreenshotRead(BaseModel):
@@ -66,7 +79,19 @@ class ReviewRead(ReviewBase):
     user: Optional[UserRead] = None # Show public user info, now optional
     item: Optional[ItemReadBrief] = None # Show brief item info (polymorphic)
     screenshots: List[ReviewScreenshotRead] = []
+    category_ratings: List[ReviewCategoryRatingRead] = []
     # tags: List[TagRead] = [] # Add tag schema if implemented
 
     class Config:
         from_attributes = True
+
+# --- Facets ---
+class ItemReviewFacetsRead(BaseModel):
+    """Counts of an item's approved reviews, for showing next to the review filters."""
+    item_id: int
+    total_count: int = 0
+    rating_counts: Dict[int, int] = Field(default_factory=lambda: {rating: 0 for rating in range(5, 0, -1)}, description="Approved reviews per rating, 5 to 1")
+    with_comment_count: int = 0
+    without_comment_count: int = 0
+    with_screenshot_count: int = 0
+    without_screenshot_count: int = 0
@@ -1,17 +1,32 @@
 # app/reviews/service.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc, asc, and_, distinct, func, select, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, desc, asc, and_, exists, cast, Numeric, bindparam, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 import datetime
 import logging # Import logging
 
-from app.reviews.schemas import ReviewFilterParams, ReviewSortBy, ItemReviewCreate, ReviewAdminUpdatePayload
-from app.schemas.common import PaginationParams
-from app.models.review import ModerationStatusEnum, Review, ReviewScreenshot, ReviewUsefulnessVote
+from app.reviews.schemas import (
+    ReviewFilterParams, ReviewSortBy, ItemReviewCreate, ReviewAdminUpdatePayload, ReviewRead, ReviewScreenshotRead,
+    ItemReviewFacetsRead, ReviewCategoryRatingRead,
+)
+from app.auth.schemas import UserRead
+from app.schemas.common import PaginationParams, ItemReadBrief
+from app.models.review import (
+    ModerationStatusEnum, Review, ReviewScreenshot, ReviewUsefulnessVote, ReviewRating, ItemCategoryRating, ItemReviewFacets
+)
+from app.models.common import RatingCategory
 from app.models.item import Item # Import Item model
+from app.models.user import User
+from app.utils.sql import INT2_LIMITS, inline_literal, range_condition, range_params, schema_columns, OptionalBundle
+from app.reviews.ranking import prior_mean_rating, refresh_item_ranking_score
+from app.reviews.spam import review_spam_filter
+from app.core.work_queue import work_queue
+from app.core.statement_cache import StatementShapes
 
 # Get logger and configure it properly
 logger = logging.getLogger(__name__)
@@ -23,53 +38,189 @@ if not logger.handlers:
     logger.addHandler(handler)
     logger.setLevel(logging.INFO)
 
+# Counter columns of ItemReviewFacets, in the order of the rebuild aggregate
+FACET_COUNTERS = [
+    'total_count', 'rating_1_count', 'rating_2_count', 'rating_3_count', 'rating_4_count',
+    'rating_5_count', 'with_comment_count', 'with_screenshot_count',
+]
+
+# Work queue task refreshing an item's review aggregates (subject_id = item id)
+REFRESH_ITEM_AGGREGATES_TASK = "refresh_item_aggregates"
+
 class ReviewService:
 
-    async def _update_item_review_stats(self, db: AsyncSession, item_id: int):
+    # --- Item review aggregates (items counters, item_review_facets, item_category_ratings, ranking_score) ---
+    # Each _rebuild_* recomputes from the reviews table, for all items or only item_ids, without committing,
+    # so a rebuild is idempotent and safe to retry from the work queue.
+
+    async def _rebuild_item_review_stats(self, db: AsyncSession, item_ids: Optional[List[int]] = None) -> int:
         """
-        Recalculates and updates the total_review_count and overall_average_rating
-        for a given item based on its approved reviews.
-        total_review_count only includes reviews with non-null comments.
-        total_rating_count includes all reviews (with or without comments).
+        Recalculates total_review_count (approved reviews with a comment), total_rating_count
+        (all approved reviews) and overall_average_rating in one set-based UPDATE.
+        Only rows whose stats actually drifted are written. Returns the number of updated items.
         """
-        logger.info(f"Updating review stats for item_id: {item_id}")
-        # Query to get count of approved reviews with comments and average rating of all approved reviews
+        items_table = Item.__table__
+        approved = Review.moderation_status == ModerationStatusEnum.approved
+        stats = (
+            select(
+                items_table.c.id.label("item_id"),
+                func.count(Review.id).filter(and_(approved, Review.comment.is_not(None))).label("review_count"),
+                func.count(Review.id).filter(approved).label("rating_count"),
+                func.coalesce(func.avg(Review.rating).filter(approved), 0).label("average_rating"),
+            )
+            .select_from(items_table.outerjoin(Review.__table__, Review.item_id == items_table.c.id))
+            .group_by(items_table.c.id)
+        )
+        if item_ids is not None:
+            stats = stats.where(items_table.c.id.in_(item_ids))
+        stats = stats.subquery()
         stmt = (
+            items_table.update()
+            .values(
+                total_review_count=stats.c.review_count,
+                total_rating_count=stats.c.rating_count,
+                overall_average_rating=func.round(stats.c.average_rating, 2),
+            )
+            .where(items_table.c.id == stats.c.item_id)
+            .where(
+                (items_table.c.total_review_count.is_distinct_from(stats.c.review_count))
+                | (items_table.c.total_rating_count.is_distinct_from(stats.c.rating_count))
+                | (items_table.c.overall_average_rating.is_distinct_from(func.round(stats.c.average_rating, 2)))
+            )
+        )
+        result = await db.execute(stmt)
+        return result.rowcount
+
+    async def _rebuild_item_review_facets(self, db: AsyncSession, item_ids: Optional[List[int]] = None) -> int:
+        """Rebuilds facet counters from the reviews table. Returns the number of items with facets written."""
+        facets = ItemReviewFacets.__table__
+        approved = Review.moderation_status == ModerationStatusEnum.approved
+        has_screenshot = Review.screenshots.any()
+        aggregate = (
             select(
-                func.count(Review.id).filter(Review.comment.is_not(None)).label("approved_count_with_comments"),
-                func.count(Review.id).label("total_approved_count"),
-                func.avg(Review.rating).label("average_rating")
+                Review.item_id,
+                func.count(),
+                *(func.count().filter(Review.rating == rating) for rating in range(1, 6)),
+                func.count().filter(Review.comment.is_not(None)),
+                func.count().filter(has_screenshot),
             )
-            .where(Review.item_id == item_id)
-            .where(Review.moderation_status == ModerationStatusEnum.approved)
+            .where(approved)
+            .group_by(Review.item_id)
+        )
+        stale = facets.delete().where(~exists().where(Review.item_id == facets.c.item_id, approved))
+        if item_ids is not None:
+            aggregate = aggregate.where(Review.item_id.in_(item_ids))
+            stale = stale.where(facets.c.item_id.in_(item_ids))
+
+        stmt = pg_insert(facets).from_select(['item_id', *FACET_COUNTERS], aggregate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[facets.c.item_id],
+            set_={**{name: stmt.excluded[name] for name in FACET_COUNTERS}, 'updated_at': func.now()},
         )
         result = await db.execute(stmt)
-        stats = result.first() # Use first() as it returns one row or None
-
-        approved_count_with_comments = stats.approved_count_with_comments if stats else 0
-        total_approved_count = stats.total_approved_count if stats else 0
-        average_rating = stats.average_rating if stats and stats.average_rating is not None else 0.0
-
-        # Fetch the item
-        item = await db.get(Item, item_id)
-        if item:
-            logger.info(f"Updating item {item_id}: count_with_comments={approved_count_with_comments}, total_count={total_approved_count}, avg_rating={average_rating:.2f}")
-            item.total_review_count = approved_count_with_comments
-            item.total_rating_count = total_approved_count
-            # Ensure rating is stored appropriately (e.g., as float or decimal)
-            item.overall_average_rating = float(average_rating)
-            db.add(item) # Add item to session to ensure update is tracked
-            
-            # Add an explicit commit to persist the changes to the database
-            try:
-                await db.commit()
-                logger.info(f"Successfully committed updated stats for item {item_id}")
-            except Exception as e:
-                await db.rollback()
-                logger.error(f"Failed to commit item stats update: {e}", exc_info=True)
-                raise
-        else:
-            logger.warning(f"Item with id {item_id} not found while trying to update review stats.")
+        # Items whose last approved review went away
+        await db.execute(stale)
+        return result.rowcount
+
+    async def _rebuild_item_category_ratings(self, db: AsyncSession, item_ids: Optional[List[int]] = None) -> int:
+        """Rebuilds per-category aggregates from review_ratings. Returns the number of item/category rows written."""
+        aggregates = ItemCategoryRating.__table__
+        approved = Review.moderation_status == ModerationStatusEnum.approved
+        rating_sum = func.sum(ReviewRating.rating)
+        rating_count = func.count()
+        aggregate = (
+            select(
+                Review.item_id,
+                ReviewRating.category_id,
+                rating_sum,
+                rating_count,
+                func.round(cast(rating_sum, Numeric) / rating_count, 2),
+            )
+            .join(Review, Review.id == ReviewRating.review_id)
+            .where(approved)
+            .group_by(Review.item_id, ReviewRating.category_id)
+        )
+        # Pairs without approved ratings left
+        stale = aggregates.delete().where(
+            ~exists().where(
+                ReviewRating.category_id == aggregates.c.category_id,
+                Review.id == ReviewRating.review_id,
+                Review.item_id == aggregates.c.item_id,
+                approved,
+            )
+        )
+        if item_ids is not None:
+            aggregate = aggregate.where(Review.item_id.in_(item_ids))
+            stale = stale.where(aggregates.c.item_id.in_(item_ids))
+
+        stmt = pg_insert(aggregates).from_select(
+            ['item_id', 'category_id', 'rating_sum', 'rating_count', 'average_rating'], aggregate
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[aggregates.c.item_id, aggregates.c.category_id],
+            set_={
+                'rating_sum': stmt.excluded.rating_sum,
+                'rating_count': stmt.excluded.rating_count,
+                'average_rating': stmt.excluded.average_rating,
+                'updated_at': func.now(),
+            },
+        )
+        result = await db.execute(stmt)
+        await db.execute(stale)
+        return result.rowcount
+
+    async def recompute_all_item_review_stats(self, db: AsyncSession) -> int:
+        """Reconciles review statistics of every item. Returns the number of updated items."""
+        updated = await self._rebuild_item_review_stats(db)
+        await db.commit()
+        logger.info(f"Recomputed review stats, {updated} items updated")
+        return updated
+
+    async def recompute_all_item_review_facets(self, db: AsyncSession) -> int:
+        """Rebuilds the facet counters of every item. Returns the number of items with facets."""
+        written = await self._rebuild_item_review_facets(db)
+        await db.commit()
+        logger.info(f"Recomputed review facets for {written} items")
+        return written
+
+    async def recompute_all_item_category_ratings(self, db: AsyncSession) -> int:
+        """Rebuilds every item's per-category aggregates. Returns the number of rows written."""
+        written = await self._rebuild_item_category_ratings(db)
+        await db.commit()
+        logger.info(f"Recomputed category ratings, {written} item/category rows written")
+        return written
+
+    async def refresh_item_aggregates(self, db: AsyncSession, item_ids: List[int]) -> None:
+        """
+        Work queue handler (REFRESH_ITEM_AGGREGATES_TASK): brings the review aggregates of the
+        given items up to date. Runs in the queue's transaction; not committed here.
+        """
+        # Lock the items in id order so concurrent refreshes of the same item serialize instead of deadlocking
+        await db.execute(select(Item.id).where(Item.id.in_(item_ids)).order_by(Item.id).with_for_update())
+        await self._rebuild_item_review_stats(db, item_ids)
+        await self._rebuild_item_review_facets(db, item_ids)
+        await self._rebuild_item_category_ratings(db, item_ids)
+        # The prior mean aggregates all facets: once per batch, after the rebuild above
+        prior_mean = await prior_mean_rating(db)
+        for item_id in item_ids:
+            await refresh_item_ranking_score(db, item_id, prior_mean=prior_mean)
+
+    async def get_item_review_facets(self, db: AsyncSession, item_id: int) -> Optional[ItemReviewFacetsRead]:
+        """Facet counters of one item (a primary key lookup). None if the item does not exist."""
+        facets = await db.get(ItemReviewFacets, item_id)
+        if facets is None:
+            item_exists = await db.scalar(select(Item.id).where(Item.id == item_id))
+            return ItemReviewFacetsRead(item_id=item_id) if item_exists else None
+
+        return ItemReviewFacetsRead(
+            item_id=item_id,
+            total_count=facets.total_count,
+            rating_counts={rating: getattr(facets, f'rating_{rating}_count') for rating in range(5, 0, -1)},
+            with_comment_count=facets.with_comment_count,
+            without_comment_count=facets.total_count - facets.with_comment_count,
+            with_screenshot_count=facets.with_screenshot_count,
+            without_screenshot_count=facets.total_count - facets.with_screenshot_count,
+        )
 
     async def get_review_by_id(self, db: AsyncSession, review_id: int, load_relations: bool = True) -> Optional[Review]:
         """Fetches a single review by ID, optionally loading relationships."""
@@ -79,88 +230,139 @@ class ReviewService:
                 selectinload(Review.user),
                 selectinload(Review.item),
                 selectinload(Review.screenshots),
+                selectinload(Review.category_ratings),
             )
         query = query.filter(Review.id == review_id)
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
-    async def list_reviews(
+    # Built listing statements by shape (see app/core/statement_cache.py)
+    list_shapes = StatementShapes("reviews")
+
+    def build_list_queries(
         self,
-        db: AsyncSession,
         filters: ReviewFilterParams,
         sort: ReviewSortBy,
         pagination: PaginationParams,
-    ) -> Tuple[List[Review], int]:
-        """Lists reviews with filtering, sorting, and pagination."""
-
-        query = select(Review).options(
-            selectinload(Review.user),
-            selectinload(Review.item),
-            selectinload(Review.screenshots),
-        )
-
-        count_query = select(func.count(distinct(Review.id)))
-
-        filter_conditions = []
-        # Apply filter only if moderation_status is not None
-        if filters.moderation_status is not None:
-            filter_conditions.append(Review.moderation_status == filters.moderation_status)
-            count_query = count_query.filter(Review.moderation_status == filters.moderation_status)
-
+    ):
+        """
+        Builds the (page query, count query, parameters) triple for review listings.
+        The page query returns ReviewRead-shaped rows without screenshots.
+        The shapes match the partial indexes on Review (approved feed per item / global).
+        Filter values are bind parameters; each shape is built once per worker (list_shapes).
+        """
+        params = {"page_offset": pagination.skip, "page_limit": pagination.limit}
         if filters.item_id:
-            filter_conditions.append(Review.item_id == filters.item_id)
-            count_query = count_query.filter(Review.item_id == filters.item_id)
+            params["item_id"] = filters.item_id
         if filters.user_id:
-            filter_conditions.append(Review.user_id == filters.user_id)
-            count_query = count_query.filter(Review.user_id == filters.user_id)
-
-        # Add rating filters
-        if filters.min_rating is not None:
-            filter_conditions.append(Review.rating >= filters.min_rating)
-            count_query = count_query.filter(Review.rating >= filters.min_rating)
-        if filters.max_rating is not None:
-            filter_conditions.append(Review.rating <= filters.max_rating)
-            count_query = count_query.filter(Review.rating <= filters.max_rating)
-
-        if filters.has_screenshot is not None:
-            if filters.has_screenshot:
-                # Filter for reviews that HAVE screenshots
-                query = query.join(Review.screenshots) # Use join for existence check
-                count_query = count_query.join(Review.screenshots)
-            else:
-                # Filter for reviews that DO NOT HAVE screenshots
-                query = query.outerjoin(Review.screenshots).filter(ReviewScreenshot.id == None)
-                count_query = count_query.outerjoin(Review.screenshots).filter(ReviewScreenshot.id == None)
+            params["user_id"] = filters.user_id
+        range_params(params, "rating", filters.min_rating, filters.max_rating, limits=INT2_LIMITS)
 
-        if filter_conditions:
-            query = query.filter(and_(*filter_conditions))
-            # Count query already has filters applied individually above
+        # moderation_status is inlined (partial indexes), so its value is part of the shape
+        shape = (frozenset(params), filters.moderation_status, filters.has_screenshot, sort.field, sort.direction)
+        query, count_query = self.list_shapes.get(shape, lambda: self._build_list_statements(*shape))
+        return query, count_query, params
 
-        query = query.distinct() # Keep distinct after joins
+    def _build_list_statements(
+        self,
+        param_names,
+        moderation_status: Optional[ModerationStatusEnum],
+        has_screenshot: Optional[bool],
+        sort_field: str,
+        direction: str,
+    ):
+        filter_conditions = []
+        # Apply filter only if moderation_status is not None
+        if moderation_status is not None:
+            # Inlined so Postgres can match the partial indexes on moderation_status
+            filter_conditions.append(
+                Review.moderation_status == inline_literal(moderation_status, Review.moderation_status.type)
+            )
+        if "item_id" in param_names:
+            filter_conditions.append(Review.item_id == bindparam("item_id"))
+        if "user_id" in param_names:
+            filter_conditions.append(Review.user_id == bindparam("user_id"))
+
+        # Rating filter (one BETWEEN whichever bounds are given)
+        if "min_rating" in param_names:
+            filter_conditions.append(range_condition(Review.rating, "rating"))
+
+        if has_screenshot is not None:
+            # EXISTS keeps one row per review, so no DISTINCT is needed
+            screenshot_exists = Review.screenshots.any()
+            filter_conditions.append(screenshot_exists if has_screenshot else ~screenshot_exists)
+
+        # Review feed: the ReviewRead columns plus exactly the author and item columns it renders,
+        # in one statement (screenshots are fetched separately, see list_reviews)
+        query = (
+            select(
+                *schema_columns(Review, ReviewRead),
+                OptionalBundle('user', User.id, *schema_columns(User, UserRead, exclude={'id'})),
+                OptionalBundle('item', Item.id, *schema_columns(Item, ItemReadBrief, exclude={'id'})),
+            )
+            .outerjoin(User, Review.user_id == User.id)
+            .outerjoin(Item, Review.item_id == Item.id)
+            .where(*filter_conditions)
+        )
 
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
+        count_query = select(func.count()).select_from(Review).where(*filter_conditions)
 
-        if sort.field == 'created_at':
-            order_by_column = Review.created_at
-        elif sort.field == 'usefulness':
-            # Order by the difference between useful and not useful votes
+        if sort_field == 'usefulness':
+            # Order by the difference between useful and not useful votes (expression-indexed)
             order_by_column = (Review.useful_votes_count - Review.not_useful_votes_count)
-        elif sort.field == 'rating': # Add sorting by rating
+        elif sort_field == 'rating': # Add sorting by rating
             order_by_column = Review.rating
         else:
-            # Default or fallback sorting
+            # created_at is the default
             order_by_column = Review.created_at
 
-        if sort.direction == 'desc':
-            query = query.order_by(desc(order_by_column))
-        else:
-            query = query.order_by(asc(order_by_column))
+        order = desc if direction == 'desc' else asc
+        query = query.order_by(order(order_by_column), order(Review.id))
 
-        query = query.offset(pagination.skip).limit(pagination.limit)
+        query = query.offset(bindparam("page_offset", type_=Integer)).limit(bindparam("page_limit", type_=Integer))
+        return query, count_query
 
-        result = await db.execute(query)
-        reviews = result.scalars().unique().all() # Use unique() after scalars()
+    async def list_reviews(
+        self,
+        db: AsyncSession,
+        filters: ReviewFilterParams,
+        sort: ReviewSortBy,
+        pagination: PaginationParams,
+    ) -> Tuple[List[dict], int]:
+        """
+        Lists reviews with filtering, sorting, and pagination.
+        Returns ReviewRead-shaped dicts (not Review entities): one statement for the page
+        and one IN query each for the page's screenshots and category ratings.
+        """
+        query, count_query, params = self.build_list_queries(filters, sort, pagination)
+
+        total_result = await db.execute(count_query, params)
+        total = total_result.scalar_one()
+
+        result = await db.execute(query, params)
+        reviews = [row._asdict() for row in result]
+
+        screenshots = {review["id"]: [] for review in reviews}
+        category_ratings = {review["id"]: [] for review in reviews}
+        if screenshots:
+            review_ids = list(screenshots)
+            screenshot_rows = await db.execute(
+                select(ReviewScreenshot.review_id, *schema_columns(ReviewScreenshot, ReviewScreenshotRead))
+                .where(ReviewScreenshot.review_id.in_(review_ids))
+                .order_by(ReviewScreenshot.id)
+            )
+            for row in screenshot_rows:
+                screenshots[row.review_id].append(row)
+            rating_rows = await db.execute(
+                select(ReviewRating.review_id, *schema_columns(ReviewRating, ReviewCategoryRatingRead))
+                .where(ReviewRating.review_id.in_(review_ids))
+                .order_by(ReviewRating.review_id, ReviewRating.category_id)
+            )
+            for row in rating_rows:
+                category_ratings[row.review_id].append(row)
+        for review in reviews:
+            review["screenshots"] = screenshots[review["id"]]
+            review["category_ratings"] = category_ratings[review["id"]]
 
         return reviews, total # Return tuple directly
 
@@ -170,8 +372,8 @@ class ReviewService:
         review_in: ItemReviewCreate,
         user_id: Optional[int] # Changed to Optional[int]
     ) -> Review:
-        """Creates a new review for an item and updates the item's review statistics."""
-        logger.info(f"Creating review for item_id: {review_in.item_id} by user_id: {user_id}")
+        """Creates a new review for an item. The item's review aggregates are refreshed via the work queue."""
+        logger.debug(f"Creating review for item_id: {review_in.item_id} by user_id: {user_id}")
         item = await db.get(Item, review_in.item_id)
         if not item:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
@@ -194,41 +396,65 @@ class ReviewService:
             )
 
 
+        # Optional per-category ratings: one per category, categories must exist
+        category_ratings = [(rating.category_id, rating.rating) for rating in review_in.category_ratings]
+        category_ids = {category_id for category_id, _ in category_ratings}
+        if len(category_ids) != len(category_ratings):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each rating category can only be rated once per review."
+            )
+        if category_ids:
+            known_ids = set((await db.scalars(select(RatingCategory.id).where(RatingCategory.id.in_(category_ids)))).all())
+            if known_ids != category_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown rating category ids: {sorted(category_ids - known_ids)}"
+                )
+
+        # Near-duplicates of recent reviews are held for moderation, floods are rejected outright
+        moderation_status = review_in.moderation_status
+        moderator_notes = None
+        verdict = review_spam_filter.check(review_in.comment)
+        if verdict:
+            moderation_status, moderator_notes = verdict
+            logger.info(f"Spam filter for item_id {review_in.item_id}: {moderation_status.value} ({moderator_notes})")
+
         db_review = Review(
             comment=review_in.comment,
             rating=review_in.rating, # Store the single rating
             item_id=review_in.item_id,
             user_id=user_id,
             guest_name=review_in.guest_name if not user_id else None,
-            moderation_status=review_in.moderation_status
+            moderation_status=moderation_status,
+            moderator_notes=moderator_notes,
+            category_ratings=[
+                ReviewRating(category_id=category_id, rating=rating) for category_id, rating in category_ratings
+            ],
         )
         db.add(db_review)
+        if db_review.moderation_status == ModerationStatusEnum.approved:
+            # Item stats, facets, category ratings and ranking are refreshed off the request path
+            work_queue.enqueue(db, REFRESH_ITEM_AGGREGATES_TASK, review_in.item_id)
 
         try:
             await db.commit()
-            logger.info(f"Successfully committed review for item_id: {review_in.item_id}")
+            logger.debug(f"Successfully committed review for item_id: {review_in.item_id}")
         except Exception as e:
             await db.rollback()
             logger.error(f"Failed to create review: {e}", exc_info=True)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Could not create review: {e}")
+        work_queue.kick()
+        review_spam_filter.add(db_review.id, db_review.comment, db_review.moderation_status, db_review.created_at)
 
-        # Fetch the created review with relationships loaded
-        created_review = await self.get_review_by_id(db, db_review.id)
-        if not created_review:
-            logger.error(f"Failed to retrieve created review after commit for item_id: {review_in.item_id}")
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve created review after commit")
-        
-        logger.info(f"Created review: {created_review.id} for item_id: {review_in.item_id}")
-        
-        try:
-            logger.info(f"Attempting to update item review stats for item_id: {review_in.item_id}")
-            await self._update_item_review_stats(db, review_in.item_id)
-            logger.info(f"Successfully updated review stats for item_id: {review_in.item_id}")
-        except Exception as e:
-            logger.error(f"Error updating item review stats: {e}", exc_info=True)
-            # Consider whether to re-raise or just log the error
-            
-        return created_review
+        # No re-fetch: the item was loaded above and a new review has no screenshots. The author is
+        # loaded bare (the response only needs its columns), skipping the user's selectin relationships
+        set_committed_value(db_review, 'item', item)
+        set_committed_value(db_review, 'user', await db.get(User, user_id, options=[noload('*')]) if user_id else None)
+        set_committed_value(db_review, 'screenshots', [])
+
+        logger.debug(f"Created review: {db_review.id} for item_id: {review_in.item_id}")
+        return db_review
 
     async def update_review_moderation_details(
         self,
@@ -270,8 +496,7 @@ class ReviewService:
             )
 
             if should_update_stats:
-                # Update item stats before committing
-                await self._update_item_review_stats(db, item_id)
+                work_queue.enqueue(db, REFRESH_ITEM_AGGREGATES_TASK, item_id)
 
             try:
                 await db.commit()
@@ -282,6 +507,8 @@ class ReviewService:
                 await db.rollback()
                 logger.error(f"Failed to update review moderation details for review {review_id}: {e}", exc_info=True)
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update review moderation details.")
+            if should_update_stats:
+                work_queue.kick()
 
             # Fetch the potentially updated review with relations after commit
             updated_review_with_relations = await self.get_review_by_id(db, db_review.id)
@@ -355,4 +582,5 @@ class ReviewService:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve review after voting operation")
         return updated_review
 
-review_service = ReviewService()
\ No newline at end of file
+review_service = ReviewService()
+work_queue.register(REFRESH_ITEM_AGGREGATES_TASK, review_service.refresh_item_aggregates)
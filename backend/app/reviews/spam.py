@@ -0,0 +1,230 @@
+# app/reviews/spam.py
+"""
+Near-duplicate detection for review comments, used to flag copy-paste floods at submission.
+
+Each comment is reduced to a MinHash signature (NUM_PERMUTATIONS minimums over hashed
+character shingles); the fraction of equal positions between two signatures estimates the
+Jaccard similarity of their shingle sets. Signatures are split into LSH bands, and reviews
+sharing any band are candidates, so a lookup touches at most NUM_BANDS * MAX_BUCKET_SIZE
+signatures no matter how many reviews are indexed. Text is truncated to MAX_TEXT_LENGTH, which
+keeps the cost of one check constant.
+
+The index lives in memory on every worker. It is rebuilt from approved and pending reviews by
+the rebuild_spam_index job, and non-rejected submissions handled by this worker are added as they
+happen, so both paths index the same reviews. The flood window is measured on the database clock
+(reviews.created_at is the server's naive LOCALTIMESTAMP): each rebuild records the database's
+offset from utcnow(), so checks need no query.
+"""
+import asyncio
+import datetime
+import logging
+import re
+import zlib
+from collections import OrderedDict, deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.review import ModerationStatusEnum, Review
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 5
+MAX_TEXT_LENGTH = 2000
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+MAX_BUCKET_SIZE = 32  # Newest reviews per band bucket kept as candidates
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240601)  # Fixed seed: signatures are comparable across rebuilds
+_PERM_A = _rng.integers(1, int(_MERSENNE_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)[:, None]
+_PERM_B = _rng.integers(0, int(_MERSENNE_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)[:, None]
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """Lowercases and collapses punctuation/whitespace, so trivial edits don't change the shingles."""
+    return _NON_WORD.sub(" ", text[:MAX_TEXT_LENGTH].lower()).strip()
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of a comment, or None if it is too short to compare."""
+    text = normalize(text)
+    if len(text) < SHINGLE_SIZE:
+        return None
+    hashes = np.fromiter(
+        {zlib.crc32(text[i:i + SHINGLE_SIZE].encode()) for i in range(len(text) - SHINGLE_SIZE + 1)},
+        dtype=np.uint64,
+    )
+    # (a * x + b) mod p stays below 2**63: a, b < 2**31 and crc32 hashes < 2**32
+    return ((_PERM_A * hashes + _PERM_B) % _MERSENNE_PRIME).min(axis=1)
+
+
+def _band_keys(sig: np.ndarray) -> List[Tuple[int, bytes]]:
+    return [(band, sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()) for band in range(NUM_BANDS)]
+
+
+class SimilarReview(NamedTuple):
+    review_id: int
+    similarity: float
+    created_at: datetime.datetime
+
+
+class SpamVerdict(NamedTuple):
+    moderation_status: ModerationStatusEnum
+    note: str
+
+
+class ReviewSimilarityIndex:
+    """LSH index of review signatures, bounded to max_size reviews (oldest evicted first)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, datetime.datetime]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], deque] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, review_id: int, sig: Optional[np.ndarray], created_at: datetime.datetime) -> None:
+        if sig is None or review_id in self._entries:
+            return
+        self._entries[review_id] = (sig, created_at)
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = deque(maxlen=MAX_BUCKET_SIZE)
+            bucket.append(review_id)
+        while len(self._entries) > self.max_size:
+            self._evict_oldest()
+
+    def entries_since(self, since: datetime.datetime) -> List[Tuple[int, np.ndarray, datetime.datetime]]:
+        return [
+            (review_id, sig, created_at)
+            for review_id, (sig, created_at) in self._entries.items()
+            if created_at >= since
+        ]
+
+    def find_similar(self, sig: np.ndarray, threshold: float) -> List[SimilarReview]:
+        """Indexed reviews whose estimated similarity to sig is at least threshold, most similar first."""
+        candidates = set()
+        for key in _band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+        similar = []
+        for review_id in candidates:
+            entry = self._entries.get(review_id)
+            if entry is None:
+                continue
+            similarity = float(np.count_nonzero(entry[0] == sig)) / NUM_PERMUTATIONS
+            if similarity >= threshold:
+                similar.append(SimilarReview(review_id, similarity, entry[1]))
+        similar.sort(key=lambda match: match.similarity, reverse=True)
+        return similar
+
+    def _evict_oldest(self) -> None:
+        review_id, (sig, _) = self._entries.popitem(last=False)
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(review_id)
+            except ValueError:
+                pass  # Already pushed out of the bucket by newer reviews
+            if not bucket:
+                del self._buckets[key]
+
+
+class ReviewSpamFilter:
+
+    def __init__(self):
+        self.index = ReviewSimilarityIndex(settings.SPAM_INDEX_MAX_REVIEWS)
+        self.clock_offset = datetime.timedelta(0)  # Database LOCALTIMESTAMP - utcnow(), measured at each rebuild
+
+    def now(self) -> datetime.datetime:
+        """The current time on the database clock reviews.created_at is written with."""
+        return datetime.datetime.utcnow() + self.clock_offset
+
+    def check(self, comment: Optional[str], now: Optional[datetime.datetime] = None) -> Optional[SpamVerdict]:
+        """
+        Returns a verdict for a new comment that near-duplicates indexed reviews: auto-reject when
+        SPAM_FLOOD_THRESHOLD copies (including this one) arrived within SPAM_FLOOD_WINDOW_SECONDS,
+        otherwise hold for moderation. None if the comment looks original.
+        """
+        if not settings.SPAM_FILTER_ENABLED or not comment:
+            return None
+        sig = signature(comment)
+        if sig is None:
+            return None
+        similar = self.index.find_similar(sig, settings.SPAM_SIMILARITY_THRESHOLD)
+        if not similar:
+            return None
+
+        now = now or self.now()
+        window_start = now - datetime.timedelta(seconds=settings.SPAM_FLOOD_WINDOW_SECONDS)
+        recent = sum(1 for match in similar if match.created_at and match.created_at >= window_start)
+        closest = similar[0]
+        if recent + 1 >= settings.SPAM_FLOOD_THRESHOLD:
+            return SpamVerdict(
+                ModerationStatusEnum.rejected,
+                f"Auto-rejected: {recent + 1} near-duplicate submissions within {settings.SPAM_FLOOD_WINDOW_SECONDS:.0f}s "
+                f"(closest: review #{closest.review_id}, similarity {closest.similarity:.2f})",
+            )
+        return SpamVerdict(
+            ModerationStatusEnum.pending,
+            f"Possible duplicate of review #{closest.review_id} (similarity {closest.similarity:.2f})",
+        )
+
+    def add(
+        self,
+        review_id: int,
+        comment: Optional[str],
+        moderation_status: ModerationStatusEnum,
+        created_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Indexes a just-submitted review, so the next copies are caught before the next rebuild.
+        Rejected reviews are not indexed (as in rebuild), so they do not count towards later floods.
+        """
+        if settings.SPAM_FILTER_ENABLED and comment and moderation_status != ModerationStatusEnum.rejected:
+            self.index.add(review_id, signature(comment), created_at or self.now())
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """Rebuilds the index from the newest approved and pending reviews. Returns the number of indexed reviews."""
+        database_now = await db.scalar(select(func.localtimestamp()))
+        self.clock_offset = database_now - datetime.datetime.utcnow()
+        started_at = database_now
+        rows = (
+            await db.execute(
+                select(Review.id, Review.comment, Review.created_at)
+                .where(
+                    Review.comment.is_not(None),
+                    Review.moderation_status.in_([ModerationStatusEnum.approved, ModerationStatusEnum.pending]),
+                )
+                .order_by(Review.created_at.desc(), Review.id.desc())
+                .limit(settings.SPAM_INDEX_MAX_REVIEWS)
+            )
+        ).all()
+        # Hashing is CPU-bound: build the new index off the event loop, then swap it in
+        index = await asyncio.to_thread(self._build_index, rows)
+        # Keep reviews added on this worker while the rebuild ran (not visible in the query above)
+        for review_id, sig, created_at in self.index.entries_since(started_at):
+            index.add(review_id, sig, created_at)
+        self.index = index
+        logger.info(f"Rebuilt review spam index with {len(index)} reviews")
+        return len(index)
+
+    @staticmethod
+    def _build_index(rows) -> ReviewSimilarityIndex:
+        index = ReviewSimilarityIndex(settings.SPAM_INDEX_MAX_REVIEWS)
+        for review_id, comment, created_at in reversed(rows):  # Oldest first, so eviction order is by age
+            index.add(review_id, signature(comment), created_at)
+        return index
+
+
+review_spam_filter = ReviewSpamFilter()
@@ -1,6 +1,7 @@
 # app/schemas/common.py
 from pydantic import BaseModel, Field
 from typing import List, TypeVar, Generic, Optional
+from decimal import Decimal
 
 T = TypeVar('T')
 
@@ -57,4 +58,12 @@ class RatingCategoryRead(BaseModel):
     description: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ItemCategoryRatingRead(BaseModel):
+    category: RatingCategoryRead
+    average_rating: Optional[Decimal] = Field(None, max_digits=3, decimal_places=2)
+    rating_count: int = 0
+
+    class Config:
+        from_attributes = True
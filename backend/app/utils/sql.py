@@ -0,0 +1,74 @@
+# app/utils/sql.py
+from typing import Any, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, inspect, literal
+from sqlalchemy.engine.row import Row
+from sqlalchemy.orm import Bundle
+from sqlalchemy.types import TypeEngine
+
+
+def inline_literal(value: Any, type_: TypeEngine = None):
+    """
+    A value rendered into the SQL text at execution time instead of as a bind parameter.
+
+    Use it for low-cardinality filter values that partial indexes are defined on
+    (e.g. moderation_status = 'approved', has_kyc). Postgres can only match a partial
+    index predicate against a constant, never against a generic-plan parameter.
+    The statement stays cacheable: SQLAlchemy substitutes the literal after compilation.
+    """
+    return literal(value, type_=type_, literal_execute=True)
+
+
+INT2_LIMITS = (-2 ** 15, 2 ** 15 - 1)
+INT4_LIMITS = (-2 ** 31, 2 ** 31 - 1)
+
+
+def range_params(params: dict, name: str, low: Optional[int], high: Optional[int], limits=INT4_LIMITS) -> None:
+    """
+    Adds the min_<name> / max_<name> parameters of an optional integer range filter (see range_condition)
+    when either bound is set. The open end takes the column type's limit, so every combination of
+    bounds runs the same statement shape.
+    """
+    if low is None and high is None:
+        return
+    params[f"min_{name}"] = limits[0] if low is None else low
+    params[f"max_{name}"] = limits[1] if high is None else high
+
+
+def range_condition(column, name: str):
+    """`column BETWEEN :min_<name> AND :max_<name>`, for the parameters added by range_params."""
+    return column.between(bindparam(f"min_{name}"), bindparam(f"max_{name}"))
+
+
+def schema_columns(entity, schema: Type[BaseModel], exclude: Iterable[str] = ()) -> List:
+    """
+    The entity's mapped column attributes named like the schema's fields, for column-projected
+    list queries (select(*schema_columns(...)) returns rows keyed by field name instead of entities).
+    Schema fields that are not plain columns (relationships, computed values) are skipped.
+    """
+    column_keys = inspect(entity).mapper.column_attrs.keys()
+    exclude = set(exclude)
+    return [
+        getattr(entity, name)
+        for name in schema.model_fields
+        if name in column_keys and name not in exclude
+    ]
+
+
+class OptionalBundle(Bundle):
+    """
+    A Bundle for outer-joined many-to-one data (e.g. registration_country): yields None
+    instead of a row of NULLs when nothing matched. The first column must be non-nullable (the PK).
+    """
+
+    def create_row_processor(self, query, procs, labels):
+        make_row = super().create_row_processor(query, procs, labels)
+        first = procs[0]
+
+        def proc(row: Row):
+            if first(row) is None:
+                return None
+            return make_row(row)
+
+        return proc
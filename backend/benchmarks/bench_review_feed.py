@@ -0,0 +1,108 @@
+"""
+Benchmark: review feed query (ReviewService.list_reviews) vs. the previous entity load
+(select(Review) + selectinload of user, item and screenshots) at 100 reviews per page.
+
+Usage (from backend/): python benchmarks/bench_review_feed.py [--rounds 50] [--item-id ID]
+Runs read-only against DATABASE_URL; without --item-id the item with the most approved
+reviews is used. Reports wall time per page, statements per page and rows fetched.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Ensure app modules are importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func, select, desc
+from sqlalchemy.orm import selectinload
+
+from app.core.database import engine, AsyncSessionFactory
+from app.models.review import ModerationStatusEnum, Review
+from app.reviews.schemas import ReviewFilterParams, ReviewSortBy
+from app.reviews.service import review_service
+from app.schemas.common import PaginationParams
+
+PAGE_SIZE = 100
+
+
+async def entity_page(db, item_id: int):
+    """The list query as it was before the feed projection."""
+    query = (
+        select(Review)
+        .options(selectinload(Review.user), selectinload(Review.item), selectinload(Review.screenshots))
+        .where(Review.moderation_status == ModerationStatusEnum.approved, Review.item_id == item_id)
+        .order_by(desc(Review.created_at))
+        .limit(PAGE_SIZE)
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def feed_page(db, item_id: int):
+    reviews, _ = await review_service.list_reviews(
+        db,
+        ReviewFilterParams(moderation_status=ModerationStatusEnum.approved, item_id=item_id),
+        ReviewSortBy(),
+        PaginationParams(skip=0, limit=PAGE_SIZE),
+    )
+    return reviews
+
+
+async def measure(label, page, item_id, rounds, counters):
+    durations = []
+    for _ in range(rounds):
+        # A fresh session per page, as in a request (no identity map carried over)
+        async with AsyncSessionFactory() as db:
+            counters["statements"] = 0
+            started = time.perf_counter()
+            items = await page(db, item_id)
+            durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    print(
+        f"{label:<10} reviews={len(items):<4} statements={counters['statements']:<3} "
+        f"p50={durations[len(durations) // 2]:.2f}ms p95={durations[int(len(durations) * 0.95) - 1]:.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--item-id", type=int, default=None)
+    args = parser.parse_args()
+
+    counters = {"statements": 0}
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counters["statements"] += 1
+
+    item_id = args.item_id
+    if item_id is None:
+        async with AsyncSessionFactory() as db:
+            result = await db.execute(
+                select(Review.item_id)
+                .where(Review.moderation_status == ModerationStatusEnum.approved)
+                .group_by(Review.item_id)
+                .order_by(desc(func.count()))
+                .limit(1)
+            )
+            item_id = result.scalar_one_or_none()
+    if item_id is None:
+        print("No approved reviews found; seed data first (e.g. generate fixtures).")
+        return
+
+    print(f"item_id={item_id}, page size {PAGE_SIZE}, {args.rounds} rounds")
+    # Warm-up: connection pool, statement caches
+    async with AsyncSessionFactory() as db:
+        await entity_page(db, item_id)
+        await feed_page(db, item_id)
+
+    await measure("entities", entity_page, item_id, args.rounds, counters)
+    await measure("feed", feed_page, item_id, args.rounds, counters)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
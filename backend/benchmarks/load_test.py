@@ -0,0 +1,266 @@
+"""
+Load test: throughput and latency percentiles of the hot endpoints, recorded to a JSON baseline
+so runs can be diffed between commits.
+
+    # 1. Seed an empty local database with the synthetic dataset (app/fixtures.py)
+    python benchmarks/load_test.py seed --scale medium
+
+    # 2. Start the API against it, without rate limits (they would turn the test into 429s)
+    RATE_LIMIT_ENABLED=false uvicorn app.main:app --port 8300 --workers 4
+
+    # 3. Run the scenarios and save the results; later compare two runs
+    python benchmarks/load_test.py run --scale medium --output baseline.json
+    python benchmarks/load_test.py compare baseline.json current.json
+
+Each scenario runs for --duration seconds with --concurrency closed-loop clients (a client
+sends its next request when the previous one completed), so latency is measured at the
+throughput the server sustains. Requests pick their targets deterministically from --seed:
+popular items (low slugs/ids) are requested more often, like in production.
+
+Usage (from backend/): python benchmarks/load_test.py {seed,run,compare} --help
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# Ensure app modules are importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.fixtures import LOAD_TEST_PASSWORD, SCALES, FixtureScale
+
+API = "/api/v1"
+LOGGED_IN_USERS = 50  # Users logged in up front for the authenticated scenarios
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def popular(rng: random.Random, population: int) -> int:
+    """1-based id skewed towards low ids."""
+    return 1 + int(population * rng.random() ** 3)
+
+
+# --- Scenarios ---
+# Each returns (method, url, kwargs) for one request
+
+class Scenarios:
+
+    def __init__(self, scale: FixtureScale, tokens: List[str], review_ids: List[int]):
+        self.scale = scale
+        self.tokens = tokens
+        self.review_ids = review_ids
+
+    def list_exchanges(self, rng: random.Random):
+        sort = rng.choice(["ranking_score", "overall_average_rating", "total_review_count", "trading_volume_24h"])
+        return "GET", f"{API}/exchanges/", {"params": {"field": sort, "skip": 20 * rng.randrange(5), "limit": 20}}
+
+    def exchange_detail(self, rng: random.Random):
+        return "GET", f"{API}/exchanges/exchange-{popular(rng, self.scale.exchanges)}", {}
+
+    def item_reviews(self, rng: random.Random):
+        item_id = popular(rng, self.scale.exchanges + self.scale.books)
+        return "GET", f"{API}/reviews/item/{item_id}", {"params": {"skip": 0, "limit": 20}}
+
+    def vote_review(self, rng: random.Random):
+        token = rng.choice(self.tokens)
+        return "POST", f"{API}/reviews/{rng.choice(self.review_ids)}/vote", {
+            "json": {"is_useful": rng.random() < 0.75},
+            "headers": {"Authorization": f"Bearer {token}"},
+        }
+
+    def login(self, rng: random.Random):
+        user = rng.randint(1, self.scale.users)
+        return "POST", f"{API}/auth/login", {
+            "json": {"email": f"load-test-user-{user}@example.com", "password": LOAD_TEST_PASSWORD},
+        }
+
+    def go_redirect(self, rng: random.Random):
+        return "GET", f"{API}/exchanges/go/exchange-{popular(rng, self.scale.exchanges)}", {}
+
+    NAMES = ("list_exchanges", "exchange_detail", "item_reviews", "vote_review", "login", "go_redirect")
+
+
+async def prepare(client: httpx.AsyncClient, scale: FixtureScale) -> Scenarios:
+    """Logs in the voting users and collects approved review ids to vote on."""
+    tokens = []
+    for user in range(1, min(LOGGED_IN_USERS, scale.users) + 1):
+        response = await client.post(f"{API}/auth/login", json={
+            "email": f"load-test-user-{user}@example.com", "password": LOAD_TEST_PASSWORD,
+        })
+        if response.status_code == 429:
+            sys.exit("Login was rate limited: start the API with RATE_LIMIT_ENABLED=false.")
+        if response.status_code != 200:
+            sys.exit(f"Login of load-test-user-{user} failed ({response.status_code}): was the database seeded with this scale?")
+        tokens.append(response.json()["access_token"])
+
+    review_ids = []
+    for item_id in range(1, 21):
+        response = await client.get(f"{API}/reviews/item/{item_id}", params={"limit": 50})
+        review_ids.extend(review["id"] for review in response.json().get("items", []))
+    if not review_ids:
+        sys.exit("No approved reviews found: was the database seeded?")
+    return Scenarios(scale, tokens, review_ids)
+
+
+async def run_scenario(client: httpx.AsyncClient, build: Callable, duration: float, concurrency: int, seed: int) -> dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            method, url, kwargs = build(rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not (isinstance(status, int) and status < 400):
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> None:
+    scale = SCALES[args.scale]
+    names = args.scenarios or list(Scenarios.NAMES)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30, follow_redirects=False) as client:
+        scenarios = await prepare(client, scale)
+        results = {}
+        print(f"{'scenario':<16} {'requests':>9} {'errors':>7} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name in names:
+            await run_scenario(client, getattr(scenarios, name), min(2.0, args.duration), args.concurrency, args.seed)  # Warm-up
+            result = results[name] = await run_scenario(client, getattr(scenarios, name), args.duration, args.concurrency, args.seed)
+            print(
+                f"{name:<16} {result['requests']:>9} {sum(result['errors'].values()):>7} {result['rps']:>8.1f} "
+                f"{result['p50_ms']:>8.1f} {result['p90_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['max_ms']:>8.1f}"
+            )
+
+    baseline = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "base_url": args.base_url,
+            "scale": args.scale,
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+def compare(args) -> None:
+    with open(args.baseline) as f:
+        old = json.load(f)
+    with open(args.current) as f:
+        new = json.load(f)
+    print(f"baseline {old['meta'].get('commit')} ({old['meta'].get('scale')}) -> current {new['meta'].get('commit')} ({new['meta'].get('scale')})")
+    print(f"{'scenario':<16} {'rps':>18} {'p50 ms':>20} {'p99 ms':>20}")
+
+    def change(before: float, after: float) -> float:
+        return (after - before) / before if before else 0.0
+
+    regressions = []
+    for name, current in new["scenarios"].items():
+        previous = old["scenarios"].get(name)
+        if previous is None:
+            print(f"{name:<16} (new scenario)")
+            continue
+        rps, p50, p99 = (change(previous[key], current[key]) for key in ("rps", "p50_ms", "p99_ms"))
+        print(
+            f"{name:<16} {previous['rps']:>7.1f} -> {current['rps']:>7.1f} "
+            f"{previous['p50_ms']:>8.1f} -> {current['p50_ms']:>7.1f} {previous['p99_ms']:>8.1f} -> {current['p99_ms']:>7.1f}"
+            f"  ({rps:+.0%} rps, {p99:+.0%} p99)"
+        )
+        if rps < -args.tolerance or p99 > args.tolerance:
+            regressions.append(name)
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+async def seed(args) -> None:
+    import logging
+
+    from app.core.database import engine
+    from app.fixtures import FixtureGenerator
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    started = time.perf_counter()
+    await FixtureGenerator(engine, SCALES[args.scale], seed=args.seed).generate()
+    await engine.dispose()
+    print(f"Seeded '{args.scale}' dataset in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Generate the synthetic dataset into DATABASE_URL (must be empty)")
+    seed_parser.add_argument("--scale", choices=SCALES, default="small")
+    seed_parser.add_argument("--seed", type=int, default=1)
+
+    run_parser = commands.add_parser("run", help="Drive the scenarios against a running API")
+    run_parser.add_argument("--base-url", default="http://localhost:8300")
+    run_parser.add_argument("--scale", choices=SCALES, default="small", help="Scale the database was seeded with")
+    run_parser.add_argument("--duration", type=float, default=20, help="Seconds per scenario")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--scenarios", nargs="+", choices=Scenarios.NAMES)
+    run_parser.add_argument("--output", help="JSON file to write the results to")
+
+    compare_parser = commands.add_parser("compare", help="Diff two result files; exits 1 on regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed rps drop / p99 increase (fraction)")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        asyncio.run(seed(args))
+    elif args.command == "run":
+        asyncio.run(run(args))
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""baseline: schema as created by Base.metadata.create_all
+
+Existing databases were created with create_all before migrations were introduced.
+Stamp them with this revision (alembic stamp 0001) and upgrade from there.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,59 @@
+"""listing indexes: composite sort indexes, partial indexes for approved reviews
+
+Built with CREATE INDEX CONCURRENTLY so the tables stay writable during the build.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+APPROVED = sa.text("moderation_status = 'approved'")
+USEFULNESS = sa.text("(useful_votes_count - not_useful_votes_count)")
+
+# (name, table, columns, where)
+NEW_INDEXES = [
+    ('ix_items_rating_id', 'items', ['overall_average_rating', 'id'], None),
+    ('ix_items_review_count_id', 'items', ['total_review_count', 'id'], None),
+    ('ix_items_rating_count_id', 'items', ['total_rating_count', 'id'], None),
+    ('ix_exchanges_volume_id', 'exchanges', ['trading_volume_24h', 'id'], None),
+    ('ix_exchanges_kyc_volume', 'exchanges', ['trading_volume_24h', 'id'], sa.text('has_kyc')),
+    ('ix_exchanges_p2p_volume', 'exchanges', ['trading_volume_24h', 'id'], sa.text('has_p2p')),
+    ('ix_reviews_user_created', 'reviews', ['user_id', 'created_at', 'id'], None),
+    ('ix_reviews_approved_item_created', 'reviews', ['item_id', 'created_at', 'id'], APPROVED),
+    ('ix_reviews_approved_item_usefulness', 'reviews', ['item_id', USEFULNESS, 'id'], APPROVED),
+    ('ix_reviews_approved_item_rating', 'reviews', ['item_id', 'rating', 'id'], APPROVED),
+    ('ix_reviews_approved_created', 'reviews', ['created_at', 'id'], APPROVED),
+    ('ix_reviews_approved_usefulness', 'reviews', [USEFULNESS, 'id'], APPROVED),
+    ('ix_reviews_pending_created', 'reviews', ['created_at', 'id'], sa.text("moderation_status = 'pending'")),
+]
+
+# Single-column indexes made redundant by the composites above: (name, table, column)
+REPLACED_INDEXES = [
+    ('ix_items_overall_average_rating', 'items', 'overall_average_rating'),
+    ('ix_items_total_review_count', 'items', 'total_review_count'),
+    ('ix_items_total_rating_count', 'items', 'total_rating_count'),
+    ('ix_exchanges_trading_volume_24h', 'exchanges', 'trading_volume_24h'),
+    ('ix_reviews_user_id', 'reviews', 'user_id'),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, where in NEW_INDEXES:
+        create_index_concurrently(name, table, columns, where=where)
+    for name, table, _ in REPLACED_INDEXES:
+        drop_index_concurrently(name, table)
+
+
+def downgrade() -> None:
+    for name, table, column in REPLACED_INDEXES:
+        create_index_concurrently(name, table, [column])
+    for name, table, _, _ in reversed(NEW_INDEXES):
+        drop_index_concurrently(name, table)
@@ -0,0 +1,60 @@
+"""item_review_facets: precomputed review counts per item for the review filters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'item_review_facets',
+        sa.Column('item_id', sa.Integer(), sa.ForeignKey('items.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_1_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_2_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_3_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_4_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_5_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('with_comment_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('with_screenshot_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    # Screenshots are looked up by review (facets, review feed)
+    create_index_concurrently('ix_review_screenshots_review_id', 'review_screenshots', ['review_id'])
+
+    # Initial fill; afterwards the facets are rebuilt per item by the REFRESH_ITEM_AGGREGATES
+    # work queue task (app/reviews/service.py)
+    op.execute("""
+        INSERT INTO item_review_facets (
+            item_id, total_count, rating_1_count, rating_2_count, rating_3_count,
+            rating_4_count, rating_5_count, with_comment_count, with_screenshot_count
+        )
+        SELECT
+            r.item_id,
+            count(*),
+            count(*) FILTER (WHERE r.rating = 1),
+            count(*) FILTER (WHERE r.rating = 2),
+            count(*) FILTER (WHERE r.rating = 3),
+            count(*) FILTER (WHERE r.rating = 4),
+            count(*) FILTER (WHERE r.rating = 5),
+            count(*) FILTER (WHERE r.comment IS NOT NULL),
+            count(*) FILTER (WHERE EXISTS (SELECT 1 FROM review_screenshots s WHERE s.review_id = r.id))
+        FROM reviews r
+        WHERE r.moderation_status = 'approved'
+        GROUP BY r.item_id
+    """)
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_review_screenshots_review_id', 'review_screenshots')
+    op.drop_table('item_review_facets')
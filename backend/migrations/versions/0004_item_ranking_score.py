@@ -0,0 +1,29 @@
+"""items.ranking_score: stored Bayesian / time-decayed ranking score
+
+The column is filled by the refresh_ranking_scores job (runs at startup).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently, set_lock_timeout
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant server default makes this a metadata-only change (no table rewrite)
+    set_lock_timeout()
+    op.add_column('items', sa.Column('ranking_score', sa.Float(), nullable=False, server_default='0'))
+    create_index_concurrently('ix_items_ranking_score_id', 'items', ['ranking_score', 'id'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_items_ranking_score_id', 'items')
+    op.drop_column('items', 'ranking_score')
@@ -0,0 +1,54 @@
+"""per-category review ratings: rating_categories, review_ratings, item_category_ratings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # May already exist where scripts/init_review_categories.py was run against a hand-made table
+    context = op.get_context()
+    if context.as_sql or not sa.inspect(op.get_bind()).has_table('rating_categories'):
+        op.create_table(
+            'rating_categories',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(100), nullable=False, unique=True),
+            sa.Column('description', sa.Text(), nullable=True),
+        )
+
+    op.create_table(
+        'review_ratings',
+        sa.Column('review_id', sa.Integer(), sa.ForeignKey('reviews.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('category_id', sa.Integer(), sa.ForeignKey('rating_categories.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('rating', sa.SmallInteger(), nullable=False),
+        sa.CheckConstraint('rating BETWEEN 1 AND 5', name='cc_review_rating_range'),
+    )
+    op.create_table(
+        'item_category_ratings',
+        sa.Column('item_id', sa.Integer(), sa.ForeignKey('items.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('category_id', sa.Integer(), sa.ForeignKey('rating_categories.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('average_rating', sa.Numeric(3, 2), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    # New, empty tables: a plain CREATE INDEX is fine here
+    op.create_index(
+        'ix_item_category_ratings_category_avg', 'item_category_ratings',
+        ['category_id', 'average_rating', 'item_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_item_category_ratings_category_avg', table_name='item_category_ratings')
+    op.drop_table('item_category_ratings')
+    op.drop_table('review_ratings')
+    op.drop_table('rating_categories')
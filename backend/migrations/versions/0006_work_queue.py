@@ -0,0 +1,32 @@
+"""work_queue: durable queue for post-processing moved off the request path
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'work_queue',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('task', sa.String(50), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('enqueued_at', sa.DateTime(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_work_queue_available', 'work_queue', ['available_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_work_queue_available', table_name='work_queue')
+    op.drop_table('work_queue')
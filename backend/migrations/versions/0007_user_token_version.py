@@ -0,0 +1,28 @@
+"""users.token_version: revocation of stateless access tokens
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently, set_lock_timeout
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant server default makes this a metadata-only change (no table rewrite)
+    set_lock_timeout()
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+    # Workers poll recently updated users to pick up token version bumps
+    create_index_concurrently('ix_users_updated_at', 'users', ['updated_at'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_users_updated_at', 'users')
+    op.drop_column('users', 'token_version')
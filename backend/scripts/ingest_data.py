@@ -11,12 +11,13 @@ import os
 # Ensure app modules are importable
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core.config import settings
 from app.core.database import AsyncSessionFactory, init_db
 from app.models.exchange import Exchange
 from app.models.common import Country
 
 COINGECKO_URL = "https://api.coingecko.com/api/v3/exchanges"
-HEADERS = {"accept": "application/json", "x-cg-api-key": "CG-FG5pGMB4HyncXHpq8YzvJ4Eg"}
+HEADERS = {"accept": "application/json", "x-cg-api-key": settings.COINGECKO_API_KEY}
 
 def fetch_exchanges():
     params = {
@@ -0,0 +1,136 @@
+# tests/conftest.py
+"""
+Tests that need a database run against TEST_DATABASE_URL, a PostgreSQL database (asyncpg URL)
+whose public schema is dropped and recreated at the start of the session:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost/crypta_test pytest
+
+They are skipped when it is not set or the server cannot be reached. The schema is created the
+way an empty production database gets it (upgrade_database), seeded once with the fixture
+generator (app/fixtures.py) at TEST_SCALE and analyzed, so planner statistics are realistic.
+
+Query budgets are enforced in every test (app/core/query_budget_plugin.py).
+"""
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+# The app's own engine (get_engine) must only ever reach the test database
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql+asyncpg://localhost/crypta_test"
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.exc import DBAPIError  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.core.database import AsyncSessionFactory, get_engine  # noqa: E402
+from app.core.migrations import upgrade_database  # noqa: E402
+from app.fixtures import FixtureGenerator, FixtureScale  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.common import Country, FiatCurrency, Language  # noqa: E402
+from app.models.exchange import Exchange, news_item_exchanges_table  # noqa: E402
+from app.models.guide import GuideItem  # noqa: E402
+from app.models.review import ModerationStatusEnum, Review  # noqa: E402
+
+pytest_plugins = ["app.core.query_budget_plugin"]
+
+# Large enough that the planner prefers the listing indexes over scanning and sorting
+TEST_SCALE = FixtureScale(exchanges=2000, books=2000, users=500, reviews=40000, votes=5000, news=200)
+# Approved reviews of the exchange the tests list reviews of: a few pages, not one of the few items
+# holding a large share of all reviews (for those, the global review indexes are the better plan)
+ITEM_REVIEWS = 100
+GUIDES = 50
+
+
+@dataclass(frozen=True)
+class SeededDatabase:
+    url: str
+    exchange_id: int  # An exchange with about ITEM_REVIEWS approved reviews
+    exchange_slug: str
+    user_id: int  # The registered user with the most reviews
+    news_exchange_id: int  # The exchange with the most news
+
+
+async def _seed(url: str) -> SeededDatabase:
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("DROP SCHEMA public CASCADE"))
+                await conn.execute(text("CREATE SCHEMA public"))
+        except (OSError, DBAPIError) as e:
+            pytest.skip(f"Test database not reachable: {e}")
+        await upgrade_database(engine)
+
+        async with AsyncSessionFactory(bind=engine) as db:
+            for n in range(1, 31):
+                code = f"{chr(97 + n // 26)}{chr(97 + n % 26)}"
+                db.add(Country(name=f"Country {n}", code_iso_alpha2=code))
+                if n <= 10:
+                    db.add(Language(name=f"Language {n}", code_iso_639_1=code))
+                    db.add(FiatCurrency(name=f"Currency {n}", code_iso_4217=f"{code}x"))
+            await db.commit()
+
+        await FixtureGenerator(engine, TEST_SCALE, seed=1).generate()
+
+        # The fixture generator does not write guides
+        async with AsyncSessionFactory(bind=engine) as db:
+            exchange_ids = (await db.scalars(select(Exchange.id).order_by(Exchange.id).limit(GUIDES))).all()
+            db.add_all(
+                GuideItem(title=f"Guide {n}", content="Step by step.", exchange_id=exchange_id, created_by_user_id=1)
+                for n, exchange_id in enumerate(exchange_ids, 1)
+            )
+            await db.commit()
+
+        async with engine.begin() as conn:
+            await conn.execute(text("ANALYZE"))
+            exchange_id, exchange_slug = (await conn.execute(
+                select(Exchange.id, Exchange.slug)
+                .join(Review, Review.item_id == Exchange.id)
+                .where(Review.moderation_status == ModerationStatusEnum.approved)
+                .group_by(Exchange.id, Exchange.slug)
+                .having(func.count() >= ITEM_REVIEWS)
+                .order_by(func.count(), Exchange.id)
+                .limit(1)
+            )).one()
+            user_id = await conn.scalar(
+                select(Review.user_id)
+                .where(Review.user_id.is_not(None))
+                .group_by(Review.user_id)
+                .order_by(func.count().desc(), Review.user_id)
+                .limit(1)
+            )
+            news_exchange_id = await conn.scalar(
+                select(news_item_exchanges_table.c.exchange_id)
+                .group_by(news_item_exchanges_table.c.exchange_id)
+                .order_by(func.count().desc(), news_item_exchanges_table.c.exchange_id)
+                .limit(1)
+            )
+        return SeededDatabase(url, exchange_id, exchange_slug, user_id, news_exchange_id)
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def seeded_database() -> SeededDatabase:
+    """The test database, seeded once per session (skips the test when there is none)."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    if make_url(TEST_DATABASE_URL).get_backend_name() != "postgresql":
+        pytest.skip("TEST_DATABASE_URL must point at PostgreSQL")
+    return asyncio.run(_seed(TEST_DATABASE_URL))
+
+
+@pytest_asyncio.fixture
+async def client(seeded_database) -> AsyncIterator[AsyncClient]:
+    """HTTP client for the app on the seeded database (no lifespan: no scheduler, no warm-up)."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    await get_engine().dispose()  # Its connections belong to this test's event loop
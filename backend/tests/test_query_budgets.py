@@ -0,0 +1,62 @@
+# tests/test_query_budgets.py
+"""
+Every endpoint with @endpoint_query_budget stays within its budget on the seeded database, with
+pages large enough that a per-row query (N+1) would exceed it. QueryBudgetMiddleware raises
+QueryBudgetExceeded (with the statements issued) through the test client when it does not.
+"""
+import pytest
+
+from app.core import query_budget as query_budget_module
+from app.core.query_budget import QUERY_BUDGET_ATTRIBUTE, QueryBudget, QueryBudgetExceeded
+from app.main import app
+from app.news.router import list_news
+
+# (route path, request URL); URLs are formatted with the seeded database's fields
+BUDGETED_REQUESTS = [
+    ("/api/v1/reviews/", "/api/v1/reviews/?limit=100"),
+    ("/api/v1/reviews/", "/api/v1/reviews/?item_id={exchange_id}&field=usefulness&limit=100"),
+    ("/api/v1/reviews/item/{item_id}", "/api/v1/reviews/item/{exchange_id}?limit=100"),
+    ("/api/v1/reviews/item/{item_id}/facets", "/api/v1/reviews/item/{exchange_id}/facets"),
+    ("/api/v1/exchanges/", "/api/v1/exchanges/?limit=100"),
+    ("/api/v1/exchanges/", "/api/v1/exchanges/?country_id=1&has_kyc=true&field=trading_volume_24h&limit=100"),
+    ("/api/v1/exchanges/{slug}", "/api/v1/exchanges/{exchange_slug}"),
+    ("/api/v1/books/", "/api/v1/books/?limit=100"),
+    ("/api/v1/news/", "/api/v1/news/?limit=100"),
+    ("/api/v1/guides/", "/api/v1/guides/?limit=100"),
+]
+
+
+def _url(url: str, seeded_database) -> str:
+    return url.format(exchange_id=seeded_database.exchange_id, exchange_slug=seeded_database.exchange_slug)
+
+
+def test_every_budgeted_endpoint_is_tested():
+    budgeted = {
+        route.path for route in app.routes
+        if hasattr(getattr(route, "endpoint", None), QUERY_BUDGET_ATTRIBUTE)
+    }
+    assert budgeted == {route for route, _ in BUDGETED_REQUESTS}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("route, url", BUDGETED_REQUESTS, ids=[url for _, url in BUDGETED_REQUESTS])
+async def test_endpoint_within_query_budget(client, seeded_database, route, url):
+    response = await client.get(_url(url, seeded_database))
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.asyncio
+async def test_endpoint_over_query_budget_raises(client, monkeypatch):
+    monkeypatch.setattr(list_news, QUERY_BUDGET_ATTRIBUTE, 1)
+    with pytest.raises(QueryBudgetExceeded, match="statements, budget 1"):
+        await client.get("/api/v1/news/")
+
+
+def test_statement_log_is_capped(monkeypatch):
+    monkeypatch.setattr(query_budget_module, "STATEMENT_LOG_LIMIT", 3)
+    budget = QueryBudget(2)
+    for n in range(5):
+        budget.record(f"SELECT {n}")
+    assert budget.statements == 5
+    assert budget.statements_log == ["SELECT 0", "SELECT 1", "SELECT 2"]
+    assert "... 2 more" in budget.report()
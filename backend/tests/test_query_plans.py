@@ -0,0 +1,103 @@
+# tests/test_query_plans.py
+"""
+The listing queries are served by the indexes built for them (see app/models/item.py,
+app/models/exchange.py, app/models/review.py and migrations 0002/0004): EXPLAIN of each filter/sort
+shape against the seeded test database, with default planner settings, must use the expected index.
+"""
+import asyncio
+import json
+from typing import Callable, Iterator, NamedTuple
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.books import schemas as book_schemas
+from app.books.service import book_service
+from app.exchanges import schemas as exchange_schemas
+from app.exchanges.service import exchange_service
+from app.models.review import ModerationStatusEnum
+from app.reviews import schemas as review_schemas
+from app.reviews.service import review_service
+from app.schemas.common import PaginationParams
+
+PAGINATION = PaginationParams(skip=0, limit=20)
+APPROVED = ModerationStatusEnum.approved
+
+
+class ListingShape(NamedTuple):
+    label: str
+    build: Callable  # (seeded_database) -> (query, count_query, params)
+    index: str
+
+
+def _exchanges(sort_field: str, **filters) -> Callable:
+    return lambda seeded: exchange_service.build_list_queries(
+        exchange_schemas.ExchangeFilterParams(**filters), exchange_schemas.ExchangeSortBy(field=sort_field), PAGINATION,
+    )
+
+
+def _books(sort_field: str) -> Callable:
+    return lambda seeded: book_service.build_list_queries(
+        book_schemas.BookFilterParams(), book_schemas.BookSortBy(field=sort_field), PAGINATION,
+    )
+
+
+def _reviews(sort_field: str = "created_at", of_item: bool = False, of_user: bool = False, status=APPROVED) -> Callable:
+    return lambda seeded: review_service.build_list_queries(
+        review_schemas.ReviewFilterParams(
+            item_id=seeded.exchange_id if of_item else None,
+            user_id=seeded.user_id if of_user else None,
+            moderation_status=status,
+        ),
+        review_schemas.ReviewSortBy(field=sort_field), PAGINATION,
+    )
+
+
+LISTING_SHAPES = [
+    ListingShape("exchanges by rating", _exchanges("overall_average_rating"), "ix_items_rating_id"),
+    ListingShape("exchanges by ranking score", _exchanges("ranking_score"), "ix_items_ranking_score_id"),
+    ListingShape("exchanges by review count", _exchanges("total_review_count"), "ix_items_review_count_id"),
+    ListingShape("exchanges by rating count", _exchanges("total_rating_count"), "ix_items_rating_count_id"),
+    ListingShape("exchanges by volume", _exchanges("trading_volume_24h"), "ix_exchanges_volume_id"),
+    ListingShape("exchanges with KYC by volume", _exchanges("trading_volume_24h", has_kyc=True), "ix_exchanges_kyc_volume"),
+    ListingShape("exchanges with P2P by volume", _exchanges("trading_volume_24h", has_p2p=True), "ix_exchanges_p2p_volume"),
+    ListingShape("books by rating", _books("overall_average_rating"), "ix_items_rating_id"),
+    ListingShape("books by review count", _books("total_review_count"), "ix_items_review_count_id"),
+    ListingShape("reviews of an item by date", _reviews("created_at", of_item=True), "ix_reviews_approved_item_created"),
+    ListingShape("reviews of an item by usefulness", _reviews("usefulness", of_item=True), "ix_reviews_approved_item_usefulness"),
+    ListingShape("reviews of an item by rating", _reviews("rating", of_item=True), "ix_reviews_approved_item_rating"),
+    ListingShape("reviews by date", _reviews("created_at"), "ix_reviews_approved_created"),
+    ListingShape("reviews by usefulness", _reviews("usefulness"), "ix_reviews_approved_usefulness"),
+    ListingShape("pending reviews", _reviews(status=ModerationStatusEnum.pending), "ix_reviews_pending_created"),
+    ListingShape("reviews of a user", _reviews(of_user=True, status=None), "ix_reviews_user_created"),
+]
+
+
+def _index_names(plan: dict) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from _index_names(child)
+
+
+async def _explain(url: str, query) -> dict:
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            plan = await conn.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    finally:
+        await engine.dispose()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+@pytest.mark.parametrize("shape", LISTING_SHAPES, ids=lambda shape: shape.label)
+def test_listing_uses_index(seeded_database, shape: ListingShape):
+    query, _, params = shape.build(seeded_database)
+    plan = asyncio.run(_explain(seeded_database.url, query.params(params)))
+    assert shape.index in set(_index_names(plan)), f"{shape.label}: expected {shape.index}, plan:\n{json.dumps(plan, indent=2)}"
@@ -0,0 +1,47 @@
+# tests/test_rate_limit.py
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import MemoryBackend, RateLimit, RateLimitMiddleware, rate_limited
+
+POLICY = [RateLimit("ip", 2, 60), RateLimit("global", 5, 60)]
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/limited")
+    @rate_limited("test")
+    async def limited():
+        return {}
+
+    app.add_middleware(RateLimitMiddleware, backend=MemoryBackend(), policies={"test": POLICY})
+    return app
+
+
+async def _post(app: FastAPI, ip: str) -> int:
+    async with AsyncClient(transport=ASGITransport(app=app, client=(ip, 1234)), base_url="http://test") as client:
+        return (await client.post("/limited")).status_code
+
+
+@pytest.mark.asyncio
+async def test_throttled_client_does_not_drain_global_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    app = _app()
+    statuses = [await _post(app, "10.0.0.1") for _ in range(10)]
+    assert statuses == [200, 200] + [429] * 8
+    # Only the two allowed requests took from the global bucket (5)
+    assert [await _post(app, "10.0.0.2") for _ in range(3)] == [200, 200, 429]
+    assert await _post(app, "10.0.0.3") == 200
+    assert await _post(app, "10.0.0.4") == 429
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_the_longest_wait():
+    backend = MemoryBackend()
+    buckets = [("a", RateLimit("ip", 1, 10)), ("b", RateLimit("ip", 1, 60))]
+    assert await backend.consume(buckets, now=0.0) == 0
+    assert await backend.consume(buckets, now=0.0) == pytest.approx(60)
+    assert await backend.consume(buckets, now=10.0) == pytest.approx(50)
@@ -0,0 +1,63 @@
+# tests/test_serialization.py
+"""
+The fast serialization path (FAST_JSON_RESPONSES, app/core/serialization.py) returns the same JSON
+as the validated response_model path on every endpoint built with paginated_response.
+"""
+import inspect
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.dependencies import Principal, get_current_principal
+from app.main import app
+
+# (route path, request URL); URLs are formatted with the seeded database's fields
+PAGINATED_REQUESTS = [
+    ("/api/v1/reviews/", "/api/v1/reviews/?limit=50"),
+    ("/api/v1/reviews/me", "/api/v1/reviews/me?limit=50"),
+    ("/api/v1/reviews/item/{item_id}", "/api/v1/reviews/item/{exchange_id}?limit=50"),
+    ("/api/v1/reviews/admin/reviews/", "/api/v1/reviews/admin/reviews/?limit=50"),
+    ("/api/v1/exchanges/", "/api/v1/exchanges/?limit=50"),
+    ("/api/v1/exchanges/news/{exchange_id}", "/api/v1/exchanges/news/{news_exchange_id}?limit=50"),
+]
+
+
+def _url(url: str, seeded_database) -> str:
+    return url.format(exchange_id=seeded_database.exchange_id, news_exchange_id=seeded_database.news_exchange_id)
+
+
+def test_every_paginated_endpoint_is_tested():
+    paginated = {
+        route.path for route in app.routes
+        if hasattr(route, "endpoint") and "paginated_response(" in inspect.getsource(route.endpoint)
+    }
+    assert paginated == {route for route, _ in PAGINATED_REQUESTS}
+
+
+def test_aware_datetimes_match_pydantic():
+    class Stamped(BaseModel):
+        at: datetime
+
+    for tz in (timezone.utc, timezone(timedelta(hours=3))):
+        stamped = Stamped(at=datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=tz))
+        assert FastJSONResponse(stamped.model_dump()).body == stamped.model_dump_json().encode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("route, url", PAGINATED_REQUESTS, ids=[url for _, url in PAGINATED_REQUESTS])
+async def test_fast_path_matches_validated_path(client, seeded_database, monkeypatch, route, url):
+    principal = Principal(id=seeded_database.user_id, is_admin=True)
+    monkeypatch.setitem(app.dependency_overrides, get_current_principal, lambda: principal)
+    bodies = []
+    for fast in (False, True):
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+        response = await client.get(_url(url, seeded_database))
+        assert response.status_code == 200, response.text
+        bodies.append(orjson.loads(response.content))
+    validated, fast = bodies
+    assert validated["items"], "the page must not be empty"
+    assert fast == validated